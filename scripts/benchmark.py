@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for usenc encoders.
+
+Each suite measures a group of encoders (and reference implementations from the
+standard library) and prints the results as a markdown table, ready to paste in
+docs/advanced/performance.md.
+
+Usage:
+    python scripts/benchmark.py                # run all suites
+    python scripts/benchmark.py checksums      # run selected suites
+    python scripts/benchmark.py --size 4       # bulk input size in MB
+"""
+
+import argparse
+import hashlib
+import io
+import re
+import subprocess  # nosec B404
+import sys
+import tempfile
+import time
+import zlib
+from functools import partial
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Match, Tuple, cast
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from usenc import accel, prepare, prepare_batch
+from usenc.cli import process_encoding
+from usenc.encoders import ENCODERS
+from usenc.encoders.width import COMPOSITIONS, CONVERSIONS
+from usenc.framing import Delimited, FixedSize, Framing, LengthPrefixed
+
+Row = Tuple[str, float, float]
+
+# Column header, scale applied to the value and number of decimals
+Column = Tuple[str, float, int]
+
+BULK: Column = ("bulk MB/s", 1e-6, 1)
+BATCH: Column = ("batch us/line", 1e6, 2)
+
+
+def measure(func: Callable[[], object], min_time: float = 0.2) -> float:
+    """Best time (in seconds) of a single call to `func`, repeated for at least `min_time`"""
+    best = float("inf")
+    total = 0.0
+    while total < min_time:
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        total += elapsed
+    return best
+
+
+def sample_data(size: int) -> bytes:
+    """Deterministic pseudo-random bytes (a LCG is enough to defeat any shortcut)"""
+    state = 0x2545F491
+    out = bytearray(size)
+    for i in range(size):
+        state = (state * 1103515245 + 12345) & 0x7FFFFFFF
+        out[i] = state >> 16 & 0xFF
+    return bytes(out)
+
+
+def sample_lines(count: int, length: int) -> List[bytes]:
+    data = sample_data(count * length)
+    return [data[i : i + length] for i in range(0, len(data), length)]
+
+
+def bench_checksums(size: int) -> List[Row]:
+    """
+    Non-cryptographic checksums against hashlib and zlib
+
+    Columns are the throughput on one large buffer, and the per-line cost of
+    a batch of 10000 lines of 32 bytes (`encode_batch`)
+    """
+    data = sample_data(size)
+    lines = sample_lines(10000, 32)
+
+    def bulk(name: str, **params) -> Callable[[], object]:
+        codec = prepare(name, **params)
+        return lambda: codec(data)
+
+    def batch(name: str, **params) -> Callable[[], object]:
+        encoder = ENCODERS[name]
+        return lambda: encoder.encode_batch(lines, **params)
+
+    candidates: Dict[str, Tuple[Callable[[], object], Callable[[], object]]] = {
+        "fnv1a (32 bits)": (bulk("fnv1a"), batch("fnv1a")),
+        "fnv1a (64 bits)": (bulk("fnv1a", bits=64), batch("fnv1a", bits=64)),
+        "fnv1 (32 bits)": (bulk("fnv1"), batch("fnv1")),
+        "crc16": (bulk("crc16"), batch("crc16")),
+        "crc16 (xmodem)": (bulk("crc16", variant="xmodem"), batch("crc16", variant="xmodem")),
+        "crc32": (bulk("crc32"), batch("crc32")),
+        "adler32": (bulk("adler32"), batch("adler32")),
+        "md5": (bulk("md5"), batch("md5")),
+        "sha256": (bulk("sha256"), batch("sha256")),
+        "zlib.crc32 (reference)": (
+            lambda: zlib.crc32(data),
+            lambda: [zlib.crc32(line) for line in lines],
+        ),
+        "hashlib.md5 (reference)": (
+            lambda: hashlib.md5(data).hexdigest(),  # nosec B324
+            lambda: [hashlib.md5(line).hexdigest() for line in lines],  # nosec B324
+        ),
+    }
+
+    rows = []
+    for name, (bulk_func, batch_func) in candidates.items():
+        rows.append((name, size / measure(bulk_func), measure(batch_func) / len(lines)))
+    return rows
+
+
+def bench_bases(size: int) -> List[Row]:
+    """
+    Big-integer bases against a plain divmod conversion
+
+    Columns are the throughput on one 10 kB buffer (these conversions are
+    superlinear, `--size` is ignored), and the per-line cost of a batch of
+    10000 lines of 32 bytes
+    """
+    data = sample_data(10000)
+    lines = sample_lines(10000, 32)
+    base58 = ENCODERS["base58"]
+    table = base58.alphabet + bytes(256 - base58.base)
+
+    def naive(text: bytes) -> bytes:
+        n = int.from_bytes(text, "big")
+        digits = bytearray()
+        while n:
+            n, digit = divmod(n, 58)
+            digits.append(digit)
+        digits.reverse()
+        return bytes(digits).translate(table)
+
+    candidates = {name: ENCODERS[name].encode for name in ("base36", "base58", "base62")}
+    candidates["base58 decode"] = base58.decode
+    candidates["divmod base58 (reference)"] = naive
+
+    rows = []
+    for name, func in candidates.items():
+        inputs = [base58.encode(line) for line in lines] if "decode" in name else lines
+        bulk = base58.encode(data) if "decode" in name else data
+        rows.append(
+            (
+                name,
+                len(data) / measure(lambda: func(bulk)),  # noqa: B023
+                measure(lambda: [func(x) for x in inputs]) / len(lines),  # noqa: B023
+            )
+        )
+    return rows
+
+
+def bench_numpy(size: int) -> List[Row]:
+    """
+    Pure Python against NumPy backend, by input size
+
+    Columns are the throughput of each backend, the NumPy backend is selected
+    from `accel.NUMPY_MIN_SIZE` bytes
+    """
+    if not accel.HAS_NUMPY:
+        print("NumPy is not available\n")
+        return []
+
+    cases = [
+        ("base64 encode", ENCODERS["base64"].encode, lambda data: data),
+        ("base64 decode", ENCODERS["base64"].decode, ENCODERS["base64"].encode),
+        ("base32 encode", ENCODERS["base32"].encode, lambda data: data),
+        ("base91 encode", ENCODERS["base91"].encode, lambda data: data),
+        ("base91 decode", ENCODERS["base91"].decode, ENCODERS["base91"].encode),
+        ("hex encode", ENCODERS["hex"].encode, lambda data: data.replace(b"\x80", b"\x00")),
+    ]
+    sizes = [s for s in (64, 128, 256, 1024, 16384, 1 << 20) if s <= max(size, 64)]
+    min_size = accel.NUMPY_MIN_SIZE
+
+    rows = []
+    try:
+        for name, func, make_input in cases:
+            for n in sizes:
+                text = make_input(sample_data(n).translate(bytes(range(128)) * 2))
+                accel.NUMPY_MIN_SIZE = 1 << 62
+                python_time = measure(lambda: func(text))  # noqa: B023
+                accel.NUMPY_MIN_SIZE = 0
+                numpy_time = measure(lambda: func(text))  # noqa: B023
+                rows.append((f"{name} ({n} B)", n / python_time, n / numpy_time))
+    finally:
+        accel.NUMPY_MIN_SIZE = min_size
+    return rows
+
+
+def sample_domains(count: int) -> List[bytes]:
+    """
+    Domain list where labels recur like in real traffic: a few TLDs and subdomains,
+    a Zipf-like distribution of names, a quarter of them internationalized
+    """
+    tlds = ["com", "net", "org", "de", "jp", "fr", "ru", "xn--p1ai"]
+    subdomains = ["", "www.", "mail.", "api.", "cdn.", "shop."]
+    names = [f"site{i}" for i in range(300)] + [
+        f"{word}{i}" for i in range(100) for word in ("bücher", "münchen", "例え", "пример")
+    ]
+    state = 0x2545F491
+    domains = []
+    for _ in range(count):
+        state = (state * 1103515245 + 12345) & 0x7FFFFFFF
+        rank = int(len(names) ** ((state >> 8) % 1000 / 1000)) - 1
+        domain = subdomains[state % len(subdomains)] + names[rank] + "." + tlds[state >> 4 & 7]
+        domains.append(domain.encode())
+    return domains
+
+
+def bench_punycode(size: int) -> List[Row]:
+    """
+    Punycode against the standard library idna codec, on 10000 domains
+
+    Columns are the per-line cost of encoding and decoding (`--size` is ignored)
+    """
+    domains = sample_domains(10000)
+    punycode = ENCODERS["punycode"]
+    encoded = [punycode.encode(domain) for domain in domains]
+    idna_encoded = [punycode.encode(domain, idna=True) for domain in domains]
+
+    def batch(func: Callable[[bytes], bytes], inputs: List[bytes]) -> float:
+        return measure(lambda: [func(x) for x in inputs]) / len(inputs)
+
+    return [
+        ("punycode", batch(punycode.encode, domains), batch(punycode.decode, encoded)),
+        (
+            "punycode --idna",
+            batch(lambda x: punycode.encode(x, idna=True), domains),
+            batch(lambda x: punycode.decode(x, idna=True), idna_encoded),
+        ),
+        (
+            "str.encode('idna') (reference)",
+            batch(lambda x: x.decode().encode("idna"), domains),
+            batch(lambda x: x.decode("idna").encode(), idna_encoded),
+        ),
+    ]
+
+
+def bench_bech32(size: int) -> List[Row]:
+    """
+    Bech32 against the BIP 173 reference checksum, on 10000 addresses of 20 bytes
+
+    Columns are the per-line cost of validating (`--validate`, one invalid address
+    in 10) and of encoding (`--size` is ignored)
+    """
+    bech32 = ENCODERS["bech32"]
+    keys = sample_lines(10000, 20)
+    addresses = [bech32.encode(key, hrp="bc") for key in keys]
+    for i in range(0, len(addresses), 10):
+        addresses[i] = addresses[i][:-1] + b"q"
+    charset = b"qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+    generator = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+
+    def reference_polymod(values: List[int]) -> int:
+        state = 1
+        for value in values:
+            top = state >> 25
+            state = (state & 0x1FFFFFF) << 5 ^ value
+            for i in range(5):
+                state ^= generator[i] if top >> i & 1 else 0
+        return state
+
+    def reference_expand(hrp: bytes) -> List[int]:
+        return [c >> 5 for c in hrp] + [0] + [c & 31 for c in hrp]
+
+    def reference_validate(address: bytes) -> bool:
+        hrp, _, data = address.lower().rpartition(b"1")
+        values = [charset.find(c) for c in data]
+        return -1 not in values and reference_polymod(reference_expand(hrp) + values) == 1
+
+    def reference_encode(key: bytes) -> bytes:
+        n, bits = int.from_bytes(key, "big"), len(key) * 8
+        values = [n << -bits % 5 >> 5 * i & 31 for i in reversed(range(-(-bits // 5)))]
+        state = reference_polymod(reference_expand(b"bc") + values + [0] * 6) ^ 1
+        values += [state >> 5 * (5 - i) & 31 for i in range(6)]
+        return b"bc1" + bytes(charset[v] for v in values)
+
+    assert (
+        [reference_encode(key) for key in keys[:10]]
+        == [  # nosec B101
+            bech32.encode(key, hrp="bc") for key in keys[:10]
+        ]
+    )
+
+    count = len(addresses)
+    return [
+        (
+            "bech32",
+            measure(lambda: bech32.decode_batch(addresses, validate=True)) / count,
+            measure(lambda: [bech32.encode(key, hrp="bc") for key in keys]) / count,
+        ),
+        (
+            "symbol by symbol polymod (reference)",
+            measure(lambda: [reference_validate(address) for address in addresses]) / count,
+            measure(lambda: [reference_encode(key) for key in keys]) / count,
+        ),
+    ]
+
+
+def bench_binary(size: int) -> List[Row]:
+    """
+    Binary bit strings against per-byte table lookups, on `--size` bytes
+
+    Columns are the encoding and decoding throughput, in MB of raw bytes per second
+    """
+    binary = ENCODERS["binary"]
+    data = sample_data(size)
+    encoded = binary.encode(data)
+    spaced = binary.encode(data, separator=" ")
+    table = [format(byte, "08b").encode() for byte in range(256)]
+    lookup = {bits: bytes((byte,)) for byte, bits in enumerate(table)}
+
+    def reference_decode(bits: bytes) -> bytes:
+        return b"".join(lookup[bits[i : i + 8]] for i in range(0, len(bits), 8))
+
+    return [
+        (
+            "binary",
+            size / measure(lambda: binary.encode(data)),
+            size / measure(lambda: binary.decode(encoded)),
+        ),
+        (
+            "binary --separator ' '",
+            size / measure(lambda: binary.encode(data, separator=" ")),
+            size / measure(lambda: binary.decode(spaced, separator=" ")),
+        ),
+        (
+            "256 entry table (reference)",
+            size / measure(lambda: b"".join(map(table.__getitem__, data))),
+            size / measure(lambda: reference_decode(encoded)),
+        ),
+    ]
+
+
+def bench_width(size: int) -> List[Row]:
+    """
+    Fullwidth and halfwidth against a regex with a per-character callback, on `--size` bytes of text
+
+    Columns are the throughput of converting mixed ASCII and halfwidth katakana
+    text to full width, and the result back to half width
+    """
+    fullwidth = ENCODERS["fullwidth"]
+    halfwidth = ENCODERS["halfwidth"]
+    words = ["hello", "world", "ﾊﾟｿｺﾝ", "ﾃﾞｰﾀ", "123", "ｶﾀｶﾅ"]
+    data = " ".join(words[byte % len(words)] for byte in sample_data(size // 6)).encode()
+    wide = fullwidth.encode(data)
+
+    def reference(width: str) -> Callable[[bytes], bytes]:
+        """Regex matching the characters (and pairs) to convert, one callback per match"""
+        mapping = {**CONVERSIONS[width], **COMPOSITIONS[width]}
+        regex = re.compile("|".join(map(re.escape, sorted(mapping, key=len, reverse=True))))
+
+        def replace(match: Match[str]) -> str:
+            return mapping[match.group()]
+
+        return lambda text: regex.sub(replace, text.decode()).encode()
+
+    to_full, to_half = reference("full"), reference("half")
+    assert to_full(data) == wide and to_half(wide) == halfwidth.encode(wide)  # nosec B101
+
+    return [
+        (
+            "fullwidth / halfwidth",
+            len(data) / measure(lambda: fullwidth.encode(data)),
+            len(data) / measure(lambda: halfwidth.encode(wide)),
+        ),
+        (
+            "regex + per-character callback (reference)",
+            len(data) / measure(lambda: to_full(data)),
+            len(data) / measure(lambda: to_half(wide)),
+        ),
+    ]
+
+
+def bench_output(size: int) -> List[Row]:
+    """
+    base64 written to a pipe read by `cat` for each `--flush-size`, on `--size` bytes
+
+    Columns are the throughput of line mode (32 byte lines) and of bulk mode, through
+    `cli.process_encoding` with the pipe as stdout. With `--flush-size 0`, records
+    go through `sys.stdout.buffer`, which is not buffered under `python -u` or
+    `PYTHONUNBUFFERED` (as set in many container images)
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        lines = Path(tmp) / "lines.txt"
+        lines.write_bytes(
+            b"".join(line.hex().encode() + b"\n" for line in sample_lines(size // 33, 16))
+        )
+        data = Path(tmp) / "data.bin"
+        data.write_bytes(sample_data(size))
+
+        def pipeline(path: Path, is_bulk: bool, flush_size: int, buffered: bool = True) -> float:
+            def run():
+                with subprocess.Popen(
+                    ["cat"], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL
+                ) as cat:
+                    pipe = cast(BinaryIO, cat.stdin)
+                    raw = pipe if buffered else io.FileIO(pipe.fileno(), "wb", closefd=False)
+                    stdout, sys.stdout = sys.stdout, io.TextIOWrapper(raw)  # type: ignore[arg-type]
+                    try:
+                        process_encoding(
+                            path, None, False, is_bulk, {}, "base64", {}, flush_size=flush_size
+                        )
+                    finally:
+                        sys.stdout.flush()
+                        sys.stdout = stdout
+
+            return path.stat().st_size / measure(run, min_time=3)
+
+        rows = [
+            (
+                "--flush-size 0 (sys.stdout.buffer)",
+                pipeline(lines, False, 0),
+                pipeline(data, True, 0),
+            ),
+            (
+                "--flush-size 0 (sys.stdout.buffer, python -u)",
+                pipeline(lines, False, 0, buffered=False),
+                pipeline(data, True, 0, buffered=False),
+            ),
+        ]
+        for flush_size in (1 << 16, 1 << 18, 1 << 20):
+            rows.append(
+                (
+                    f"--flush-size {flush_size}",
+                    pipeline(lines, False, flush_size),
+                    pipeline(data, True, flush_size),
+                )
+            )
+        return rows
+
+
+def bench_framing(size: int) -> List[Row]:
+    """
+    Record framings against reading each record separately, on `--size` bytes of 64 byte records
+
+    Columns are the throughput of cutting the records with `framing.Framing.read`
+    (large reads cut with `bytes.split`, slices or `struct.unpack_from`), and with
+    a read per record from the same buffered stream (a read per byte to find NUL
+    delimiters)
+    """
+    payloads = sample_lines(size // 66, 64)
+    inputs = {
+        "null": Delimited().join([payload.replace(b"\0", b"\1") for payload in payloads]),
+        "fixed": FixedSize(64).join(payloads),
+        "u16": LengthPrefixed("u16").join(payloads),
+    }
+
+    def framed(framing: Framing, data: bytes) -> Callable[[], object]:
+        return lambda: list(framing.read(io.BufferedReader(io.BytesIO(data))))
+
+    def per_byte(data: bytes) -> List[bytes]:
+        stream = io.BufferedReader(io.BytesIO(data))
+        records, record = [], bytearray()
+        for byte in iter(partial(stream.read, 1), b""):
+            if byte == b"\0":
+                records.append(bytes(record))
+                record.clear()
+            else:
+                record += byte
+        return records
+
+    def per_record(data: bytes, prefixed: bool) -> List[bytes]:
+        stream = io.BufferedReader(io.BytesIO(data))
+        records = []
+        while True:
+            header = stream.read(2) if prefixed else b""
+            record = stream.read(int.from_bytes(header, "big") if prefixed else 64)
+            if not record:
+                return records
+            records.append(record)
+
+    return [
+        (
+            "-z (NUL delimited)",
+            len(inputs["null"]) / measure(framed(Delimited(), inputs["null"])),
+            len(inputs["null"]) / measure(lambda: per_byte(inputs["null"])),
+        ),
+        (
+            "--record-size 64",
+            len(inputs["fixed"]) / measure(framed(FixedSize(64), inputs["fixed"])),
+            len(inputs["fixed"]) / measure(lambda: per_record(inputs["fixed"], False)),
+        ),
+        (
+            "--length-prefixed u16",
+            len(inputs["u16"]) / measure(framed(LengthPrefixed("u16"), inputs["u16"])),
+            len(inputs["u16"]) / measure(lambda: per_record(inputs["u16"], True)),
+        ),
+    ]
+
+
+def bench_threads(size: int) -> List[Row]:
+    """
+    Batches split between 4 threads (`prepare_batch(threads=4)`), on `--size` bytes of 16 KiB records
+
+    Columns are the throughput with a single thread and with 4 threads. hashlib
+    and zlib release the GIL on such records, base64 and url only run in parallel
+    on free-threaded builds
+    """
+    records = sample_lines(size // 16384, 16384)
+    rows = []
+    encoders: List[Tuple[str, Dict[str, str]]] = [
+        ("sha256", {}),
+        ("crc32", {}),
+        ("base64", {}),
+        ("url", {"input_charset": "latin1", "output_charset": "latin1"}),
+    ]
+    for encoder_name, params in encoders:
+        single = prepare_batch(encoder_name, **params)
+        threaded = prepare_batch(encoder_name, threads=4, **params)
+        assert threaded(records) == single(records)  # nosec B101
+        rows.append(
+            (
+                encoder_name,
+                size / measure(partial(single, records)),
+                size / measure(partial(threaded, records)),
+            )
+        )
+    return rows
+
+
+SUITES: Dict[str, Tuple[Callable[[int], List[Row]], Tuple[Column, Column]]] = {
+    "checksums": (bench_checksums, (BULK, BATCH)),
+    "bases": (bench_bases, (BULK, BATCH)),
+    "punycode": (bench_punycode, (("encode us/line", 1e6, 2), ("decode us/line", 1e6, 2))),
+    "bech32": (bench_bech32, (("validate us/line", 1e6, 2), ("encode us/line", 1e6, 2))),
+    "binary": (bench_binary, (("encode MB/s", 1e-6, 1), ("decode MB/s", 1e-6, 1))),
+    "width": (bench_width, (("fullwidth MB/s", 1e-6, 1), ("halfwidth MB/s", 1e-6, 1))),
+    "framing": (bench_framing, (("framing MB/s", 1e-6, 1), ("per-record reads MB/s", 1e-6, 1))),
+    "threads": (bench_threads, (("1 thread MB/s", 1e-6, 1), ("4 threads MB/s", 1e-6, 1))),
+    "output": (bench_output, (("lines MB/s", 1e-6, 2), ("bulk MB/s", 1e-6, 1))),
+    "numpy": (bench_numpy, (("python MB/s", 1e-6, 1), ("numpy MB/s", 1e-6, 1))),
+}
+
+
+def format_table(rows: List[Row], columns: Tuple[Column, Column]) -> str:
+    (title1, scale1, digits1), (title2, scale2, digits2) = columns
+    lines = [
+        f"| Encoder | {title1} | {title2} |",
+        "|---|---:|---:|",
+    ]
+    for name, value1, value2 in rows:
+        lines.append(f"| {name} | {value1 * scale1:.{digits1}f} | {value2 * scale2:.{digits2}f} |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark usenc encoders")
+    parser.add_argument("suites", nargs="*", help=f"Suites to run ({', '.join(SUITES)})")
+    parser.add_argument("--size", type=float, default=1, help="Bulk input size in MB")
+    args = parser.parse_args()
+
+    for name in args.suites:
+        if name not in SUITES:
+            parser.error(f"unknown suite '{name}'")
+
+    size = int(args.size * 1e6)
+    for name in args.suites or SUITES:
+        func, columns = SUITES[name]
+        print(f"## {name}\n")
+        print(func.__doc__.strip().splitlines()[0] + "\n")
+        print(format_table(func(size), columns) + "\n")
+
+
+if __name__ == "__main__":
+    main()
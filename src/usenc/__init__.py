@@ -1,9 +1,84 @@
 """usenc - String encoding utilities."""
 
+import importlib
+import sys
+import types
+from typing import TYPE_CHECKING, Any
+
 __version__ = "1.0.0"
 
-# public API
-from .core import EncoderNotFoundError, decode, encode
-from .encoders.encoder import DecodeError, EncodeError
+# public API, imported on first use so that the thin `--connect` client (see `client`)
+# does not load the encoders
+_API = {
+    "encode": ".core",
+    "decode": ".core",
+    "encode_stream": ".core",
+    "decode_stream": ".core",
+    "encode_batch": ".core",
+    "decode_batch": ".core",
+    "prepare": ".core",
+    "prepare_stream": ".core",
+    "prepare_batch": ".core",
+    "EncoderNotFoundError": ".core",
+    "EncodeError": ".encoders.encoder",
+    "DecodeError": ".encoders.encoder",
+}
+
+if TYPE_CHECKING:
+    from .core import (
+        EncoderNotFoundError,
+        decode,
+        decode_batch,
+        decode_stream,
+        encode,
+        encode_batch,
+        encode_stream,
+        prepare,
+        prepare_batch,
+        prepare_stream,
+    )
+    from .detect import detect
+    from .encoders.encoder import DecodeError, EncodeError
+
+__all__ = [
+    "encode",
+    "decode",
+    "encode_stream",
+    "decode_stream",
+    "encode_batch",
+    "decode_batch",
+    "prepare",
+    "prepare_stream",
+    "prepare_batch",
+    "detect",
+    "EncodeError",
+    "DecodeError",
+    "EncoderNotFoundError",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _API.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+class _Package(types.ModuleType):
+    """
+    `usenc.detect` is both a submodule and a function of the public API: importing
+    the submodule sets it as an attribute of the package, the function is kept
+    """
+
+    @property
+    def detect(self) -> Any:
+        return importlib.import_module(".detect", __name__).detect
+
+    @detect.setter
+    def detect(self, module: types.ModuleType):
+        pass
+
 
-__all__ = ["encode", "decode", "EncodeError", "DecodeError", "EncoderNotFoundError"]
+sys.modules[__name__].__class__ = _Package
@@ -0,0 +1,231 @@
+"""
+Optional NumPy backend for fixed-width encodings on large buffers
+
+NumPy is not a dependency of usenc. When it is importable, large inputs of
+power-of-two base encoders (base16, base32, base64, ...) and of the hex encoder
+are processed as `uint8` arrays: the input is reshaped in groups, digit indexes
+are extracted with vectorised shifts and masks, then gathered from the alphabet.
+
+Each function gives the same result as the pure Python path. Callers check
+`use_numpy(size)` first and keep their own implementation as the fallback.
+Set the `USENC_NO_NUMPY` environment variable to disable this backend.
+"""
+
+import os
+from bisect import bisect_left
+from importlib.util import find_spec
+from typing import List, Optional, Tuple
+
+# NumPy is only imported by the first input large enough to use it, so that
+# runs on short lines do not pay for its import (about 200 ms)
+HAS_NUMPY = not os.environ.get("USENC_NO_NUMPY") and find_spec("numpy") is not None
+
+# basE91 groups are 14 bits wide when their 13 bit value is at most 88, 13 bits otherwise
+BASE91_MAX_SHORT = 88
+
+# Below this input size (in bytes), array setup costs more than the pure Python loops
+# save (see the `numpy` suite of scripts/benchmark.py)
+NUMPY_MIN_SIZE = 256
+
+
+def use_numpy(size: int, factor: int = 1) -> bool:
+    """
+    Whether an input of `size` bytes should go through the NumPy backend
+
+    `factor` scales `NUMPY_MIN_SIZE` for backends with a higher setup cost.
+    """
+    global HAS_NUMPY
+    if not HAS_NUMPY or size < NUMPY_MIN_SIZE * factor:
+        return False
+    try:
+        import numpy  # noqa: F401
+    except ImportError:  # pragma: no cover
+        HAS_NUMPY = False
+    return HAS_NUMPY
+
+
+def _group_layout(bits_per_char: int) -> Tuple[int, int]:
+    """Number of bytes and chars in the smallest group holding a whole number of both"""
+    bits = bits_per_char
+    while bits % 8:
+        bits += bits_per_char
+    return bits // 8, bits // bits_per_char
+
+
+def base2n_encode(data: bytes, alphabet: bytes, bits_per_char: int) -> bytes:
+    """Encode data in a power-of-two base, without padding"""
+    import numpy as np
+
+    bytes_per_group, chars_per_group = _group_layout(bits_per_char)
+    chars = (len(data) * 8 + bits_per_char - 1) // bits_per_char
+
+    arr = np.frombuffer(data, dtype=np.uint8)
+    arr = np.pad(arr, (0, -len(data) % bytes_per_group)).reshape(-1, bytes_per_group)
+
+    # Pack each group in one word, then cut the word in digit indexes
+    dtype = np.uint32 if bytes_per_group <= 4 else np.uint64
+    words = np.zeros(len(arr), dtype=dtype)
+    for i in range(bytes_per_group):
+        words <<= dtype(8)
+        words |= arr[:, i]
+
+    indexes = np.empty((len(arr), chars_per_group), dtype=np.uint8)
+    mask = dtype((1 << bits_per_char) - 1)
+    for i in range(chars_per_group):
+        indexes[:, i] = (words >> dtype(bits_per_char * (chars_per_group - 1 - i))) & mask
+
+    table = np.frombuffer(alphabet, dtype=np.uint8)
+    return table[indexes.ravel()[:chars]].tobytes()
+
+
+def base2n_decode(data: bytes, alphabet: bytes, bits_per_char: int) -> Optional[bytes]:
+    """
+    Decode data (without padding) from a power-of-two base
+
+    Returns None if data contains a character outside of the alphabet, the caller
+    falls back to its own implementation to report the error.
+    """
+    import numpy as np
+
+    bytes_per_group, chars_per_group = _group_layout(bits_per_char)
+    size = len(data) * bits_per_char // 8
+
+    lookup = np.full(256, 0xFF, dtype=np.uint8)
+    lookup[np.frombuffer(alphabet, dtype=np.uint8)] = np.arange(len(alphabet), dtype=np.uint8)
+    indexes = lookup[np.frombuffer(data, dtype=np.uint8)]
+    if (indexes == 0xFF).any():
+        return None
+
+    indexes = np.pad(indexes, (0, -len(data) % chars_per_group)).reshape(-1, chars_per_group)
+
+    # Pack the digit indexes of each group in one word, then cut the word in bytes
+    dtype = np.uint32 if bytes_per_group <= 4 else np.uint64
+    words = np.zeros(len(indexes), dtype=dtype)
+    for i in range(chars_per_group):
+        words <<= dtype(bits_per_char)
+        words |= indexes[:, i]
+
+    result = np.empty((len(indexes), bytes_per_group), dtype=np.uint8)
+    for i in range(bytes_per_group):
+        result[:, i] = (words >> dtype(8 * (bytes_per_group - 1 - i))) & dtype(0xFF)
+    return result.ravel()[:size].tobytes()
+
+
+def hex_encode(data: bytes, digits: bytes, prefix: bytes = b"", suffix: bytes = b"") -> bytes:
+    """Encode each byte as 2 hex digits surrounded by prefix and suffix"""
+    import numpy as np
+
+    arr = np.frombuffer(data, dtype=np.uint8)
+    table = np.frombuffer(digits, dtype=np.uint8)
+
+    width = len(prefix) + 2 + len(suffix)
+    out = np.empty((len(arr), width), dtype=np.uint8)
+    if prefix:
+        out[:, : len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+    out[:, len(prefix)] = table[arr >> 4]
+    out[:, len(prefix) + 1] = table[arr & 0x0F]
+    if suffix:
+        out[:, len(prefix) + 2 :] = np.frombuffer(suffix, dtype=np.uint8)
+    return out.tobytes()
+
+
+def base91_encode(data: bytes, start: int, alphabet: bytes) -> Tuple[bytes, int]:
+    """
+    Encode the basE91 groups of data from bit `start`, while 14 bits or more are left
+
+    Returns the output and the bit position where the next group would start.
+    Group widths depend on their value, but 14 bit groups are rare (about 1 in
+    92): the value at every bit position is computed at once, and only the 14 bit
+    groups are walked in Python to find where each group starts.
+    """
+    import numpy as np
+
+    arr = np.frombuffer(data, dtype=np.uint8).astype(np.uint32)
+    last = len(arr) * 8 - 14  # Last bit position where a group can start
+    if last < start:
+        return b"", start
+
+    # 3 bytes from each byte: the bits of any group starting in the first byte
+    padded = np.concatenate([arr, np.zeros(2, dtype=np.uint32)])
+    words = padded[:-2] | padded[1:-1] << 8 | padded[2:] << 16
+
+    # Positions where a group would be 14 bits wide, by position modulo 13: a run
+    # of 13 bit groups from p only visits positions congruent to p
+    is_short = np.empty((len(words), 8), dtype=bool)
+    for shift in range(8):
+        is_short[:, shift] = (words >> shift) & 0x1FFF <= BASE91_MAX_SHORT
+    wide = np.flatnonzero(is_short.ravel()[: last + 1])
+    residues = wide % 13
+    order = np.argsort(residues, kind="stable")
+    bounds = np.searchsorted(residues[order], np.arange(14))
+    by_residue: List[List[int]] = [
+        wide[order[bounds[r] : bounds[r + 1]]].tolist() for r in range(13)
+    ]
+
+    wide_groups = []
+    position, group = start, 0
+    while True:
+        positions = by_residue[position % 13]
+        i = bisect_left(positions, position)
+        if i == len(positions):
+            break
+        group += (positions[i] - position) // 13
+        wide_groups.append(group)
+        group += 1
+        position = positions[i] + 14
+
+    narrow = (last - position) // 13 + 1 if position <= last else 0
+    count = group + narrow
+    end = position + 13 * narrow
+
+    # Start of each group: 13 bits per group, plus one per 14 bit group before it
+    groups = np.arange(count)
+    starts = start + 13 * groups + np.searchsorted(np.array(wide_groups, dtype=np.int64), groups)
+    group_values = (words[starts >> 3] >> (starts & 7).astype(np.uint32)) & 0x3FFF
+    is_wide = np.zeros(count, dtype=bool)
+    is_wide[wide_groups] = True
+    group_values = np.where(is_wide, group_values, group_values & 0x1FFF)
+
+    table = np.frombuffer(alphabet, dtype=np.uint8)
+    out = np.empty(2 * count, dtype=np.uint8)
+    out[0::2] = table[group_values % 91]
+    out[1::2] = table[group_values // 91]
+    return out.tobytes(), end
+
+
+def base91_decode(
+    data: bytes, bits: int, count: int, alphabet: bytes
+) -> Optional[Tuple[bytes, int, int]]:
+    """
+    Decode pairs of basE91 characters, after `count` (less than 8) pending bits
+
+    Returns the full bytes and the bits left over with their count, or None if
+    data contains a character outside of the alphabet.
+    """
+    import numpy as np
+
+    lookup = np.full(256, -1, dtype=np.int32)
+    lookup[np.frombuffer(alphabet, dtype=np.uint8)] = np.arange(len(alphabet), dtype=np.int32)
+    digits = lookup[np.frombuffer(data, dtype=np.uint8)]
+    if (digits < 0).any():
+        return None
+
+    values = (digits[0::2] + digits[1::2] * 91).astype(np.uint32)
+    widths = np.where((values & 0x1FFF) > BASE91_MAX_SHORT, 13, 14)
+    ends = count + np.cumsum(widths)
+    total = int(ends[-1]) if len(ends) else count
+    offsets = ends - widths
+
+    # Each group covers at most 3 bytes, and is at least 13 bits wide so no two
+    # groups start in the same byte: each part is scattered without collisions
+    shifted = values << (offsets & 7).astype(np.uint32)
+    first = offsets >> 3
+    out = np.zeros(total // 8 + 3, dtype=np.uint32)
+    out[first] = shifted & 0xFF
+    out[first + 1] |= (shifted >> 8) & 0xFF
+    out[first + 2] |= shifted >> 16
+    out[0] |= bits
+    out = out.astype(np.uint8)
+
+    full = total // 8
+    return out[:full].tobytes(), int(out[full]), total % 8
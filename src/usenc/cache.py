@@ -0,0 +1,120 @@
+"""
+Memoization of codec results for repetitive inputs
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class CodecCache:
+    """
+    Bounded LRU cache of codec results, keyed on (encoder, params, input)
+
+    Inputs longer than `max_input_size` bypass the cache. After `probe_size` lookups,
+    the cache disables itself if its hit rate is below `min_hit_rate`, as it then
+    only costs memory and time.
+
+    With `thread_safe`, the cache can be shared by codecs running on several
+    threads: lookups and insertions hold a lock, the codec itself runs without it
+    (two threads missing the same input may both compute it). Without it, a hit
+    costs no lock, which is about half of its time.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        max_input_size: int = 4096,
+        probe_size: int = 10000,
+        min_hit_rate: float = 0.05,
+        thread_safe: bool = True,
+    ):
+        self.maxsize = maxsize
+        self.max_input_size = max_input_size
+        self.probe_size = probe_size
+        self.min_hit_rate = min_hit_rate
+        self.hits = 0
+        self.misses = 0
+        self.enabled = maxsize > 0
+        self.probed = False
+        self.data: OrderedDict[Tuple[Hashable, bytes], bytes] = OrderedDict()
+        self.lock = threading.Lock() if thread_safe else None
+
+    @staticmethod
+    def make_key(encoder_name: str, is_decoding: bool, params: Dict[str, Any]) -> Hashable:
+        """Build the part of the key identifying a codec"""
+        return (encoder_name, is_decoding, tuple(sorted(params.items())))
+
+    def _store(self, k: Tuple[Hashable, bytes], result: bytes):
+        """Insert the result of a miss, and disable the cache if the probe fails"""
+        data = self.data
+        data[k] = result
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+
+        if not self.probed and self.hits + self.misses >= self.probe_size:
+            self.probed = True
+            if self.hit_rate < self.min_hit_rate:
+                self.enabled = False
+                data.clear()
+
+    def wrap(self, codec: Callable[[bytes], bytes], key: Hashable) -> Callable[[bytes], bytes]:
+        """Return `codec` with its results memoized under `key`"""
+        data = self.data
+        lock = self.lock
+
+        def cached(text: bytes) -> bytes:
+            if not self.enabled or len(text) > self.max_input_size:
+                return codec(text)
+
+            k = (key, text)
+            result = data.get(k)
+            if result is not None:
+                self.hits += 1
+                data.move_to_end(k)
+                return result
+
+            self.misses += 1
+            result = codec(text)
+            self._store(k, result)
+            return result
+
+        if lock is None:
+            return cached
+
+        def locked(text: bytes) -> bytes:
+            if not self.enabled or len(text) > self.max_input_size:
+                return codec(text)
+
+            k = (key, text)
+            with lock:
+                result = data.get(k)
+                if result is not None:
+                    self.hits += 1
+                    data.move_to_end(k)
+                    return result
+                self.misses += 1
+
+            result = codec(text)
+            with lock:
+                # Unless another thread disabled the cache in the meantime
+                if self.enabled:
+                    self._store(k, result)
+            return result
+
+        return locked
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "size": len(self.data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "enabled": self.enabled,
+        }
@@ -4,27 +4,75 @@ URL Parameter Encoder - Encode URL parameters in various formats
 """
 
 import argparse
+import cProfile
+import os
 import sys
-from contextlib import contextmanager
+import time
+from contextlib import ExitStack, contextmanager
+from functools import partial
 from pathlib import Path
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union, cast
 
-from .core import decode, encode
+from .cache import CodecCache
+from .client import DEFAULT_ADDRESS, Client, ServerError, parse_address
+from .compression import COMPRESSIONS, DecompressedReader, compressor, detect_compression
+from .core import EncoderNotFoundError, prepare, prepare_batch, prepare_stream
+from .detect import Candidate, detect, unwrap
 from .encoders import ENCODERS
+from .errors import POLICIES, ErrorPolicy
+from .files import expand_inputs, format_progress, process_files
+from .formats import FORMATS, parse_fields, parse_keys, process_records
+from .framing import LENGTH_PREFIXES, Framing, make_framing
+from .lines import DEFAULT_MAX_LINE_BUFFER, bounded_lines, read_lines
+from .output import DEFAULT_FLUSH_SIZE, open_output
+from .parallel import aligned_chunks, process_parallel, splits_utf8
+from .planner import plan
+from .server import DEFAULT_WORKERS, serve
+from .stats import Stats
+from .threads import OrderedPool
+
+# Size of the chunks read from the input in bulk mode
+CHUNK_SIZE = 1 << 20
+
+# Number of lines given at once to encoders with a batch implementation
+BATCH_SIZE = 1024
 
 
 @contextmanager
-def smart_open(filename: Optional[Path], mode: str, default_stream: BinaryIO):
+def smart_open(
+    filename: Optional[Path],
+    mode: str,
+    default_stream: BinaryIO,
+    compress: Optional[str] = None,
+    flush_size: int = 0,
+    decompress: bool = True,
+):
     """
     Context manager that opens a file or uses a default stream (stdin/stdout)
+
+    In read mode, gzip, bz2 and xz inputs are detected and decompressed on a separate
+    thread, unless `decompress` is False. In write mode, the output is compressed with
+    `compress` if it is given, otherwise with a `flush_size` greater than 0 writes are
+    accumulated and flushed with `os.writev` (see `output.open_output`).
     """
-    if filename is None:
-        # Use default stream (don't close it)
-        yield default_stream
-    else:
-        # Open and close the file
-        with filename.open(mode) as f:
-            yield f
+    with ExitStack() as stack:
+        # Use the default stream (don't close it), or open and close the file
+        stream = default_stream
+        if filename is not None:
+            stream = cast(BinaryIO, stack.enter_context(filename.open(mode)))
+
+        if "r" in mode:
+            compression = detect_compression(stream, filename) if decompress else None
+            if compression is not None:
+                stream = stack.enter_context(DecompressedReader(stream, compression))
+        elif compress is not None:
+            stream = stack.enter_context(compressor(stream, compress))
+        elif flush_size > 0:
+            writer = open_output(stream, flush_size)
+            if writer is not None:
+                stream = cast(BinaryIO, stack.enter_context(writer))
+
+        yield stream
 
 
 def process_encoding(
@@ -35,23 +83,288 @@ def process_encoding(
     global_params: dict,
     encoder_name: str,
     encoder_params: dict,
+    stats: Optional[Stats] = None,
+    client: Optional[Client] = None,
+    record_format: str = "lines",
+    fields: Optional[List[int]] = None,
+    keys: Optional[List[List[str]]] = None,
+    cache_size: int = 0,
+    jobs: int = 1,
+    errors: Optional[ErrorPolicy] = None,
+    output_compress: Optional[str] = None,
+    flush_size: int = DEFAULT_FLUSH_SIZE,
+    max_line_buffer: int = DEFAULT_MAX_LINE_BUFFER,
+    framing: Optional[Framing] = None,
+    threads: int = 1,
+    decompress: Optional[bool] = None,
 ):
     """
     Process encoding from input to output
+
+    If `stats` is provided, reads, writes and codec calls are measured and
+    accumulated into it. If `client` is provided, records are sent to a running
+    `usenc serve` instead of being processed locally.
+
+    With a `record_format` other than `lines`, only the selected `fields` (tsv, csv)
+    or `keys` (jsonl) of each record are encoded.
+
+    A `cache_size` greater than 0 memoizes the results of the last `cache_size`
+    distinct records (it has no use in bulk mode).
+
+    The execution strategy is chosen from the encoder capabilities (see
+    `planner.plan`). In bulk mode, `jobs` greater than 1 splits the input between
+    a pool of worker processes when the encoder input can be split.
+
+    In line mode, `errors` decides what happens to the records the encoder fails
+    on (see `ErrorPolicy`) and counts them. Without it, the first failure is raised.
+
+    Lines of `max_line_buffer` bytes or more (0 for no limit) are not read at once:
+    they go through the streaming interface of the encoder, or are cut at aligned
+    points for encoders without one, so memory stays bounded. Part of such a line
+    may already be written when the encoder fails on it, failures are then raised
+    whatever the error policy.
+
+    With a `framing` (see `framing.Framing`), records are cut by it instead of by
+    lines, passed to the codec as they are and written back in the same framing.
+
+    In line mode and with a framing, `threads` other than 1 processes batches of
+    records on a pool of threads (0 for one per CPU, see `threads.OrderedPool`).
+
+    Compressed inputs are decompressed in line and record modes, and in bulk mode
+    only if `decompress` is True, so that bulk results stay those of the input bytes
+    (see `smart_open`). `decompress` False never decompresses. The output is
+    compressed with `output_compress` (gzip, bz2 or xz) if it is given. Otherwise, the output is
+    written `flush_size` bytes at a time with `os.writev` (0 writes through the
+    output stream as is).
     """
 
-    method = decode if is_decoding else encode
+    params = {**global_params, **encoder_params}
+    cache = None
+    if cache_size > 0 and not is_bulk:
+        cache = CodecCache(cache_size, thread_safe=threads != 1)
+    execution = plan(
+        encoder_name,
+        is_decoding,
+        is_bulk,
+        jobs=jobs,
+        remote=client is not None,
+        per_record=cache is not None or stats is not None or record_format != "lines",
+        **params,
+    )
+    strategy = execution.strategy
+    alignment = execution.capabilities.split_alignment
+
+    codec: Callable[[bytes], bytes]
+    stream_codec: Callable[[Iterable[bytes]], Iterator[bytes]]
+    if client is not None:
+        method = client.decode if is_decoding else client.encode
+        codec = partial(method, encoder_name=encoder_name, **params)
+        if cache is not None:
+            codec = cache.wrap(codec, cache.make_key(encoder_name, is_decoding, params))
+
+        def stream_codec(chunks: Iterable[bytes]) -> Iterator[bytes]:
+            yield codec(b"".join(chunks))
+
+    else:
+        codec = prepare(encoder_name, is_decoding, cache=cache, **params)
+        stream_codec = prepare_stream(encoder_name, is_decoding, **params)
+
+    if strategy == "split":
+        utf8 = splits_utf8(alignment, **params)
+
+        def stream_codec(chunks: Iterable[bytes]) -> Iterator[bytes]:
+            return map(codec, aligned_chunks(chunks, alignment, utf8))
+
+    elif not is_bulk and client is None and alignment and not execution.capabilities.streamable:
+        # Long lines are cut at aligned points, without going through the cache
+        chunk_codec = prepare(encoder_name, is_decoding, **params)
+        utf8 = splits_utf8(alignment, **params)
 
-    with smart_open(input_file, "rb", sys.stdin.buffer) as infile, smart_open(
-        output_file, "wb", sys.stdout.buffer
+        def stream_codec(chunks: Iterable[bytes]) -> Iterator[bytes]:
+            return map(chunk_codec, aligned_chunks(chunks, alignment, utf8))
+
+    if decompress is None:
+        decompress = not is_bulk
+
+    with smart_open(
+        input_file, "rb", sys.stdin.buffer, decompress=decompress
+    ) as infile, smart_open(
+        output_file, "wb", sys.stdout.buffer, output_compress, flush_size
     ) as outfile:
-        if is_bulk:
-            encoded = method(infile.read(), encoder_name, **global_params, **encoder_params)
-            outfile.write(encoded)
+        if strategy == "parallel":
+            # Workers map a regular input file themselves, other inputs have to be read first
+            mapped = input_file is not None and not isinstance(infile, DecompressedReader)
+            if stats is not None and mapped and input_file is not None:
+                stats.bytes_in += input_file.stat().st_size
+
+            def stream_codec(_: Iterable[bytes]) -> Iterator[bytes]:
+                source = str(input_file) if mapped else infile.read()
+                return process_parallel(source, encoder_name, is_decoding, jobs, **params)
+
+        if stats is not None:
+            infile = stats.reader(infile)
+            outfile = stats.writer(outfile)
+            codec = stats.timed(codec)
+            stream_codec = stats.timed_stream(stream_codec)
+            stats.cache = cache
+            stats.errors = errors
+            stats.strategy = strategy
+
+        record_codec = codec if errors is None else errors.wrap(codec)
+
+        def write_streamed(chunks: Iterator[bytes]):
+            """Write the output of a line too long to be read at once"""
+            for output in stream_codec(chunks):
+                outfile.write(output)
+            outfile.write(b"\n")
+
+        if strategy == "parallel":
+            chunks: Iterable[bytes] = []
+        elif strategy == "whole":
+            # A single chunk is not copied by the join of the default stream implementation
+            chunks = [infile.read()]
         else:
-            for line in infile:
-                encoded = method(line.rstrip(), encoder_name, **global_params, **encoder_params)
-                outfile.write(encoded + b"\n")
+            chunks = iter(partial(infile.read, CHUNK_SIZE), b"")
+
+        batch_codec: Callable[[List[bytes]], List[bytes]]
+        if strategy == "batch":
+            batch_codec = prepare_batch(encoder_name, is_decoding, **params)
+            if errors is not None:
+                batch_codec = errors.wrap_batch(batch_codec)
+        else:
+
+            def batch_codec(records: List[bytes]) -> List[bytes]:
+                results = map(record_codec, records)
+                return [result for result in results if result is not None]
+
+        def process_batches(
+            batches: Iterable[Union[List[bytes], Iterator[bytes]]],
+            write: Callable[[List[bytes]], None],
+        ):
+            """
+            Write the results of batches of records in order, processed on a pool of
+            `threads` threads if it is not 1 (iterators are streamed lines)
+            """
+            with ExitStack() as stack:
+                pool = None
+                if threads != 1:
+                    pool = stack.enter_context(OrderedPool(batch_codec, threads))
+                for batch in batches:
+                    if not isinstance(batch, list):
+                        # The batches before a long line are written first
+                        if pool is not None:
+                            for results in pool.drain():
+                                write(results)
+                        write_streamed(batch)
+                    elif pool is None:
+                        write(batch_codec(batch))
+                    else:
+                        for results in pool.submit(batch):
+                            write(results)
+                if pool is not None:
+                    for results in pool.drain():
+                        write(results)
+
+        def line_batches() -> Iterator[Union[List[bytes], Iterator[bytes]]]:
+            """Batches of BATCH_SIZE lines, interrupted by the lines too long to be read at once"""
+            batch: List[bytes] = []
+            for line in read_lines(infile, max_line_buffer):
+                if isinstance(line, bytes):
+                    batch.append(line.rstrip())
+                    if len(batch) == BATCH_SIZE:
+                        yield batch
+                        batch = []
+                    continue
+                if batch:
+                    yield batch
+                    batch = []
+                yield line
+            if batch:
+                yield batch
+
+        def write_lines(results: List[bytes]):
+            if results:
+                outfile.write(b"\n".join(results) + b"\n")
+
+        if framing is not None:
+            active_framing = framing
+
+            def write_framed(results: List[bytes]):
+                if results:
+                    outfile.write(active_framing.join(results))
+
+            process_batches(framing.read(infile), write_framed)
+        elif strategy == "batch" or (threads != 1 and not is_bulk and record_format == "lines"):
+            process_batches(line_batches(), write_lines)
+        elif is_bulk:
+            for chunk in stream_codec(chunks):
+                outfile.write(chunk)
+        elif record_format != "lines":
+            records = process_records(infile, outfile, record_codec, record_format, fields, keys)
+            if stats is not None:
+                # Several fields of a record can be encoded, each with its own codec call
+                stats.records = records
+        else:
+            for line in read_lines(infile, max_line_buffer):
+                if not isinstance(line, bytes):
+                    write_streamed(line)
+                    continue
+                result = record_codec(line.rstrip())
+                if result is not None:
+                    outfile.write(result + b"\n")
+
+
+def process_file_set(
+    pattern: str,
+    output_dir: Path,
+    is_decoding: bool,
+    jobs: int = 1,
+    stats: Optional[Stats] = None,
+    errors: Optional[ErrorPolicy] = None,
+    **process_args,
+) -> int:
+    """
+    Process every file matching the glob `pattern` into `output_dir` with `jobs`
+    worker processes (see `files.process_files`)
+
+    The progress of each file and the aggregate throughput are printed to stderr,
+    the statistics and failed records of all the files are added into `stats` and
+    `errors`. Returns the number of files that failed.
+    """
+    decompress = process_args.get("decompress")
+    if decompress is None:
+        decompress = not process_args.get("is_bulk")
+    files = expand_inputs(pattern, output_dir, process_args.get("output_compress"), decompress)
+    if not files:
+        raise FileNotFoundError(f"no input file matches '{pattern}'")
+
+    start = time.perf_counter()
+    failed = 0
+    bytes_in = 0
+    results = process_files(
+        files, is_decoding, jobs, with_stats=stats is not None, errors=errors, **process_args
+    )
+    for done, (path, result, error) in enumerate(results, 1):
+        if result is None:
+            failed += 1
+            print(f"[{done}/{len(files)}] {path}: Error: {error}", file=sys.stderr)
+            continue
+
+        print(format_progress(done, len(files), result), file=sys.stderr)
+        bytes_in += result.bytes_in
+        if stats is not None and result.stats is not None:
+            stats.merge(result.stats)
+        if errors is not None and result.errors is not None:
+            errors.merge(result.errors)
+
+    elapsed = time.perf_counter() - start
+    rate = bytes_in / elapsed / 1e6 if elapsed > 0 else 0.0
+    print(
+        f"usenc: {len(files) - failed} files, {bytes_in / 1e6:.1f} MB "
+        f"in {elapsed:.2f}s ({rate:.1f} MB/s)",
+        file=sys.stderr,
+    )
+    return failed
 
 
 def add_encoder_params(parser: argparse.ArgumentParser, encoder_name: str):
@@ -65,6 +378,61 @@ def add_encoder_params(parser: argparse.ArgumentParser, encoder_name: str):
         parser.add_argument(flag, **param_spec)
 
 
+def add_charset_params(parser: Union[argparse.ArgumentParser, argparse._ArgumentGroup]):
+    """Add the charset parameters given to every encoder"""
+    parser.add_argument(
+        "--input-charset",
+        type=str,
+        default="utf8",
+        help="Charset used to represent input data (ascii, utf8, latin1, ...)",
+    )
+
+    parser.add_argument(
+        "--output-charset",
+        type=str,
+        default="utf8",
+        help="Charset used to represent output data (ascii, utf8, latin1, ...)",
+    )
+
+
+def extract_params(args: argparse.Namespace, encoder_name: str) -> Tuple[Dict, Dict]:
+    """Charset parameters and encoder parameters given on the command line"""
+    global_params = {}
+    global_params["input_charset"] = args.input_charset
+    global_params["output_charset"] = args.output_charset
+
+    encoder = ENCODERS[encoder_name]
+    encoder_params = {}
+    if hasattr(encoder, "params"):
+        for param_name in encoder.params:
+            param_value = getattr(args, param_name, None)
+            if param_value is not None:
+                encoder_params[param_name] = param_value
+    return global_params, encoder_params
+
+
+class _OptionsParser(argparse.ArgumentParser):
+    """Parser raising ValueError on invalid options instead of exiting"""
+
+    def error(self, message: str):
+        raise ValueError(f"{self.prog}: {message}")
+
+
+def parse_encoder_args(encoder_name: str, argv: List[str]) -> Dict:
+    """
+    Parameters of an encoder given as command line options (`--prefix 0x`, ...),
+    including the charset options, for the requests of thin clients
+    """
+    if encoder_name not in ENCODERS:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+
+    parser = _OptionsParser(prog=f"usenc {encoder_name}", add_help=False, allow_abbrev=False)
+    add_charset_params(parser)
+    add_encoder_params(parser, encoder_name)
+    global_params, encoder_params = extract_params(parser.parse_args(argv), encoder_name)
+    return {**global_params, **encoder_params}
+
+
 def add_default_params(parser: argparse.ArgumentParser):
     """Setup default parameters for the parser"""
 
@@ -80,28 +448,270 @@ def add_default_params(parser: argparse.ArgumentParser):
         "-o", "--output", type=Path, help="Output file (writes to stdout if not provided)"
     )
 
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        metavar="DIR",
+        help="Process every file matching the -i glob pattern (e.g. 'logs/*.log') into DIR",
+    )
+
     parser.add_argument(
         "-b", "--bulk", action="store_true", help="Process input as a whole instead of line by line"
     )
 
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="lines",
+        help="Input record format, only selected fields are processed for tsv, csv and jsonl",
+    )
+
+    parser.add_argument(
+        "--fields",
+        type=parse_fields,
+        help="Fields to process for tsv and csv formats (1-based, e.g. 3,5 or 2-4)",
+    )
+
+    parser.add_argument(
+        "--keys",
+        type=parse_keys,
+        help="Keys to process for jsonl format (dotted paths, e.g. user.email,path)",
+    )
+
+    framing = parser.add_mutually_exclusive_group()
+
+    framing.add_argument(
+        "-z",
+        "--null-data",
+        action="store_true",
+        help="Records are terminated by NUL bytes instead of newlines, and kept as they are",
+    )
+
+    framing.add_argument(
+        "--record-size",
+        type=int,
+        default=0,
+        metavar="BYTES",
+        help="Records are BYTES long (the last one may be shorter), outputs are written back "
+        "to back",
+    )
+
+    framing.add_argument(
+        "--length-prefixed",
+        choices=LENGTH_PREFIXES,
+        help="Records are preceded by their length (unsigned big-endian), outputs too",
+    )
+
     group = parser.add_argument_group("global")
+    add_charset_params(group)
 
     group.add_argument(
-        "--input-charset",
+        "--stats",
+        nargs="?",
+        const="text",
+        choices=["text", "json"],
+        help="Print processing statistics to stderr (text or json)",
+    )
+
+    group.add_argument(
+        "--cache-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Memoize the results of the last N distinct records (for repetitive inputs)",
+    )
+
+    group.add_argument(
+        "--output-compress",
+        choices=COMPRESSIONS,
+        help="Compress the output",
+    )
+
+    decompression = group.add_mutually_exclusive_group()
+    decompression.add_argument(
+        "--decompress",
+        dest="decompress",
+        action="store_true",
+        default=None,
+        help="Decompress gzip, bz2 and xz inputs also in bulk mode "
+        "(by default, they are only decompressed in line and record modes)",
+    )
+    decompression.add_argument(
+        "--no-decompress",
+        dest="decompress",
+        action="store_false",
+        help="Read compressed-looking inputs as they are instead of decompressing them",
+    )
+
+    group.add_argument(
+        "--flush-size",
+        type=int,
+        default=DEFAULT_FLUSH_SIZE,
+        metavar="BYTES",
+        help=f"Bytes of output accumulated before they are written, pipes are also enlarged "
+        f"(default: {DEFAULT_FLUSH_SIZE}, 0 to write through the standard output buffer)",
+    )
+
+    group.add_argument(
+        "--max-line-buffer",
+        type=int,
+        metavar="BYTES",
+        help=f"In line mode, stream lines longer than this through the encoder instead of "
+        f"reading them at once (default: {DEFAULT_MAX_LINE_BUFFER}, 0 for no limit), "
+        "not available for encoders that can neither stream nor split their input",
+    )
+
+    group.add_argument(
+        "--on-error",
+        choices=POLICIES,
+        default="fail",
+        help="What to do with records that fail to encode or decode: stop (default), "
+        "drop them, write them unchanged or write --replacement instead",
+    )
+
+    group.add_argument(
+        "--replacement",
         type=str,
-        default="utf8",
-        help="Charset used to represent input data (ascii, utf8, latin1, ...)",
+        default="",
+        metavar="TEXT",
+        help="Output of failed records with --on-error replace (default: empty)",
     )
 
     group.add_argument(
-        "--output-charset",
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Split a --bulk input between N worker processes, or process N --output-dir "
+        "files at once (0 for one per CPU)",
+    )
+
+    group.add_argument(
+        "--threads",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Process batches of records on N threads (0 for one per CPU), faster for hash "
+        "encoders on long records and for every encoder on free-threaded Python builds",
+    )
+
+    group.add_argument(
+        "--connect",
         type=str,
-        default="utf8",
-        help="Charset used to represent output data (ascii, utf8, latin1, ...)",
+        metavar="ADDRESS",
+        help="Send records to a running `usenc serve` (socket path or host:port)",
+    )
+
+    group.add_argument(
+        "--profile",
+        type=Path,
+        metavar="FILE",
+        help="Run under cProfile and dump the pstats data to FILE",
+    )
+
+
+def main_serve(argv: List[str]):
+    """Entry point of `usenc serve`"""
+    parser = argparse.ArgumentParser(
+        prog="usenc serve",
+        description="Serve encoding requests to `usenc --connect` clients",
+    )
+    parser.add_argument(
+        "address",
+        nargs="?",
+        default=DEFAULT_ADDRESS,
+        help=f"Unix domain socket path or host:port to listen on (default: {DEFAULT_ADDRESS})",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        metavar="N",
+        help=f"Number of connections served at the same time (default: {DEFAULT_WORKERS})",
     )
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    try:
+        serve(parse_address(args.address), args.workers)
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except (OSError, ServerError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def format_layers(layers: List[Candidate]) -> bytes:
+    """Detection result line: encoders (with their parameters) and score of the weakest layer"""
+    if not layers:
+        return b"-\t0.00"
+    names = []
+    for layer in layers:
+        options = "".join(f" --{k.replace('_', '-')} {v}" for k, v in layer.params.items())
+        names.append(layer.encoder + options)
+    score = min(layer.score for layer in layers)
+    return f"{','.join(names)}\t{score:.2f}".encode()
+
+
+def main_detect(argv: List[str]):
+    """Entry point of `usenc detect`"""
+    parser = argparse.ArgumentParser(
+        prog="usenc detect",
+        description="Guess the encoding of each input line",
+    )
+    parser.add_argument(
+        "-i", "--input", type=Path, help="Input file (reads from stdin if not provided)"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="Output file (writes to stdout if not provided)"
+    )
+    parser.add_argument(
+        "--unwrap", action="store_true", help="Detect and decode layered encodings recursively"
+    )
+    parser.add_argument(
+        "--decode",
+        action="store_true",
+        help="Write the decoded lines instead of the detected encodings",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.5,
+        help="Minimum score of a detection, between 0 and 1 (default: 0.5)",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        with smart_open(args.input, "rb", sys.stdin.buffer) as infile, smart_open(
+            args.output, "wb", sys.stdout.buffer
+        ) as outfile:
+            for line in infile:
+                line = line.rstrip()
+                if args.unwrap:
+                    layers = unwrap(line, threshold=args.threshold)
+                else:
+                    layers = detect(line, limit=1, threshold=args.threshold)
+                if args.decode:
+                    outfile.write((layers[-1].decoded if layers else line) + b"\n")
+                else:
+                    outfile.write(format_layers(layers) + b"\n")
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        main_serve(sys.argv[2:])
+        return
+    if len(sys.argv) > 1 and sys.argv[1] == "detect":
+        main_detect(sys.argv[2:])
+        return
+
     argparse_header = {
         "description": "Encode URL parameters in various formats",
         "formatter_class": argparse.RawDescriptionHelpFormatter,
@@ -113,6 +723,13 @@ Examples:
   echo "hello world" | %(prog)s url
   %(prog)s url -i input.txt -o output.txt
   cat input.txt | %(prog)s base64 > output.txt
+
+Detection:
+  %(prog)s detect --unwrap -i captured.txt
+
+Server mode:
+  %(prog)s serve /tmp/usenc.sock &
+  echo "hello world" | %(prog)s url --connect /tmp/usenc.sock
         """,
     }
 
@@ -136,29 +753,143 @@ Examples:
     add_encoder_params(group, encoder_name)
 
     args = parser.parse_args()
-    global_params = {}
-    global_params["input_charset"] = args.input_charset
-    global_params["output_charset"] = args.output_charset
+    if args.format != "lines" and args.bulk:
+        parser.error(f"--format {args.format} can not be used with --bulk")
+    if args.format in ("tsv", "csv") and not args.fields:
+        parser.error(f"--format {args.format} requires --fields")
+    if args.format == "jsonl" and not args.keys:
+        parser.error("--format jsonl requires --keys")
+    if args.record_size < 0:
+        parser.error("--record-size must be positive")
+    framing = make_framing(args.null_data, args.record_size, args.length_prefixed)
+    if framing is not None and args.bulk:
+        parser.error("record framing options can not be used with --bulk")
+    if framing is not None and args.format != "lines":
+        parser.error(f"record framing options can not be used with --format {args.format}")
+    if args.on_error != "fail" and args.bulk:
+        parser.error("--on-error can not be used with --bulk")
+    if args.jobs < 0:
+        parser.error("--jobs must be positive")
+    if args.flush_size < 0:
+        parser.error("--flush-size must be positive")
+    if args.max_line_buffer is not None and args.max_line_buffer < 0:
+        parser.error("--max-line-buffer must be positive")
+    if args.max_line_buffer and args.connect:
+        parser.error("--max-line-buffer can not be used with --connect")
+    if args.output_dir is not None and args.input is None:
+        parser.error("--output-dir requires -i/--input")
+    if args.output_dir is not None and args.output is not None:
+        parser.error("--output-dir can not be used with -o/--output")
+    if args.output_dir is not None and args.connect:
+        parser.error("--output-dir can not be used with --connect")
+    if args.jobs != 1 and not args.bulk and args.output_dir is None:
+        parser.error("--jobs can only be used with --bulk or --output-dir")
+    if args.jobs != 1 and args.connect:
+        parser.error("--jobs can not be used with --connect")
+    if args.threads < 0:
+        parser.error("--threads must be positive")
+    if args.threads != 1 and args.bulk:
+        parser.error("--threads can not be used with --bulk (use -j/--jobs)")
+    if args.threads != 1 and args.format != "lines":
+        parser.error(f"--threads can not be used with --format {args.format}")
+    if args.threads != 1 and args.connect:
+        parser.error("--threads can not be used with --connect")
+    if args.threads != 1 and args.stats:
+        parser.error("--threads can not be used with --stats")
+    jobs = args.jobs or os.cpu_count() or 1
+    max_line_buffer = args.max_line_buffer
+    if max_line_buffer is None:
+        max_line_buffer = DEFAULT_MAX_LINE_BUFFER
 
-    # Extract encoder parameters
     encoder = ENCODERS[args.encoder]
-    encoder_params = {}
-    if hasattr(encoder, "params"):
-        for param_name in encoder.params:
-            param_value = getattr(args, param_name, None)
-            if param_value is not None:
-                encoder_params[param_name] = param_value
+    global_params, encoder_params = extract_params(args, args.encoder)
+
+    if args.max_line_buffer and not args.bulk and args.format == "lines" and framing is None:
+        capabilities = encoder.capabilities(args.decode, **global_params, **encoder_params)
+        if not bounded_lines(capabilities):
+            mode = "decoder" if args.decode else "encoder"
+            parser.error(
+                f"--max-line-buffer can not bound the memory of the {args.encoder} {mode}, "
+                "which can neither stream nor split its input (use --max-line-buffer 0)"
+            )
+
+    stats = Stats(args.encoder, args.decode) if args.stats else None
+    errors = None
+    if args.on_error != "fail":
+        errors = ErrorPolicy(args.on_error, os.fsencode(args.replacement))
+    profiler = cProfile.Profile() if args.profile else None
+    client = None
 
     try:
-        process_encoding(
-            args.input,
-            args.output,
-            args.decode,
-            args.bulk,
-            global_params,
-            args.encoder,
-            encoder_params,
-        )
+        if args.connect:
+            client = Client(args.connect)
+        if profiler is not None:
+            profiler.enable()
+        try:
+            if args.output_dir is not None:
+                failed_files = process_file_set(
+                    str(args.input),
+                    args.output_dir,
+                    args.decode,
+                    jobs,
+                    stats=stats,
+                    errors=errors,
+                    is_bulk=args.bulk,
+                    global_params=global_params,
+                    encoder_name=args.encoder,
+                    encoder_params=encoder_params,
+                    record_format=args.format,
+                    fields=args.fields,
+                    keys=args.keys,
+                    cache_size=args.cache_size,
+                    output_compress=args.output_compress,
+                    flush_size=args.flush_size,
+                    max_line_buffer=max_line_buffer,
+                    framing=framing,
+                    threads=args.threads,
+                    decompress=args.decompress,
+                )
+            else:
+                failed_files = 0
+                process_encoding(
+                    args.input,
+                    args.output,
+                    args.decode,
+                    args.bulk,
+                    global_params,
+                    args.encoder,
+                    encoder_params,
+                    stats=stats,
+                    client=client,
+                    record_format=args.format,
+                    fields=args.fields,
+                    keys=args.keys,
+                    cache_size=args.cache_size,
+                    output_compress=args.output_compress,
+                    flush_size=args.flush_size,
+                    max_line_buffer=max_line_buffer,
+                    framing=framing,
+                    threads=args.threads,
+                    decompress=args.decompress,
+                    jobs=jobs,
+                    errors=errors,
+                )
+        finally:
+            if client is not None:
+                client.close()
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(args.profile)
+
+        if errors is not None and errors.errors:
+            print(f"usenc: {errors.summary()}", file=sys.stderr)
+
+        if stats is not None:
+            stats.stop()
+            stats.report(sys.stderr, args.stats)
+
+        if failed_files:
+            sys.exit(1)
 
     except KeyboardInterrupt:
         sys.exit(130)
@@ -0,0 +1,244 @@
+"""
+Thin client of the encoding server
+
+This module only depends on the standard library: `usenc ENCODER --connect ADDRESS`
+runs from here without discovering the encoders, importing their modules or
+building the full command line parser. Encoder options are sent as they were
+given on the command line and parsed by the server (see `server`), which keeps
+the encoders loaded. Invocations using options that only the full command line
+handles (`--bulk`, `--format`, ...) go through `cli.main` instead.
+"""
+
+import argparse
+import json
+import os
+import socket
+import struct
+import sys
+import tempfile
+from contextlib import ExitStack
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple, Type, Union
+
+from .compression import DecompressedReader, detect_compression
+
+REQUEST_HEADER = struct.Struct(">II")
+RESPONSE_HEADER = struct.Struct(">BI")
+
+STATUS_OK = 0
+STATUS_ENCODE_ERROR = 1
+STATUS_DECODE_ERROR = 2
+STATUS_NOT_FOUND = 3
+STATUS_ERROR = 4
+
+Address = Union[str, Tuple[str, int]]
+
+DEFAULT_ADDRESS = os.path.join(
+    os.environ.get("XDG_RUNTIME_DIR", tempfile.gettempdir()), "usenc.sock"
+)
+
+# Options handled by the thin client itself
+CLIENT_OPTIONS = frozenset(["-d", "--decode", "-i", "--input", "-o", "--output", "--connect"])
+
+# Options sent to the server along with the encoder options
+FORWARDED_OPTIONS = frozenset(["--input-charset", "--output-charset"])
+
+# Other options of the full command line, which the thin client leaves to `cli.main`
+CLI_OPTIONS = frozenset(
+    [
+        "-h",
+        "--help",
+        "-b",
+        "--bulk",
+        "--output-dir",
+        "--format",
+        "--fields",
+        "--keys",
+        "-z",
+        "--null-data",
+        "--record-size",
+        "--length-prefixed",
+        "--stats",
+        "--profile",
+        "--cache-size",
+        "--on-error",
+        "--replacement",
+        "-j",
+        "--jobs",
+        "--threads",
+        "--output-compress",
+        "--decompress",
+        "--no-decompress",
+        "--flush-size",
+        "--max-line-buffer",
+    ]
+)
+
+
+class ServerError(Exception):
+    """Exception raised when the server can not be reached or breaks the protocol."""
+
+    pass
+
+
+def parse_address(address: str) -> Address:
+    """
+    Parse a server address, either `host:port` / `:port` for TCP
+    or a filesystem path for a Unix domain socket
+    """
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and "/" not in address:
+        return (host or "127.0.0.1", int(port))
+    return address
+
+
+def _error_class(status: int) -> Type[Exception]:
+    # The exception classes live with the encoders, they are only imported on errors
+    from .server import ERRORS
+
+    return ERRORS.get(status, RuntimeError)
+
+
+class Client:
+    """
+    Thin client for a running `usenc serve`
+
+    Exposes `encode` and `decode` with the same signature as `usenc.encode` and `usenc.decode`.
+    """
+
+    def __init__(self, address: Union[str, Address]):
+        if isinstance(address, str):
+            address = parse_address(address)
+
+        try:
+            if isinstance(address, tuple):
+                self.sock = socket.create_connection(address)
+                self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            else:
+                self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.sock.connect(address)
+        except OSError as e:
+            raise ServerError(f"can not connect to usenc server at {address}: {e}") from e
+
+        self.rfile = self.sock.makefile("rb")
+        self._metadata: Optional[Tuple[Tuple, bytes]] = None
+
+    def _send(self, metadata: bytes, text: bytes) -> bytes:
+        self.sock.sendall(REQUEST_HEADER.pack(len(metadata), len(text)) + metadata + text)
+
+        header = self.rfile.read(RESPONSE_HEADER.size)
+        if len(header) < RESPONSE_HEADER.size:
+            raise ServerError("connection closed by usenc server")
+        status, length = RESPONSE_HEADER.unpack(header)
+        result = self.rfile.read(length)
+        if len(result) < length:
+            raise ServerError("connection closed by usenc server")
+
+        if status != STATUS_OK:
+            raise _error_class(status)(result.decode("utf8", "replace"))
+        return result
+
+    def _request(self, text: bytes, encoder_name: str, is_decoding: bool, params: Dict) -> bytes:
+        key = (encoder_name, is_decoding, params)
+        if self._metadata is None or self._metadata[0] != key:
+            metadata = json.dumps(
+                {"encoder": encoder_name, "decode": is_decoding, "params": params}
+            ).encode("utf8")
+            self._metadata = (key, metadata)
+        return self._send(self._metadata[1], text)
+
+    def encode(self, text: bytes, encoder_name: str, **encoder_params) -> bytes:
+        """Encode a single text string on the server"""
+        return self._request(text, encoder_name, False, encoder_params)
+
+    def decode(self, text: bytes, encoder_name: str, **encoder_params) -> bytes:
+        """Decode a single text string on the server"""
+        return self._request(text, encoder_name, True, encoder_params)
+
+    def prepare_args(
+        self, encoder_name: str, is_decoding: bool, args: List[str]
+    ) -> Callable[[bytes], bytes]:
+        """
+        Return a function encoding (or decoding) a single text string on the server,
+        with encoder options given as command line arguments (`--prefix 0x`, ...)
+        """
+        metadata = json.dumps(
+            {"encoder": encoder_name, "decode": is_decoding, "args": args}
+        ).encode("utf8")
+        return lambda text: self._send(metadata, text)
+
+    def close(self):
+        self.rfile.close()
+        self.sock.close()
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def is_thin(argv: List[str]) -> bool:
+    """Whether the command line `argv` can be run by the thin client"""
+    if not argv or argv[0].startswith("-") or argv[0] in ("serve", "detect"):
+        return False
+    if not any(arg == "--connect" or arg.startswith("--connect=") for arg in argv):
+        return False
+
+    known = CLIENT_OPTIONS | FORWARDED_OPTIONS | CLI_OPTIONS
+    for arg in argv[1:]:
+        option = arg.split("=", 1)[0]
+        if option in CLI_OPTIONS or arg == "--":
+            return False
+        if option.startswith("--"):
+            # Abbreviations are resolved by the full parser
+            if option not in known and any(name.startswith(option) for name in known):
+                return False
+        elif option.startswith("-") and option not in CLIENT_OPTIONS and len(option) > 1:
+            return False
+    return True
+
+
+def main_connect(argv: List[str]):
+    """Run `usenc ENCODER --connect ADDRESS` in line mode, without loading the encoders"""
+    parser = argparse.ArgumentParser(prog="usenc", add_help=False, allow_abbrev=False)
+    parser.add_argument("encoder")
+    parser.add_argument("-d", "--decode", action="store_true")
+    parser.add_argument("-i", "--input", type=Path)
+    parser.add_argument("-o", "--output", type=Path)
+    parser.add_argument("--connect", required=True)
+    args, encoder_args = parser.parse_known_args(argv)
+
+    try:
+        with ExitStack() as stack:
+            client = stack.enter_context(Client(args.connect))
+            codec = client.prepare_args(args.encoder, args.decode, encoder_args)
+
+            infile: BinaryIO = sys.stdin.buffer
+            if args.input is not None:
+                infile = stack.enter_context(args.input.open("rb"))
+            compression = detect_compression(infile, args.input)
+            if compression is not None:
+                infile = stack.enter_context(DecompressedReader(infile, compression))
+            outfile: BinaryIO = sys.stdout.buffer
+            if args.output is not None:
+                outfile = stack.enter_context(args.output.open("wb"))
+
+            for line in infile:
+                outfile.write(codec(line.rstrip()) + b"\n")
+    except KeyboardInterrupt:
+        sys.exit(130)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def main():
+    """Entry point of the `usenc` command, the full command line is only loaded when needed"""
+    if is_thin(sys.argv[1:]):
+        main_connect(sys.argv[1:])
+        return
+
+    from .cli import main as cli_main
+
+    cli_main()
@@ -0,0 +1,155 @@
+"""
+Compressed input and output streams
+
+Compressed inputs are recognized from their header (or from the file extension
+when the stream can not be peeked) and decompressed with the standard
+library `gzip`, `bz2` and `lzma` modules. Decompression runs on a separate thread,
+these modules release the GIL while they work, so it overlaps with encoding.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import re
+import threading
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Pattern, Union
+
+# Size of the decompressed chunks handed from the decompression thread
+CHUNK_SIZE = 1 << 20
+
+# Number of decompressed chunks the decompression thread can get ahead of the reader
+QUEUE_DEPTH = 4
+
+# Headers of each format, long enough that text inputs are not mistaken for them:
+# gzip magic, deflate method and flags (reserved bits unset), bz2 magic, block size
+# and first block (or end of stream) magic, xz magic
+SIGNATURES: Dict[str, Pattern[bytes]] = {
+    "gzip": re.compile(b"\x1f\x8b\x08[\x00-\x1f]"),
+    "bz2": re.compile(b"BZh[1-9](?:1AY&SY|\x17rE8P\x90)"),
+    "xz": re.compile(b"\xfd7zXZ\x00"),
+}
+
+# Number of bytes peeked to recognize a header
+SIGNATURE_SIZE = 10
+
+EXTENSIONS: Dict[str, str] = {
+    "gzip": ".gz",
+    "bz2": ".bz2",
+    "xz": ".xz",
+}
+
+COMPRESSIONS = tuple(SIGNATURES)
+
+
+def detect_compression(stream: BinaryIO, filename: Optional[Path] = None) -> Optional[str]:
+    """Compression format of a stream, from its header or else from the file extension"""
+    peek = getattr(stream, "peek", None)
+    if peek is not None:
+        head = peek(SIGNATURE_SIZE)
+        for name, signature in SIGNATURES.items():
+            if signature.match(head):
+                return name
+        return None
+
+    if filename is not None:
+        for name, extension in EXTENSIONS.items():
+            if filename.suffix == extension:
+                return name
+    return None
+
+
+def strip_extension(path: Path) -> Path:
+    """Path without its compression extension, if it has one"""
+    if path.suffix in EXTENSIONS.values():
+        return path.with_suffix("")
+    return path
+
+
+def _decompressor(stream: BinaryIO, compression: str) -> BinaryIO:
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="rb")  # type: ignore[return-value]
+    if compression == "bz2":
+        return bz2.BZ2File(stream, "rb")  # type: ignore[return-value]
+    if compression == "xz":
+        return lzma.LZMAFile(stream, "rb")  # type: ignore[return-value]
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+def compressor(stream: BinaryIO, compression: str) -> BinaryIO:
+    """Writable stream compressing into `stream` (which is left open when it is closed)"""
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=stream, mode="wb")  # type: ignore[return-value]
+    if compression == "bz2":
+        return bz2.BZ2File(stream, "wb")  # type: ignore[return-value]
+    if compression == "xz":
+        return lzma.LZMAFile(stream, "wb")  # type: ignore[return-value]
+    raise ValueError(f"Unknown compression: {compression}")
+
+
+class _ThreadedReader(io.RawIOBase):
+    """Raw stream reading the chunks that a thread reads ahead from another stream"""
+
+    def __init__(self, stream: BinaryIO):
+        super().__init__()
+        self._queue: queue.Queue[Union[bytes, BaseException]] = queue.Queue(QUEUE_DEPTH)
+        self._stop = threading.Event()
+        self._view = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._run, args=(stream,), daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Union[bytes, BaseException]) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, stream: BinaryIO):
+        try:
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not self._put(chunk) or not chunk:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:  # type: ignore[override]
+        if not self._view and not self._eof:
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                raise item
+            self._eof = not item
+            self._view = memoryview(item)
+
+        size = min(len(buffer), len(self._view))
+        buffer[:size] = self._view[:size]
+        self._view = self._view[size:]
+        return size
+
+    def close(self):
+        # Let the thread leave if it is waiting for room in the queue
+        self._stop.set()
+        self._thread.join()
+        super().close()
+
+
+class DecompressedReader(io.BufferedReader):
+    """Buffered stream of the decompressed content of a compressed stream"""
+
+    def __init__(self, stream: BinaryIO, compression: str):
+        self.compression = compression
+        self._decompressor = _decompressor(stream, compression)
+        super().__init__(_ThreadedReader(self._decompressor), CHUNK_SIZE)
+
+    def close(self):
+        super().close()
+        self._decompressor.close()
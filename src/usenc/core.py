@@ -1,4 +1,9 @@
+from functools import partial
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from .cache import CodecCache
 from .encoders import ENCODERS
+from .threads import threaded_batch
 
 
 class EncoderNotFoundError(Exception):
@@ -23,3 +28,111 @@ def decode(text: bytes, encoder_name: str, **encoder_params) -> bytes:
         raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
 
     return encoder.decode(text, **encoder_params)
+
+
+def encode_stream(chunks: Iterable[bytes], encoder_name: str, **encoder_params) -> Iterator[bytes]:
+    """Encode an input given as successive chunks, yielding the output in chunks"""
+    encoder = ENCODERS.get(encoder_name)
+    if not encoder:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+
+    return encoder.encode_stream(chunks, **encoder_params)
+
+
+def decode_stream(chunks: Iterable[bytes], encoder_name: str, **encoder_params) -> Iterator[bytes]:
+    """Decode an input given as successive chunks, yielding the output in chunks"""
+    encoder = ENCODERS.get(encoder_name)
+    if not encoder:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+
+    return encoder.decode_stream(chunks, **encoder_params)
+
+
+def encode_batch(
+    texts: Iterable[bytes], encoder_name: str, threads: int = 1, **encoder_params
+) -> List[bytes]:
+    """
+    Encode many text strings with the same encoder and parameters
+
+    With `threads` other than 1, large batches are split between a shared pool of
+    threads (0 for one per CPU), see `threads.threaded_batch`.
+    """
+    return prepare_batch(encoder_name, False, threads, **encoder_params)(texts)
+
+
+def decode_batch(
+    texts: Iterable[bytes], encoder_name: str, threads: int = 1, **encoder_params
+) -> List[bytes]:
+    """
+    Decode many text strings with the same encoder and parameters
+
+    With `threads` other than 1, large batches are split between a shared pool of
+    threads (0 for one per CPU), see `threads.threaded_batch`.
+    """
+    return prepare_batch(encoder_name, True, threads, **encoder_params)(texts)
+
+
+def prepare(
+    encoder_name: str,
+    is_decoding: bool = False,
+    cache: Optional[CodecCache] = None,
+    **encoder_params,
+) -> Callable[[bytes], bytes]:
+    """
+    Resolve an encoder and its parameters once, and return a function that
+    encodes (or decodes) a single text string
+
+    Useful when the same encoder is applied to many inputs:
+
+        codec = prepare("url", include="-")
+        for line in lines:
+            codec(line)
+
+    If a `cache` is given, results are memoized in it.
+    """
+    encoder = ENCODERS.get(encoder_name)
+    if not encoder:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+
+    method = encoder.decode if is_decoding else encoder.encode
+    codec = partial(method, **encoder_params)
+    if cache is not None:
+        return cache.wrap(codec, cache.make_key(encoder_name, is_decoding, encoder_params))
+    return codec
+
+
+def prepare_stream(
+    encoder_name: str, is_decoding: bool = False, **encoder_params
+) -> Callable[[Iterable[bytes]], Iterator[bytes]]:
+    """
+    Same as `prepare` for the streaming interface: the returned function takes
+    an iterable of input chunks and yields output chunks
+    """
+    encoder = ENCODERS.get(encoder_name)
+    if not encoder:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+
+    method = encoder.decode_stream if is_decoding else encoder.encode_stream
+    return partial(method, **encoder_params)
+
+
+def prepare_batch(
+    encoder_name: str, is_decoding: bool = False, threads: int = 1, **encoder_params
+) -> Callable[[Iterable[bytes]], List[bytes]]:
+    """
+    Same as `prepare` for the batch interface: the returned function takes
+    a list of inputs and returns the list of outputs
+
+    With `threads` other than 1, large batches are split between a shared pool of
+    threads (0 for one per CPU). This only runs faster for encoders releasing the
+    GIL (hashlib and zlib based ones on large inputs), or on free-threaded builds.
+    """
+    encoder = ENCODERS.get(encoder_name)
+    if not encoder:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+
+    method = encoder.decode_batch if is_decoding else encoder.encode_batch
+    batch_codec = partial(method, **encoder_params)
+    if threads != 1:
+        return threaded_batch(batch_codec, threads)
+    return batch_codec
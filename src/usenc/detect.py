@@ -0,0 +1,313 @@
+"""
+Detection of the encoding of unknown inputs
+
+Each reversible encoder is described by one or more profiles, built once from the
+encoder classes:
+
+    alphabet: base encoders, one profile per named alphabet, base91 and binary.
+              The input must only use bytes of the alphabet (and padding) and
+              have a valid length.
+    escape:   escape encoders, the input must contain escape sequences
+              (`%XX`, `\\uXXXX`, `&#...;`, named entities `&amp;`, ...) or
+              punycode labels (`xn--...`).
+    format:   bech32, the whole input must match the format (human-readable part,
+              separator and data), the checksum is verified when decoding.
+
+Profiles are first scored from the set of distinct bytes of the input and a few
+regex searches, without decoding. Only the best profiles are then decoded, and
+their score is weighted by how plausible the decoded output looks.
+"""
+
+import math
+import re
+from functools import lru_cache
+from html.entities import name2codepoint
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional, Pattern, Set, Type, Union
+
+from .encoders import ENCODERS
+from .encoders.base2n import Base2NEncoder
+from .encoders.base91 import Base91Encoder
+from .encoders.bech32 import CHARSET as BECH32_CHARSET
+from .encoders.bech32 import CONSTANTS as BECH32_VARIANTS
+from .encoders.bech32 import Bech32Encoder
+from .encoders.binary import BinaryEncoder
+from .encoders.chunkedbase import ChunkedBaseEncoder
+from .encoders.escape import EscapeEncoder
+from .encoders.genericbase import GenericBaseEncoder
+from .encoders.html import HtmlEncoder
+from .encoders.punycode import ACE_BYTES, PunycodeEncoder
+from .errors import CODEC_ERRORS
+
+# Encoders left out of detection (doubleurl is found as two url layers)
+EXCLUDED = {"doubleurl"}
+
+# Number of profiles actually decoded per input
+MAX_DECODES = 4
+
+# Inputs shorter than this are too ambiguous to be told apart from plain text
+MIN_LENGTH = 4
+
+# Base encoded inputs shorter than this get a lower score, as they match plain words
+FULL_CONFIDENCE_LENGTH = 16
+
+# Weight of base encoders other than the power-of-two bases, which are far more common
+UNCOMMON_BASE = 0.9
+
+# Below this probability, a base encoded input would have used more character classes
+UNLIKELY_CLASSES = 1e-3
+
+# Output plausibility: printable text, other valid UTF-8, binary data
+TEXT_OUTPUT = 1.0
+UTF8_OUTPUT = 0.7
+BINARY_OUTPUT = 0.5
+
+_WHITESPACE = dict.fromkeys(map(ord, "\t\r\n"))
+
+_CLASSES = (
+    frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"),
+    frozenset(b"abcdefghijklmnopqrstuvwxyz"),
+    frozenset(b"0123456789"),
+)
+
+
+class Candidate(NamedTuple):
+    encoder: str
+    params: Dict[str, Any]
+    score: float
+    decoded: bytes
+
+
+class Profile(NamedTuple):
+    """Detection profile: alphabet without `pattern`, escape with a `marker`, format otherwise"""
+
+    encoder: str
+    params: Dict[str, Any]
+    allowed: FrozenSet[int]
+    classes: List[FrozenSet[int]]
+    padding: bytes
+    pattern: Optional[Pattern[bytes]]
+    marker: bytes
+    weight: float
+
+
+BaseEncoder = Union[Type[Base2NEncoder], Type[ChunkedBaseEncoder], Type[GenericBaseEncoder]]
+
+
+def _alphabet_profile(
+    name: str, params: Dict[str, Any], alphabet: Union[str, bytes], padding: bytes, weight: float
+) -> Profile:
+    allowed = frozenset(alphabet.encode() if isinstance(alphabet, str) else alphabet)
+    classes = [c & allowed for c in _CLASSES if c & allowed]
+    classes.append(allowed.difference(*_CLASSES))
+    return Profile(name, params, allowed | frozenset(padding), classes, padding, None, b"", weight)
+
+
+def _alphabet_profiles(name: str, encoder: BaseEncoder) -> List[Profile]:
+    alphabets = encoder.alphabets or {"": encoder.alphabet}
+    padding = encoder.padding.encode() if issubclass(encoder, Base2NEncoder) else b""
+    weight = 1.0 if issubclass(encoder, Base2NEncoder) else UNCOMMON_BASE
+
+    return [
+        _alphabet_profile(
+            name, {"alphabet": alphabet_name} if alphabet_name else {}, alphabet, padding, weight
+        )
+        for alphabet_name, alphabet in alphabets.items()
+    ]
+
+
+def _escape_profile(name: str, encoder: Type[EscapeEncoder]) -> Optional[Profile]:
+    if not encoder.prefix:
+        # Without a prefix, escape sequences can not be told apart from base16
+        return None
+    sequence = re.escape(encoder.prefix) + f"(?:{encoder.decode_class})" + re.escape(encoder.suffix)
+    pattern = re.compile(f"(?:{sequence})+".encode())
+    return Profile(name, {}, frozenset(), [], b"", pattern, encoder.prefix.encode(), 1.0)
+
+
+def _named_entity_profile(name: str) -> Profile:
+    """Standard HTML named entities (`&amp;`), decoded by the html encoder with prefix `&`"""
+    names = "|".join(sorted(name2codepoint, key=len, reverse=True))
+    pattern = re.compile(f"(?:&(?:{names});)+".encode())
+    return Profile(name, {"prefix": "&"}, frozenset(), [], b"", pattern, b"&", 1.0)
+
+
+def _punycode_profile(name: str) -> Profile:
+    pattern = re.compile(ACE_BYTES.pattern + b"[a-zA-Z0-9-]+")
+    return Profile(name, {}, frozenset(), [], b"", pattern, b"--", 1.0)
+
+
+def _bech32_profiles(name: str) -> List[Profile]:
+    # Human-readable part, separator and at least the checksum, in a single case
+    data = BECH32_CHARSET.decode()
+    pattern = re.compile(
+        f"[!-@[-~]{{1,83}}1[{data}]{{6,}}|[!-`{{-~]{{1,83}}1[{data.upper()}]{{6,}}".encode()
+    )
+    return [
+        Profile(name, {"variant": variant}, frozenset(), [], b"", pattern, b"", 1.0)
+        for variant in BECH32_VARIANTS
+    ]
+
+
+@lru_cache(maxsize=1)
+def profiles() -> List[Profile]:
+    """Detection profiles of all the registered encoders"""
+    result: List[Profile] = []
+    for name, encoder in ENCODERS.items():
+        if name in EXCLUDED or not encoder.reversible:
+            continue
+        if issubclass(encoder, (Base2NEncoder, ChunkedBaseEncoder, GenericBaseEncoder)):
+            result.extend(_alphabet_profiles(name, encoder))
+        elif issubclass(encoder, Base91Encoder):
+            result.append(_alphabet_profile(name, {}, encoder.alphabet, b"", UNCOMMON_BASE))
+        elif issubclass(encoder, BinaryEncoder):
+            result.append(_alphabet_profile(name, {}, b"01", b"", 1.0))
+        elif issubclass(encoder, Bech32Encoder):
+            result.extend(_bech32_profiles(name))
+        elif issubclass(encoder, PunycodeEncoder):
+            result.append(_punycode_profile(name))
+        elif issubclass(encoder, EscapeEncoder):
+            profile = _escape_profile(name, encoder)
+            if profile is not None:
+                result.append(profile)
+            if issubclass(encoder, HtmlEncoder):
+                result.append(_named_entity_profile(name))
+    return result
+
+
+def _valid_length(encoder: type, length: int) -> bool:
+    """Whether an input of `length` characters (without padding) can be decoded"""
+    if issubclass(encoder, Base2NEncoder):
+        # The leftover bits must not make a whole character
+        return length * encoder.bits_per_char % 8 < encoder.bits_per_char
+    if issubclass(encoder, ChunkedBaseEncoder):
+        return length % encoder.chars_per_group != 1
+    if issubclass(encoder, BinaryEncoder):
+        return length % 8 == 0
+    return True
+
+
+def _score_alphabet(profile: Profile, text: bytes, present: FrozenSet[int]) -> float:
+    if not present <= profile.allowed:
+        return 0.0
+
+    body = text.rstrip(profile.padding) if profile.padding else text
+    length = len(body)
+    if length < MIN_LENGTH or not _valid_length(ENCODERS[profile.encoder], length):
+        return 0.0
+    if profile.padding and profile.padding[0] in body:
+        return 0.0
+
+    # Encoded data looks uniformly random: compare the number of distinct characters
+    # with the number expected from a random string of the same length
+    size = len(profile.allowed) - len(profile.padding)
+    distinct = len(present) - (profile.padding[0] in present if profile.padding else 0)
+    expected = size * (1 - (1 - 1 / size) ** length)
+    score = min(distinct / expected, 1.0) * math.sqrt(min(length / FULL_CONFIDENCE_LENGTH, 1.0))
+
+    # A random string this long would not stay within so few character classes
+    used = sum(len(c) for c in profile.classes if not present.isdisjoint(c))
+    if (used / size) ** length < UNLIKELY_CLASSES:
+        score *= 0.5
+
+    return score * profile.weight
+
+
+def _score_escape(profile: Profile, text: bytes) -> float:
+    if profile.marker not in text or profile.pattern is None:
+        return 0.0
+    covered = sum(map(len, profile.pattern.findall(text)))
+    if not covered:
+        return 0.0
+    return 0.6 + 0.4 * covered / len(text)
+
+
+def _score_format(profile: Profile, text: bytes) -> float:
+    if profile.pattern is None or not profile.pattern.fullmatch(text):
+        return 0.0
+    return profile.weight
+
+
+def _plausibility(decoded: bytes) -> float:
+    """How much the decoded output looks like real data"""
+    try:
+        text = decoded.decode("utf8")
+    except UnicodeDecodeError:
+        return BINARY_OUTPUT
+    if text.isprintable() or text.translate(_WHITESPACE).isprintable():
+        return TEXT_OUTPUT
+    return UTF8_OUTPUT
+
+
+def detect(text: bytes, limit: int = 3, threshold: float = 0.5) -> List[Candidate]:
+    """
+    Guess which encoders `text` may have been encoded with
+
+    Args:
+        text: Input of unknown encoding
+        limit: Maximum number of candidates returned
+        threshold: Minimum score (between 0 and 1) of the returned candidates
+
+    Returns:
+        Candidates sorted from the most to the least likely, with their decoded output
+    """
+    text = text.strip()
+    if len(text) < MIN_LENGTH:
+        return []
+
+    present = frozenset(text)
+    scored = []
+    for profile in profiles():
+        if profile.pattern is None:
+            score = _score_alphabet(profile, text, present)
+        elif profile.marker:
+            score = _score_escape(profile, text)
+        else:
+            score = _score_format(profile, text)
+        if score > threshold:
+            scored.append((score, len(profile.allowed), profile))
+
+    # Tightest alphabets first on equal scores
+    scored.sort(key=lambda s: (-s[0], s[1]))
+
+    candidates = []
+    decodes = 0
+    decoded_by: Set[str] = set()
+    for score, _, profile in scored:
+        if decodes == MAX_DECODES:
+            break
+        # Only the best ranked profile of each encoder that decodes the input is kept
+        if profile.encoder in decoded_by:
+            continue
+        decodes += 1
+
+        encoder = ENCODERS[profile.encoder]
+        try:
+            decoded = encoder.decode(text, **profile.params)
+        except CODEC_ERRORS:
+            continue
+        if not decoded or decoded == text:
+            continue
+        decoded_by.add(profile.encoder)
+        score *= _plausibility(decoded)
+        if score > threshold:
+            candidates.append(Candidate(profile.encoder, profile.params, score, decoded))
+
+    candidates.sort(key=lambda c: -c.score)
+    return candidates[:limit]
+
+
+def unwrap(text: bytes, max_depth: int = 8, threshold: float = 0.5) -> List[Candidate]:
+    """
+    Decode layered encodings, from the outermost layer, while one is detected
+
+    Returns:
+        The detected layers, the last one holds the fully decoded output
+    """
+    layers: List[Candidate] = []
+    for _ in range(max_depth):
+        candidates = detect(text, limit=1, threshold=threshold)
+        if not candidates:
+            break
+        layers.append(candidates[0])
+        text = candidates[0].decoded
+    return layers
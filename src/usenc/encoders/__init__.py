@@ -25,7 +25,15 @@ def discover_encoders() -> Dict[str, Type[Encoder]]:
         # Find all Encoder subclasses in the module
         for name, obj in inspect.getmembers(module, inspect.isclass):
             if issubclass(obj, Encoder) and obj is not Encoder:
-                if name in ("Encoder", "TestEncoder", "EscapeEncoder", "Base2NEncoder"):
+                if name in (
+                    "Encoder",
+                    "TestEncoder",
+                    "EscapeEncoder",
+                    "Base2NEncoder",
+                    "GenericBaseEncoder",
+                    "ChunkedBaseEncoder",
+                    "WidthEncoder",
+                ):
                     continue
                 # Generate encoder key from class name (UrlEncoder -> url)
                 encoder_key = name.replace("Encoder", "").lower()
@@ -0,0 +1,27 @@
+from .checksum import ChecksumEncoder
+
+
+class Adler32Encoder(ChecksumEncoder):
+    """
+    Adler-32 checksum encoding
+
+    Computes the Adler-32 checksum (as used by zlib) of input bytes and outputs it
+    as hex digits. Checksums are one-way and cannot be decoded.
+
+    Note: Adler-32 detects accidental changes, it must not be used for security purposes.
+
+    Examples:
+    hello world -> 1A0B045D
+    123456789 -> 091E01DE
+    """
+
+    algorithm = "adler32"
+
+    # Exclude algorithm parameter since it's defined as a class attribute
+    params = {k: v for k, v in ChecksumEncoder.params.items() if k not in {"algorithm"}}
+
+    tests = {
+        "base": {"params": "", "roundtrip": False},
+        "decimal": {"params": "--decimal", "roundtrip": False},
+        "lowercase": {"params": "--lowercase", "roundtrip": False},
+    }
@@ -1,5 +1,6 @@
-from typing import Dict
+from typing import Dict, Optional
 
+from .. import accel
 from .encoder import DecodeError, EncodeError, Encoder
 
 
@@ -97,28 +98,34 @@ class Base2NEncoder(Encoder):
         if not text:
             return b""
 
-        result = bytearray()
-        bit_buffer = 0
-        bits_in_buffer = 0
-        mask = (1 << cls.bits_per_char) - 1  # Mask to extract bits_per_char bits
-
-        for byte in text:
-            # Add byte to buffer
-            bit_buffer = (bit_buffer << 8) | byte
-            bits_in_buffer += 8
-
-            # Extract as many complete chunks as possible
-            while bits_in_buffer >= cls.bits_per_char:
-                bits_in_buffer -= cls.bits_per_char
-                index = (bit_buffer >> bits_in_buffer) & mask
+        if accel.use_numpy(len(text)):
+            result = bytearray(accel.base2n_encode(text, alphabet_bytes, cls.bits_per_char))
+        else:
+            result = bytearray()
+            bit_buffer = 0
+            bits_in_buffer = 0
+            mask = (1 << cls.bits_per_char) - 1  # Mask to extract bits_per_char bits
+
+            for byte in text:
+                # Add byte to buffer
+                bit_buffer = (bit_buffer << 8) | byte
+                bits_in_buffer += 8
+
+                # Extract as many complete chunks as possible
+                while bits_in_buffer >= cls.bits_per_char:
+                    bits_in_buffer -= cls.bits_per_char
+                    index = (bit_buffer >> bits_in_buffer) & mask
+                    result.append(alphabet_bytes[index])
+
+                # Drop extracted bits so that the buffer stays a small int
+                bit_buffer &= (1 << bits_in_buffer) - 1
+
+            # Handle remaining bits
+            if bits_in_buffer > 0:
+                # Shift remaining bits to align them to the left of the chunk
+                index = (bit_buffer << (cls.bits_per_char - bits_in_buffer)) & mask
                 result.append(alphabet_bytes[index])
 
-        # Handle remaining bits
-        if bits_in_buffer > 0:
-            # Shift remaining bits to align them to the left of the chunk
-            index = (bit_buffer << (cls.bits_per_char - bits_in_buffer)) & mask
-            result.append(alphabet_bytes[index])
-
         if not no_padding:
             # Add padding if requested
             padding = padding if padding else cls.padding
@@ -164,6 +171,11 @@ class Base2NEncoder(Encoder):
         if not text:
             return b""
 
+        if accel.use_numpy(len(text)):
+            decoded = accel.base2n_decode(text, alphabet_bytes, cls.bits_per_char)
+            if decoded is not None:
+                return decoded
+
         # Create reverse lookup table
         char_to_index = {alphabet_bytes[i]: i for i in range(len(alphabet_bytes))}
 
@@ -189,10 +201,24 @@ class Base2NEncoder(Encoder):
                 byte_value = (bit_buffer >> bits_in_buffer) & 0xFF
                 result.append(byte_value)
 
+            # Drop extracted bits so that the buffer stays a small int
+            bit_buffer &= (1 << bits_in_buffer) - 1
+
         # Note: Any remaining bits (less than 8) are padding bits and should be ignored
 
         return bytes(result)
 
+    @classmethod
+    def output_ratio(cls, is_decoding: bool = False, **kwargs) -> Optional[float]:
+        ratio = 8 / cls.bits_per_char
+        return 1 / ratio if is_decoding else ratio
+
+    @classmethod
+    def split_alignment(cls, is_decoding: bool = False, **kwargs) -> int:
+        """Inputs can be cut between groups of characters, only the last group is padded"""
+        group_bits = cls.bits_per_char * 8 // cls._gcd(cls.bits_per_char, 8)
+        return group_bits // cls.bits_per_char if is_decoding else group_bits // 8
+
     @staticmethod
     def _gcd(a: int, b: int) -> int:
         """Calculate greatest common divisor"""
@@ -0,0 +1,32 @@
+from .genericbase import GenericBaseEncoder
+
+
+class Base36Encoder(GenericBaseEncoder):
+    """
+    Base36 encoding
+
+    Encodes binary data as a big-endian number written with 36 ASCII characters
+    (0-9, A-Z). Each leading zero byte is kept as a leading 0.
+
+    Alternative alphabets:
+
+        - upper: 0-9, A-Z (default)
+        - lower: 0-9, a-z
+
+    Examples:
+        hello -> 5PZCSZU7
+        hello world -> FUVRSIVVNFRBJWAJO
+    """
+
+    alphabet = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    base = 36
+
+    alphabets = {
+        "upper": b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ",
+        "lower": b"0123456789abcdefghijklmnopqrstuvwxyz",
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": True},
+        "lower_alphabet": {"params": "--alphabet lower", "roundtrip": True},
+    }
@@ -0,0 +1,25 @@
+from .chunkedbase import ChunkedBaseEncoder
+
+
+class Base45Encoder(ChunkedBaseEncoder):
+    """
+    Base45 encoding (RFC 9285)
+
+    Encodes each group of 2 bytes as 3 characters out of 45 (0-9, A-Z, space and $%*+-./:),
+    least significant digit first. A final single byte is encoded as 2 characters.
+    Base45 is designed for QR codes in alphanumeric mode (as in EU Digital COVID Certificates).
+
+    Examples:
+        hello -> +8D VDL2
+        hello world -> +8D VD82EK4F.KEA2
+    """
+
+    alphabet = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ $%*+-./:"
+    base = 45
+    bytes_per_group = 2
+    chars_per_group = 3
+    little_endian = True
+
+    tests = {
+        "base": {"params": "", "roundtrip": True},
+    }
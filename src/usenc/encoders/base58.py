@@ -0,0 +1,36 @@
+from .genericbase import GenericBaseEncoder
+
+
+class Base58Encoder(GenericBaseEncoder):
+    """
+    Base58 encoding
+
+    Encodes binary data as a big-endian number written with 58 ASCII characters,
+    leaving out characters that look alike (0, O, I, l). Each leading zero byte
+    is kept as a leading 1 (bitcoin alphabet).
+
+    Alternative alphabets:
+
+        - bitcoin: 1-9, A-Z, a-z without 0, O, I, l (default)
+        - flickr: 1-9, a-z, A-Z without 0, O, I, l
+        - ripple: rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz
+
+    Examples:
+        hello -> Cn8eVZg
+        hello world -> StV1DL6CwTryKyV
+    """
+
+    alphabet = b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+    base = 58
+
+    alphabets = {
+        "bitcoin": b"123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz",
+        "flickr": b"123456789abcdefghijkmnopqrstuvwxyzABCDEFGHJKLMNPQRSTUVWXYZ",
+        "ripple": b"rpshnaf39wBUDNEGHJKLM4PQRST7VWXYZ2bcdeCg65jkm8oFqi1tuvAxyz",
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": True},
+        "flickr_alphabet": {"params": "--alphabet flickr", "roundtrip": True},
+        "ripple_alphabet": {"params": "--alphabet ripple", "roundtrip": True},
+    }
@@ -0,0 +1,32 @@
+from .genericbase import GenericBaseEncoder
+
+
+class Base62Encoder(GenericBaseEncoder):
+    """
+    Base62 encoding
+
+    Encodes binary data as a big-endian number written with 62 alphanumeric
+    ASCII characters. Each leading zero byte is kept as a leading 0.
+
+    Alternative alphabets:
+
+        - standard: 0-9, A-Z, a-z (default)
+        - inverted: 0-9, a-z, A-Z
+
+    Examples:
+        hello -> 7tQLFHz
+        hello world -> AAwf93rvy4aWQVw
+    """
+
+    alphabet = b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+    base = 62
+
+    alphabets = {
+        "standard": b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz",
+        "inverted": b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ",
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": True},
+        "inverted_alphabet": {"params": "--alphabet inverted", "roundtrip": True},
+    }
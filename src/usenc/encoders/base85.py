@@ -0,0 +1,111 @@
+import base64
+import binascii
+from typing import Iterable, Iterator
+
+from .chunkedbase import ChunkedBaseEncoder
+from .encoder import DecodeError
+
+B85_ALPHABET = (
+    b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!#$%&()*+-;<=>?@^_`{|}~"
+)
+ASCII85_ALPHABET = bytes(range(0x21, 0x76))
+
+ASCII85_WHITESPACE = b" \t\n\r\v"
+
+
+class Base85Encoder(ChunkedBaseEncoder):
+    """
+    Base85 encoding
+
+    Encodes each group of 4 bytes as 5 characters out of 85. A final partial group
+    of k bytes is encoded as k + 1 characters.
+
+    Alternative alphabets:
+
+        - ascii: ! to u, with z for 4 zero bytes (Ascii85 / btoa, default)
+        - rfc1924: 0-9, A-Z, a-z, !#$%&()*+-;<=>?@^_`{|}~ (as used by git)
+        - z85: 0-9, a-z, A-Z, .-:+=^!/*?&<>()[]{}@%$# (ZeroMQ Z85)
+
+    The ascii and rfc1924 alphabets use python base64 module, other alphabets
+    are translated from rfc1924. Whitespace is ignored when decoding Ascii85.
+
+    Examples:
+        hello -> BOu!rDZ
+        hello world -> BOu!rD]j7BEbo7
+    """
+
+    alphabet = ASCII85_ALPHABET
+
+    alphabets = {
+        "ascii": ASCII85_ALPHABET,
+        "rfc1924": B85_ALPHABET,
+        "z85": b"0123456789abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ.-:+=^!/*?&<>()[]{}@%$#",
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": True},
+        "rfc1924_alphabet": {"params": "--alphabet rfc1924", "roundtrip": True},
+        "z85_alphabet": {"params": "--alphabet z85", "roundtrip": True},
+    }
+
+    @classmethod
+    def encode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        alphabet_bytes = cls._get_alphabet(alphabet)
+        if alphabet_bytes == ASCII85_ALPHABET:
+            return base64.a85encode(text)
+
+        encoded = base64.b85encode(text)
+        if alphabet_bytes == B85_ALPHABET:
+            return encoded
+        return encoded.translate(bytes.maketrans(B85_ALPHABET, alphabet_bytes))
+
+    @classmethod
+    def decode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        alphabet_bytes = cls._get_alphabet(alphabet)
+        try:
+            if alphabet_bytes == ASCII85_ALPHABET:
+                return base64.a85decode(text)
+
+            if alphabet_bytes != B85_ALPHABET:
+                invalid = text.translate(None, alphabet_bytes)
+                if invalid:
+                    byte = invalid[0]
+                    raise DecodeError(
+                        f"Invalid character '{chr(byte)}' (0x{byte:02x}) for {cls.__name__}"
+                    )
+                text = text.translate(bytes.maketrans(alphabet_bytes, B85_ALPHABET))
+            return base64.b85decode(text)
+        except (ValueError, binascii.Error) as e:
+            raise DecodeError(f"{cls.__name__}: {e}") from e
+
+    @classmethod
+    def split_alignment(cls, is_decoding: bool = False, alphabet: str = "", **kwargs) -> int:
+        # Ascii85 groups are not aligned on 5 characters (z shortcut, ignored whitespace)
+        if is_decoding and cls._get_alphabet(alphabet) == ASCII85_ALPHABET:
+            return 0
+        return super().split_alignment(is_decoding, alphabet=alphabet, **kwargs)
+
+    @classmethod
+    def decode_stream(
+        cls, chunks: Iterable[bytes], alphabet: str = "", **kwargs
+    ) -> Iterator[bytes]:
+        if cls._get_alphabet(alphabet) == ASCII85_ALPHABET:
+            chunks = cls._expand_ascii85(chunks)
+        return super().decode_stream(chunks, alphabet=alphabet, **kwargs)
+
+    @classmethod
+    def _expand_ascii85(cls, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Drop whitespace and expand the z shortcut so that chunks split on 5 characters
+        groups, z is only valid between two groups
+        """
+        # Number of characters of the current group already seen
+        position = 0
+        for chunk in chunks:
+            parts = chunk.translate(None, ASCII85_WHITESPACE).split(b"z")
+            for part in parts[:-1]:
+                position = (position + len(part)) % 5
+                if position:
+                    raise DecodeError(f"{cls.__name__}: z inside Ascii85 5-tuple")
+            position = (position + len(parts[-1])) % 5
+            yield b"!!!!!".join(parts)
@@ -0,0 +1,268 @@
+import struct
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .. import accel
+from .encoder import DecodeError, EncodeError, Encoder
+
+BASE91_ALPHABET = (
+    b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789!#$%&()*+,./:;<=>?@[]^_`{|}~"'
+)
+
+# Groups are 13 bits, or 14 bits when the 13 bit value is at most 88 (so that
+# every group fits in two characters: 91 * 91 = 8281 values)
+MAX_SHORT = 88
+
+WORD_MASK = (1 << 64) - 1
+
+# Input block size of the NumPy backend, which needs a few words per input bit
+ACCEL_BLOCK = 1 << 16
+
+# The NumPy backend only beats the table loops from about 8 times accel.NUMPY_MIN_SIZE
+ACCEL_FACTOR = 8
+
+
+@lru_cache(maxsize=16)
+def _encode_table(alphabet: bytes) -> List[Tuple[bytes, int]]:
+    """Two characters and width in bits of the group starting with each 14 bit value"""
+    table = []
+    for value in range(1 << 14):
+        width = 13 if value & 0x1FFF > MAX_SHORT else 14
+        value &= (1 << width) - 1
+        table.append((bytes((alphabet[value % 91], alphabet[value // 91])), width))
+    return table
+
+
+@lru_cache(maxsize=16)
+def _decode_table(alphabet: bytes) -> List[Optional[Tuple[int, int]]]:
+    """Value and width in bits of each pair of characters, read as a little-endian 16 bit word"""
+    table: List[Optional[Tuple[int, int]]] = [None] * (1 << 16)
+    for low, first in enumerate(alphabet):
+        for high, second in enumerate(alphabet):
+            value = low + high * 91
+            table[first | second << 8] = (value, 13 if value & 0x1FFF > MAX_SHORT else 14)
+    return table
+
+
+class Base91EncodeState:
+    """
+    Incremental basE91 encoder
+
+    `update` returns the output of each chunk, `finish` the output of the
+    last bits. Bits are consumed 64 at a time and split in groups with a
+    table lookup on their 14 first bits.
+    """
+
+    def __init__(self, alphabet: bytes = BASE91_ALPHABET):
+        self.alphabet = alphabet
+        self._table = _encode_table(alphabet)
+        self._bits = 0
+        self._count = 0
+        self._rest = b""
+
+    def _groups(self, bits: int, count: int, out: List[bytes]) -> Tuple[int, int]:
+        table = self._table
+        while count > 13:
+            pair, width = table[bits & 0x3FFF]
+            out.append(pair)
+            bits >>= width
+            count -= width
+        return bits, count
+
+    def update(self, data: bytes) -> bytes:
+        if self._rest:
+            data = self._rest + data
+            self._rest = b""
+        if accel.use_numpy(len(data), ACCEL_FACTOR):
+            return self._update_numpy(data)
+
+        full = len(data) - len(data) % 8
+        self._rest = data[full:]
+
+        table = self._table
+        bits, count = self._bits, self._count
+        out: List[bytes] = []
+        append = out.append
+        for word in struct.unpack(f"<{full // 8}Q", memoryview(data)[:full]):
+            bits |= word << count
+            count += 64
+            while count > 13:
+                pair, width = table[bits & 0x3FFF]
+                append(pair)
+                bits >>= width
+                count -= width
+        self._bits, self._count = bits, count
+        return b"".join(out)
+
+    def _update_numpy(self, data: bytes) -> bytes:
+        out = []
+        for i in range(0, len(data), ACCEL_BLOCK):
+            # The pending bits (13 at most) end the 2 bytes before the block
+            start = 16 - self._count
+            block = (self._bits << start).to_bytes(2, "little") + data[i : i + ACCEL_BLOCK]
+            encoded, end = accel.base91_encode(block, start, self.alphabet)
+            out.append(encoded)
+            self._bits = int.from_bytes(block[end // 8 :], "little") >> end % 8
+            self._count = 8 * len(block) - end
+        return b"".join(out)
+
+    def finish(self) -> bytes:
+        out: List[bytes] = []
+        bits = self._bits | int.from_bytes(self._rest, "little") << self._count
+        bits, count = self._groups(bits, self._count + 8 * len(self._rest), out)
+        self._bits, self._count, self._rest = 0, 0, b""
+
+        # Last group, on one character when it fits
+        if count:
+            out.append(self.alphabet[bits % 91 : bits % 91 + 1])
+            if count > 7 or bits > 90:
+                out.append(self.alphabet[bits // 91 : bits // 91 + 1])
+        return b"".join(out)
+
+
+class Base91DecodeState:
+    """
+    Incremental basE91 decoder
+
+    Characters are read in pairs as 16 bit words and looked up in a table of
+    group values, the output is flushed 64 bits at a time.
+    """
+
+    def __init__(self, alphabet: bytes = BASE91_ALPHABET):
+        self.alphabet = alphabet
+        self._table = _decode_table(alphabet)
+        self._bits = 0
+        self._count = 0
+        self._rest = b""
+
+    def _invalid(self, data: bytes) -> DecodeError:
+        byte = next(c for c in data if c not in self.alphabet)
+        return DecodeError(f"Invalid character '{chr(byte)}' (0x{byte:02x}) for Base91Encoder")
+
+    def update(self, data: bytes) -> bytes:
+        if self._rest:
+            data = self._rest + data
+        full = len(data) - len(data) % 2
+        self._rest = data[full:]
+
+        if accel.use_numpy(full, ACCEL_FACTOR):
+            # Flush the full bytes of the pending bits, the backend takes less than 8
+            flushed = self._count // 8
+            head = (self._bits & ((1 << 8 * flushed) - 1)).to_bytes(flushed, "little")
+            decoded = accel.base91_decode(
+                data[:full], self._bits >> 8 * flushed, self._count % 8, self.alphabet
+            )
+            if decoded is None:
+                raise self._invalid(data)
+            out, self._bits, self._count = decoded
+            return head + out
+
+        table = self._table
+        bits, count = self._bits, self._count
+        words: List[int] = []
+        try:
+            for key in struct.unpack(f"<{full // 2}H", memoryview(data)[:full]):
+                value, width = table[key]  # type: ignore[misc]
+                bits |= value << count
+                count += width
+                if count >= 64:
+                    words.append(bits & WORD_MASK)
+                    bits >>= 64
+                    count -= 64
+        except TypeError:
+            raise self._invalid(data) from None
+        self._bits, self._count = bits, count
+        return struct.pack(f"<{len(words)}Q", *words)
+
+    def finish(self) -> bytes:
+        bits, count, rest = self._bits, self._count, self._rest
+        self._bits, self._count, self._rest = 0, 0, b""
+
+        out = bits.to_bytes(count // 8 + 1, "little")[: count // 8]
+        if rest:
+            # A single last character holds the last byte
+            digit = self.alphabet.find(rest)
+            if digit == -1:
+                raise self._invalid(rest)
+            out += bytes((((bits >> (count - count % 8)) | digit << (count % 8)) & 0xFF,))
+        return out
+
+
+class Base91Encoder(Encoder):
+    """
+    basE91 encoding
+
+    Encodes the input bits in groups of 13 or 14 bits, each written as two
+    characters out of 91 printable ASCII characters. The output is about 23%
+    longer than the input (33% for base64).
+
+    Encoding and decoding go through incremental state objects
+    (`Base91EncodeState`, `Base91DecodeState`), which also stream bulk inputs.
+
+    Examples:
+    hello -> TPwJh>A
+    hello world -> TPwJh>Io2Tv!lE
+    """
+
+    params = {
+        "alphabet": {
+            "type": str,
+            "default": None,
+            "help": "Custom alphabet to use for encoding (must have 91 characters)",
+        },
+    }
+
+    tests = {"base": {"params": "", "roundtrip": True}}
+
+    alphabet = BASE91_ALPHABET
+
+    @classmethod
+    def _get_alphabet(cls, alphabet_param: str = "") -> bytes:
+        """Get the alphabet to use, either from parameter or default"""
+        if not alphabet_param:
+            return cls.alphabet
+
+        try:
+            alphabet = alphabet_param.encode("ascii")
+        except UnicodeEncodeError as e:
+            raise EncodeError(f"Alphabet must be ASCII: {e}") from e
+
+        if len(alphabet) != 91:
+            raise EncodeError(f"{cls.__name__}: alphabet length ({len(alphabet)}) must be 91")
+        if len(set(alphabet)) != len(alphabet):
+            raise EncodeError(f"{cls.__name__}: alphabet characters must be unique")
+        return alphabet
+
+    @classmethod
+    def encode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        state = Base91EncodeState(cls._get_alphabet(alphabet))
+        return state.update(text) + state.finish()
+
+    @classmethod
+    def decode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        state = Base91DecodeState(cls._get_alphabet(alphabet))
+        return state.update(text) + state.finish()
+
+    @classmethod
+    def encode_stream(
+        cls, chunks: Iterable[bytes], alphabet: str = "", **kwargs
+    ) -> Iterator[bytes]:
+        """Encode each chunk with the same state, the bits left over carry to the next chunk"""
+        state = Base91EncodeState(cls._get_alphabet(alphabet))
+        for chunk in chunks:
+            output = state.update(chunk)
+            if output:
+                yield output
+        yield state.finish()
+
+    @classmethod
+    def decode_stream(
+        cls, chunks: Iterable[bytes], alphabet: str = "", **kwargs
+    ) -> Iterator[bytes]:
+        """Decode each chunk with the same state, the bits left over carry to the next chunk"""
+        state = Base91DecodeState(cls._get_alphabet(alphabet))
+        for chunk in chunks:
+            output = state.update(chunk)
+            if output:
+                yield output
+        yield state.finish()
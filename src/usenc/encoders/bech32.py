@@ -0,0 +1,242 @@
+import base64
+from functools import lru_cache
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from .encoder import DecodeError, EncodeError, Encoder
+
+CHARSET = b"qpzry9x8gf2tvdw0s3jn54khce6mua7l"
+
+# Generator of the BCH code, and constant XORed into the checksum of each variant
+GENERATOR = (0x3B6A57B2, 0x26508E6D, 0x1EA119FA, 0x3D4233DD, 0x2A1462B3)
+CONSTANTS: Dict[str, int] = {"bech32": 1, "bech32m": 0x2BC830A3}
+VARIANTS = {constant: variant for variant, constant in CONSTANTS.items()}
+
+CHECKSUM_LENGTH = 6
+INVALID = 0xFF
+
+# Translation from base32 (RFC 4648) characters to bech32 characters and back
+B32_ALPHABET = b"ABCDEFGHIJKLMNOPQRSTUVWXYZ234567"
+TO_BECH32 = bytes.maketrans(B32_ALPHABET, CHARSET)
+FROM_BECH32 = bytes.maketrans(CHARSET, B32_ALPHABET)
+
+# Translation from bech32 characters (lowercase) to their 5 bit values
+VALUES = bytes(CHARSET.index(c) if c in CHARSET else INVALID for c in range(256))
+SYMBOLS = CHARSET + bytes(256 - len(CHARSET))
+
+
+def _step_table(symbols: int) -> List[int]:
+    """
+    Effect of the top bits of the checksum state when `symbols` symbols are shifted in
+
+    The polymod step is linear: the low bits are shifted, and the top 5 bits
+    of each step XOR a combination of the generators, precomputed here for
+    every value of the top `5 * symbols` bits.
+    """
+    table = []
+    for top in range(1 << 5 * symbols):
+        state = top << 30 - 5 * symbols
+        for _ in range(symbols):
+            bits = state >> 25
+            state = (state & 0x1FFFFFF) << 5
+            for i, generator in enumerate(GENERATOR):
+                if bits >> i & 1:
+                    state ^= generator
+        table.append(state)
+    return table
+
+
+SYMBOL_TABLE = _step_table(1)
+PAIR_TABLE = _step_table(2)
+
+
+def polymod(values: bytes, state: int = 1) -> int:
+    """BCH checksum state after the 5 bit `values`, two symbols per table lookup"""
+    if len(values) % 2:
+        state = ((state & 0x1FFFFFF) << 5 ^ values[0]) ^ SYMBOL_TABLE[state >> 25]
+        values = values[1:]
+    table = PAIR_TABLE
+    for high, low in zip(values[0::2], values[1::2]):
+        state = ((state & 0xFFFFF) << 10 ^ high << 5 ^ low) ^ table[state >> 20]
+    return state
+
+
+@lru_cache(maxsize=64)
+def _hrp_state(hrp: bytes) -> Optional[int]:
+    """
+    Checksum state after the expanded human-readable part, shared by all its addresses
+    (None if the human-readable part has characters out of the printable ASCII range)
+    """
+    if min(hrp) < 33 or max(hrp) > 126:
+        return None
+    return polymod(bytes(c >> 5 for c in hrp) + b"\x00" + bytes(c & 31 for c in hrp))
+
+
+class Parsed(NamedTuple):
+    hrp: bytes
+    values: bytes  # 5 bit values of the data part, without the checksum
+    variant: str
+    error: str
+
+
+def parse(text: bytes) -> Parsed:
+    """Split and verify a bech32 string, errors are returned in `error` rather than raised"""
+    lower = text.lower()
+    if lower != text and text.upper() != text:
+        return Parsed(b"", b"", "", "mixed case")
+
+    separator = lower.rfind(b"1")
+    if separator < 1:
+        return Parsed(b"", b"", "", "missing human-readable part or separator")
+    if len(lower) - separator - 1 < CHECKSUM_LENGTH:
+        return Parsed(b"", b"", "", "checksum too short")
+
+    hrp = lower[:separator]
+    state = _hrp_state(hrp)
+    if state is None:
+        return Parsed(b"", b"", "", "invalid character in human-readable part")
+
+    values = lower[separator + 1 :].translate(VALUES)
+    invalid = values.find(INVALID)
+    if invalid != -1:
+        char = chr(lower[separator + 1 + invalid])
+        return Parsed(hrp, b"", "", f"invalid character '{char}' in data part")
+
+    variant = VARIANTS.get(polymod(values, state))
+    if variant is None:
+        return Parsed(hrp, b"", "", "invalid checksum")
+    return Parsed(hrp, values[:-CHECKSUM_LENGTH], variant, "")
+
+
+class Bech32Encoder(Encoder):
+    """
+    Bech32 and Bech32m encoding (BIP 173, BIP 350)
+
+    Encodes bytes as a human-readable part (`--hrp`), the separator `1`, the data
+    in 5 bit groups and a 6 character BCH checksum, as used by Nostr keys. Decoding
+    verifies the checksum and the human-readable part (when `--hrp` is given).
+    Bitcoin segwit addresses put a 5 bit witness version before the data, so they
+    are not bytes in 5 bit groups: check them with `--validate` rather than decoding.
+
+    With `--validate`, each input is checked instead of decoded and the output is
+    `valid bech32`, `valid bech32m` or `invalid: <reason>`, without raising on
+    invalid inputs. Checksums are computed two symbols at a time from a table of
+    the generator combinations, and the state after the human-readable part is
+    cached.
+
+    Examples:
+    hello (--hrp test) -> test1dpjkcmr09ys0qs
+    hello world (--hrp test) -> test1dpjkcmr0ypmk7unvvswqzdky
+    """
+
+    params = {
+        "hrp": {
+            "type": str,
+            "default": "",
+            "help": "Human-readable part (required to encode, checked when decoding)",
+        },
+        "variant": {
+            "type": str,
+            "default": "bech32",
+            "choices": list(CONSTANTS),
+            "help": "Checksum variant (bech32 or bech32m)",
+        },
+        "validate": {
+            "action": "store_true",
+            "help": "When decoding, report whether each input is valid instead of decoding it",
+        },
+    }
+
+    tests = {
+        "base": {"params": "--hrp test", "roundtrip": True},
+        "bech32m": {"params": "--hrp bc --variant bech32m", "roundtrip": True},
+    }
+
+    @staticmethod
+    def _get_hrp(hrp: str) -> Tuple[bytes, int]:
+        """Human-readable part to encode with, and the checksum state after it"""
+        try:
+            hrp_bytes = hrp.lower().encode("ascii")
+        except UnicodeEncodeError as e:
+            raise EncodeError(f"human-readable part must be ASCII: {e}") from e
+        if not hrp_bytes:
+            raise EncodeError("hrp parameter is required")
+        state = _hrp_state(hrp_bytes)
+        if state is None:
+            raise EncodeError("human-readable part must be printable ASCII without spaces")
+        return hrp_bytes, state
+
+    @classmethod
+    def encode(cls, text: bytes, hrp: str = "", variant: str = "bech32", **kwargs) -> bytes:
+        hrp_bytes, state = cls._get_hrp(hrp)
+        data = base64.b32encode(text).rstrip(b"=").translate(TO_BECH32)
+        state = polymod(data.translate(VALUES) + bytes(CHECKSUM_LENGTH), state)
+        state ^= CONSTANTS[variant]
+        checksum = bytes(state >> 5 * (5 - i) & 31 for i in range(CHECKSUM_LENGTH))
+        return hrp_bytes + b"1" + data + checksum.translate(SYMBOLS)
+
+    @classmethod
+    def _validate(cls, text: bytes, hrp: bytes) -> bytes:
+        parsed = parse(text)
+        if parsed.error:
+            return f"invalid: {parsed.error}".encode()
+        if hrp and parsed.hrp != hrp:
+            return f"invalid: human-readable part '{parsed.hrp.decode()}'".encode()
+        return f"valid {parsed.variant}".encode()
+
+    @classmethod
+    def decode(
+        cls,
+        text: bytes,
+        hrp: str = "",
+        variant: str = "bech32",
+        validate: bool = False,
+        **kwargs,
+    ) -> bytes:
+        hrp_bytes = hrp.lower().encode("ascii", "replace")
+        if validate:
+            return cls._validate(text, hrp_bytes)
+
+        parsed = parse(text)
+        if parsed.error:
+            raise DecodeError(f"Bech32Encoder: {parsed.error}")
+        if parsed.variant != variant:
+            raise DecodeError(f"Bech32Encoder: {parsed.variant} checksum, expected {variant}")
+        if hrp_bytes and parsed.hrp != hrp_bytes:
+            raise DecodeError(
+                f"Bech32Encoder: human-readable part '{parsed.hrp.decode()}', expected '{hrp}'"
+            )
+
+        # Groups of 5 bits back to bytes: the padding must be shorter than a group and zero
+        values = parsed.values
+        padding = len(values) * 5 % 8
+        if padding >= 5 or (values and values[-1] & (1 << padding) - 1):
+            raise DecodeError("Bech32Encoder: invalid padding, the data is not 8 bit groups")
+        data = values.translate(SYMBOLS).translate(FROM_BECH32)
+        return base64.b32decode(data + b"=" * (-len(data) % 8))
+
+    @classmethod
+    def decode_batch(
+        cls,
+        texts: Iterable[bytes],
+        hrp: str = "",
+        variant: str = "bech32",
+        validate: bool = False,
+        **kwargs,
+    ) -> List[bytes]:
+        """
+        Decode (or validate) many inputs
+
+        Validation never raises: invalid inputs get an `invalid: <reason>` line.
+        """
+        if validate:
+            hrp_bytes = hrp.lower().encode("ascii", "replace")
+            return [cls._validate(text, hrp_bytes) for text in texts]
+        return [cls.decode(text, hrp=hrp, variant=variant) for text in texts]
+
+    @classmethod
+    def output_ratio(
+        cls, is_decoding: bool = False, validate: bool = False, **kwargs
+    ) -> Optional[float]:
+        if validate and is_decoding:
+            return None
+        return 5 / 8 if is_decoding else 8 / 5
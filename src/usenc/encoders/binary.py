@@ -0,0 +1,154 @@
+import re
+from typing import Iterable, Iterator, Optional
+
+from .encoder import DecodeError, EncodeError, Encoder
+
+# Ignored when decoding, like the separator
+WHITESPACE = b" \t\r\n\v\f"
+
+# Only used to report the first invalid character, the check deletes 0 and 1 instead
+NOT_BIT = re.compile(b"[^01]")
+
+
+class BinaryEncoder(Encoder):
+    """
+    Binary (bit string) encoding
+
+    Encodes each byte as 8 characters `0` or `1`, most significant bit first.
+    With `--separator`, groups of `--group` bytes are separated by the separator.
+    The separator and whitespace are ignored when decoding.
+
+    The whole input is converted at once through a Python integer (conversions
+    from and to base 2 run in C), and separators are inserted with one strided
+    slice assignment per character position, so no Python code runs per byte.
+
+    Examples:
+    hello -> 0110100001100101011011000110110001101111
+    hi (--separator " ") -> 01101000 01101001
+    """
+
+    params = {
+        "separator": {"type": str, "default": "", "help": "Separator between groups of bits"},
+        "group": {
+            "type": int,
+            "default": 1,
+            "help": "Number of bytes in each group of bits separated by the separator",
+        },
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": True},
+        "separator": {"params": "--separator :", "roundtrip": True},
+        "group": {"params": "--separator _ --group 2", "roundtrip": True},
+    }
+
+    @staticmethod
+    def _get_separator(separator: str, group: int) -> bytes:
+        separator_bytes = separator.encode()
+        if b"0" in separator_bytes or b"1" in separator_bytes:
+            raise EncodeError(f"separator ({separator}) can not contain 0 or 1")
+        if group < 1:
+            raise EncodeError(f"group ({group}) must be at least 1 byte")
+        return separator_bytes
+
+    @staticmethod
+    def _bits(text: bytes) -> bytes:
+        """Bits of text, without separators"""
+        if not text:
+            return b""
+        return format(int.from_bytes(text, "big"), f"0{8 * len(text)}b").encode("ascii")
+
+    @classmethod
+    def encode(cls, text: bytes, separator: str = "", group: int = 1, **kwargs) -> bytes:
+        separator_bytes = cls._get_separator(separator, group)
+        bits = cls._bits(text)
+        if not separator_bytes or len(text) <= group:
+            return bits
+
+        # Lay out whole groups (the last one padded), then cut the padding
+        width = 8 * group
+        groups = -(-len(text) // group)
+        padding = width * groups - len(bits)
+        stride = width + len(separator_bytes)
+        out = bytearray(stride * groups - len(separator_bytes))
+        bits += b"0" * padding
+        for i in range(width):
+            out[i::stride] = bits[i::width]
+        for i, char in enumerate(separator_bytes):
+            out[width + i :: stride] = bytes((char,)) * (groups - 1)
+        return bytes(out[: len(out) - padding])
+
+    @classmethod
+    def decode(cls, text: bytes, separator: str = "", group: int = 1, **kwargs) -> bytes:
+        try:
+            separator_bytes = cls._get_separator(separator, group)
+        except EncodeError as e:
+            raise DecodeError(str(e)) from e
+
+        bits = text.translate(None, WHITESPACE + separator_bytes)
+        if bits.translate(None, b"01"):
+            byte = NOT_BIT.search(bits).group()[0]  # type: ignore[union-attr]
+            raise DecodeError(f"Invalid character '{chr(byte)}' (0x{byte:02x}) for {cls.__name__}")
+        if len(bits) % 8:
+            raise DecodeError(f"{cls.__name__}: {len(bits)} bits is not a whole number of bytes")
+        if not bits:
+            return b""
+        return int(bits, 2).to_bytes(len(bits) // 8, "big")
+
+    @classmethod
+    def output_ratio(
+        cls, is_decoding: bool = False, separator: str = "", group: int = 1, **kwargs
+    ) -> Optional[float]:
+        ratio = (8 * group + len(separator.encode())) / max(group, 1)
+        return 1 / ratio if is_decoding else ratio
+
+    @classmethod
+    def split_alignment(cls, is_decoding: bool = False, separator: str = "", **kwargs) -> int:
+        """
+        Encoded inputs can be cut between any two bytes (unless parts would miss
+        the separator between them), decoded inputs may hold whitespace anywhere
+        """
+        return 0 if is_decoding or separator else 1
+
+    @classmethod
+    def encode_stream(
+        cls, chunks: Iterable[bytes], separator: str = "", group: int = 1, **kwargs
+    ) -> Iterator[bytes]:
+        """Encode the whole groups of each chunk, carrying the remainder to the next one"""
+        separator_bytes = cls._get_separator(separator, group)
+        if not separator_bytes:
+            group = 1
+
+        rest = b""
+        first = True
+        for chunk in chunks:
+            data = rest + chunk
+            full = len(data) - len(data) % group
+            rest = data[full:]
+            if full:
+                yield (b"" if first else separator_bytes) + cls.encode(
+                    data[:full], separator, group
+                )
+                first = False
+        if rest:
+            yield (b"" if first else separator_bytes) + cls.encode(rest, separator, group)
+
+    @classmethod
+    def decode_stream(
+        cls, chunks: Iterable[bytes], separator: str = "", group: int = 1, **kwargs
+    ) -> Iterator[bytes]:
+        """Decode the whole bytes of each chunk, carrying the remaining bits to the next one"""
+        try:
+            delete = WHITESPACE + cls._get_separator(separator, group)
+        except EncodeError as e:
+            raise DecodeError(str(e)) from e
+
+        rest = b""
+        for chunk in chunks:
+            bits = rest + chunk.translate(None, delete)
+            full = len(bits) - len(bits) % 8
+            rest = bits[full:]
+            if full:
+                yield cls.decode(bits[:full])
+        if rest:
+            yield cls.decode(rest)
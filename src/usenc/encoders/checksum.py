@@ -0,0 +1,277 @@
+import binascii
+import zlib
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple
+
+from .encoder import DecodeError, EncodeError, Encoder
+
+
+class Checksum(NamedTuple):
+    """Incremental checksum: `update(value, data)` is called on each chunk, starting from `init`"""
+
+    init: int
+    update: Callable[[int, bytes], int]
+    xorout: int
+    bits: int
+
+
+@lru_cache(maxsize=None)
+def _crc16_table(poly: int, reflected: bool) -> List[int]:
+    """Precompute the CRC of each byte value for a 16 bits polynomial"""
+    table = []
+    if reflected:
+        rpoly = int(f"{poly:016b}"[::-1], 2)
+        for byte in range(256):
+            crc = byte
+            for _ in range(8):
+                crc = (crc >> 1) ^ rpoly if crc & 1 else crc >> 1
+            table.append(crc)
+    else:
+        for byte in range(256):
+            crc = byte << 8
+            for _ in range(8):
+                crc = ((crc << 1) ^ poly if crc & 0x8000 else crc << 1) & 0xFFFF
+            table.append(crc)
+    return table
+
+
+def _crc16_update(poly: int, reflected: bool) -> Callable[[int, bytes], int]:
+    """Table-driven CRC16 update function"""
+    if poly == 0x1021 and not reflected:
+        # CRC-CCITT is available in C
+        return lambda crc, data: binascii.crc_hqx(data, crc)
+
+    table = _crc16_table(poly, reflected)
+
+    if reflected:
+
+        def update(crc: int, data: bytes) -> int:
+            for byte in data:
+                crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+            return crc
+
+    else:
+
+        def update(crc: int, data: bytes) -> int:
+            for byte in data:
+                crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ byte]
+            return crc
+
+    return update
+
+
+def _fnv_update(prime: int, bits: int, xor_first: bool) -> Callable[[int, bytes], int]:
+    """
+    FNV-1 (multiply then xor) or FNV-1a (xor then multiply) update function
+
+    Only the low `bits` bits of the state are needed for both steps, so the
+    reduction modulo 2^bits is done once per 8-byte word instead of once per byte.
+    """
+    mask = (1 << bits) - 1
+
+    if xor_first:
+
+        def update(h: int, data: bytes) -> int:
+            if len(data) <= 32:
+                for byte in data:
+                    h = (h ^ byte) * prime
+                return h & mask
+
+            n = len(data) & ~7
+            it = iter(data[:n])
+            for b0, b1, b2, b3, b4, b5, b6, b7 in zip(it, it, it, it, it, it, it, it):
+                h = (h ^ b0) * prime
+                h = (h ^ b1) * prime
+                h = (h ^ b2) * prime
+                h = (h ^ b3) * prime
+                h = (h ^ b4) * prime
+                h = (h ^ b5) * prime
+                h = (h ^ b6) * prime
+                h = ((h ^ b7) * prime) & mask
+            for byte in data[n:]:
+                h = (h ^ byte) * prime
+            return h & mask
+
+    else:
+
+        def update(h: int, data: bytes) -> int:
+            if len(data) <= 32:
+                for byte in data:
+                    h = (h * prime) ^ byte
+                return h & mask
+
+            n = len(data) & ~7
+            it = iter(data[:n])
+            for b0, b1, b2, b3, b4, b5, b6, b7 in zip(it, it, it, it, it, it, it, it):
+                h = (h * prime) ^ b0
+                h = (h * prime) ^ b1
+                h = (h * prime) ^ b2
+                h = (h * prime) ^ b3
+                h = (h * prime) ^ b4
+                h = (h * prime) ^ b5
+                h = (h * prime) ^ b6
+                h = ((h * prime) ^ b7) & mask
+            for byte in data[n:]:
+                h = (h * prime) ^ byte
+            return h & mask
+
+    return update
+
+
+FNV_32 = (0x811C9DC5, 0x01000193)
+FNV_64 = (0xCBF29CE484222325, 0x100000001B3)
+
+CHECKSUMS: Dict[str, Checksum] = {
+    "crc32": Checksum(0, lambda value, data: zlib.crc32(data, value), 0, 32),
+    "adler32": Checksum(1, lambda value, data: zlib.adler32(data, value), 0, 32),
+    "crc16-arc": Checksum(0x0000, _crc16_update(0x8005, True), 0x0000, 16),
+    "crc16-modbus": Checksum(0xFFFF, _crc16_update(0x8005, True), 0x0000, 16),
+    "crc16-usb": Checksum(0xFFFF, _crc16_update(0x8005, True), 0xFFFF, 16),
+    "crc16-xmodem": Checksum(0x0000, _crc16_update(0x1021, False), 0x0000, 16),
+    "crc16-ccitt-false": Checksum(0xFFFF, _crc16_update(0x1021, False), 0x0000, 16),
+    "crc16-kermit": Checksum(0x0000, _crc16_update(0x1021, True), 0x0000, 16),
+    "crc16-x25": Checksum(0xFFFF, _crc16_update(0x1021, True), 0xFFFF, 16),
+    "fnv1-32": Checksum(FNV_32[0], _fnv_update(FNV_32[1], 32, False), 0, 32),
+    "fnv1-64": Checksum(FNV_64[0], _fnv_update(FNV_64[1], 64, False), 0, 64),
+    "fnv1a-32": Checksum(FNV_32[0], _fnv_update(FNV_32[1], 32, True), 0, 32),
+    "fnv1a-64": Checksum(FNV_64[0], _fnv_update(FNV_64[1], 64, True), 0, 64),
+}
+
+
+class ChecksumEncoder(Encoder):
+    """
+    Base checksum encoder (CRC32, Adler-32, CRC16, FNV)
+
+    This encoder computes non-cryptographic checksums of input bytes and outputs
+    them as hex (or decimal) numbers. CRC32 and Adler-32 use python zlib, CRC16
+    variants are table-driven. Checksums are one-way operations and cannot be decoded.
+
+    Can be used directly with --algorithm parameter. Supported algorithms are
+    crc32, adler32, crc16-{arc,modbus,usb,xmodem,ccitt-false,kermit,x25}
+    and fnv1-{32,64}, fnv1a-{32,64}
+
+    Examples:
+    hello world (crc32) -> 0D4A1185
+    hello world (adler32) -> 1A0B045D
+    hello world (crc16-arc) -> 39C1
+    """
+
+    params = {
+        "algorithm": {
+            "type": str,
+            "default": None,
+            "required": True,
+            "choices": list(CHECKSUMS),
+            "help": "Checksum algorithm name",
+        },
+        "decimal": {"action": "store_true", "help": "Output the checksum as a decimal number"},
+        "lowercase": {"action": "store_true", "help": "Output hex digits in lowercase"},
+    }
+
+    tests = {
+        "base": {"params": "--algorithm crc32", "roundtrip": False},
+        "decimal": {"params": "--algorithm adler32 --decimal", "roundtrip": False},
+        "lowercase": {"params": "--algorithm crc16-modbus --lowercase", "roundtrip": False},
+    }
+
+    # Subclasses can define this to avoid requiring algorithm parameter
+    algorithm: str = ""
+
+    reversible = False
+
+    @classmethod
+    def _algorithm(cls, *, algorithm: str = "", **kwargs) -> str:
+        """
+        Name of the checksum algorithm selected by the parameters
+
+        Subclasses override it to map their own parameters (`--bits`, `--variant`)
+        to an algorithm name.
+        """
+        return algorithm if algorithm else cls.algorithm
+
+    @classmethod
+    def _get_checksum(cls, **kwargs) -> Checksum:
+        algorithm = cls._algorithm(**kwargs)
+
+        if not algorithm:
+            raise EncodeError("algorithm parameter is required")
+
+        try:
+            return CHECKSUMS[algorithm]
+        except KeyError as e:
+            raise EncodeError(f"Unknown checksum algorithm '{algorithm}'") from e
+
+    @staticmethod
+    def _format_checksum(
+        checksum: Checksum, value: int, decimal: bool = False, lowercase: bool = False
+    ) -> bytes:
+        value ^= checksum.xorout
+        if decimal:
+            return str(value).encode("ascii")
+        hex_format = "{:0{}x}" if lowercase else "{:0{}X}"
+        return hex_format.format(value, checksum.bits // 4).encode("ascii")
+
+    @classmethod
+    def encode(
+        cls,
+        text: bytes,
+        algorithm: str = "",
+        decimal: bool = False,
+        lowercase: bool = False,
+        **kwargs,
+    ) -> bytes:
+        """
+        Compute the checksum of input bytes
+
+        Args:
+            text: Input bytes
+            algorithm: Checksum algorithm name (required if not defined in class)
+            decimal: If True, output a decimal number; otherwise hex digits
+            lowercase: If True, output lowercase hex; otherwise uppercase
+
+        Returns:
+            Checksum as bytes
+        """
+        checksum = cls._get_checksum(algorithm=algorithm, **kwargs)
+        value = checksum.update(checksum.init, text)
+        return cls._format_checksum(checksum, value, decimal, lowercase)
+
+    @classmethod
+    def encode_stream(
+        cls,
+        chunks: Iterable[bytes],
+        algorithm: str = "",
+        decimal: bool = False,
+        lowercase: bool = False,
+        **kwargs,
+    ) -> Iterator[bytes]:
+        """Compute the checksum incrementally over the chunks"""
+        checksum = cls._get_checksum(algorithm=algorithm, **kwargs)
+        value = checksum.init
+        for chunk in chunks:
+            value = checksum.update(value, chunk)
+        yield cls._format_checksum(checksum, value, decimal, lowercase)
+
+    @classmethod
+    def encode_batch(
+        cls,
+        texts: Iterable[bytes],
+        algorithm: str = "",
+        decimal: bool = False,
+        lowercase: bool = False,
+        **kwargs,
+    ) -> List[bytes]:
+        """Compute the checksum of each input, resolving the algorithm only once"""
+        checksum = cls._get_checksum(algorithm=algorithm, **kwargs)
+        init, update, fmt = checksum.init, checksum.update, cls._format_checksum
+        return [fmt(checksum, update(init, text), decimal, lowercase) for text in texts]
+
+    @classmethod
+    def decode(cls, text: bytes, **kwargs) -> bytes:
+        """
+        Checksums are one-way and cannot be decoded
+
+        Raises:
+            DecodeError: Always, as checksums cannot be reversed
+        """
+        raise DecodeError(f"{cls.__name__}: checksums cannot be decoded (one-way operation)")
@@ -0,0 +1,249 @@
+import struct
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .encoder import DecodeError, EncodeError, Encoder
+
+INVALID = 0xFF
+
+# struct formats reading a whole group as one big-endian word
+STRUCT_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+@lru_cache(maxsize=64)
+def _tables(alphabet: bytes) -> Tuple[bytes, bytes]:
+    """Translation tables from digit values to alphabet bytes and back (INVALID if not a digit)"""
+    encode_table = bytes(alphabet) + bytes(256 - len(alphabet))
+    decode_table = bytearray([INVALID]) * 256
+    for i, char in enumerate(alphabet):
+        decode_table[char] = i
+    return encode_table, bytes(decode_table)
+
+
+@lru_cache(maxsize=16)
+def _word_table(alphabet: bytes, chars: int, little_endian: bool, words: int) -> List[bytes]:
+    """Encoded group of every possible word value, for groups of at most 2 bytes"""
+    base = len(alphabet)
+    table = []
+    for word in range(words):
+        group = bytearray(chars)
+        for i in range(chars) if little_endian else range(chars - 1, -1, -1):
+            word, digit = divmod(word, base)
+            group[i] = alphabet[digit]
+        table.append(bytes(group))
+    return table
+
+
+class ChunkedBaseEncoder(Encoder):
+    """
+    Base encoder for fixed group encodings (base45, base85, etc.)
+
+    The input is split in groups of `bytes_per_group` bytes, each group is read as
+    one number and written as `chars_per_group` digits in the encoder base. A final
+    partial group of k bytes is written as k + 1 digits.
+
+    Groups are unpacked from the whole buffer at once with `struct`. When a group
+    fits in 2 bytes, the encoded form of every possible group is precomputed.
+    """
+
+    params = {
+        "alphabet": {
+            "type": str,
+            "default": None,
+            "help": "Custom alphabet to use for encoding (must have the same length as the base)",
+        },
+    }
+
+    tests = {"base": {"params": "", "roundtrip": True}}
+
+    # Subclasses must define these
+    alphabet: bytes = (
+        b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz!#$%&()*+-;<=>?@^_`{|}~"
+    )
+    base: int = 85
+    bytes_per_group: int = 4
+    chars_per_group: int = 5
+    little_endian: bool = False  # Least significant digit first
+
+    # Dictionary of alternative alphabets (can be overridden by subclasses)
+    alphabets: Dict[str, bytes] = {}
+
+    @classmethod
+    def _get_alphabet(cls, alphabet_param: str = "") -> bytes:
+        """Get the alphabet to use, either from parameter, named alphabet, or default"""
+        if not alphabet_param:
+            return cls.alphabet
+
+        if alphabet_param in cls.alphabets:
+            return cls.alphabets[alphabet_param]
+
+        try:
+            alphabet = alphabet_param.encode("ascii")
+        except UnicodeEncodeError as e:
+            raise EncodeError(f"Alphabet must be ASCII: {e}") from e
+
+        if len(alphabet) != cls.base:
+            raise EncodeError(
+                f"{cls.__name__}: alphabet length ({len(alphabet)}) must equal the base ({cls.base})"
+            )
+        if len(set(alphabet)) != len(alphabet):
+            raise EncodeError(f"{cls.__name__}: alphabet characters must be unique")
+        return alphabet
+
+    @classmethod
+    def _unpack(cls, data: bytes) -> Sequence[int]:
+        """Read each full group of data as a big-endian word"""
+        size = cls.bytes_per_group
+        count = len(data) // size
+        fmt = STRUCT_FORMATS.get(size)
+        if fmt:
+            return struct.unpack(f">{count}{fmt}", data)
+        return [int.from_bytes(data[i : i + size], "big") for i in range(0, len(data), size)]
+
+    @classmethod
+    def _encode_word(cls, word: int, alphabet: bytes) -> bytearray:
+        """Digits of one group in the alphabet"""
+        group = bytearray(cls.chars_per_group)
+        positions = range(cls.chars_per_group)
+        for i in positions if cls.little_endian else reversed(positions):
+            word, digit = divmod(word, cls.base)
+            group[i] = alphabet[digit]
+        return group
+
+    @classmethod
+    def _decode_word(cls, digits: bytes) -> int:
+        """Value of the digit values of one group"""
+        word = 0
+        for digit in reversed(digits) if cls.little_endian else digits:
+            word = word * cls.base + digit
+        return word
+
+    @classmethod
+    def _decode_words(cls, digits: bytes) -> List[int]:
+        """Values of all the full groups of digit values, one digit position at a time"""
+        chars, base = cls.chars_per_group, cls.base
+        positions = list(range(chars))
+        if cls.little_endian:
+            positions.reverse()
+
+        words = list(digits[positions[0] :: chars])
+        for i in positions[1:]:
+            words = [word * base + digit for word, digit in zip(words, digits[i::chars])]
+        return words
+
+    @classmethod
+    def encode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        """
+        Encode bytes group by group
+
+        Args:
+            text: Input bytes to encode
+            alphabet: Custom alphabet string or name of predefined alphabet
+
+        Returns:
+            Encoded bytes
+        """
+        alphabet_bytes = cls._get_alphabet(alphabet)
+        size = cls.bytes_per_group
+        full = len(text) - len(text) % size
+        words = cls._unpack(text[:full])
+
+        if size <= 2:
+            table = _word_table(alphabet_bytes, cls.chars_per_group, cls.little_endian, 256**size)
+            result = bytearray(b"".join(map(table.__getitem__, words)))
+        else:
+            result = bytearray()
+            for word in words:
+                result += cls._encode_word(word, alphabet_bytes)
+
+        rest = text[full:]
+        if rest:
+            # A partial group of k bytes is padded with zeros and keeps k + 1 digits
+            value = rest if cls.little_endian else rest + bytes(size - len(rest))
+            group = cls._encode_word(int.from_bytes(value, "big"), alphabet_bytes)
+            result += group[: len(rest) + 1]
+
+        return bytes(result)
+
+    @classmethod
+    def decode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        """
+        Decode bytes group by group
+
+        Args:
+            text: Encoded bytes to decode
+            alphabet: Custom alphabet string or name of predefined alphabet
+
+        Returns:
+            Decoded bytes
+        """
+        alphabet_bytes = cls._get_alphabet(alphabet)
+        _, decode_table = _tables(alphabet_bytes)
+
+        digits = text.translate(decode_table)
+        invalid = digits.find(INVALID)
+        if invalid != -1:
+            byte = text[invalid]
+            raise DecodeError(f"Invalid character '{chr(byte)}' (0x{byte:02x}) for {cls.__name__}")
+
+        size, chars = cls.bytes_per_group, cls.chars_per_group
+        full = len(digits) - len(digits) % chars
+        words = cls._decode_words(digits[:full])
+
+        try:
+            fmt = STRUCT_FORMATS.get(size)
+            if fmt:
+                result = struct.pack(f">{len(words)}{fmt}", *words)
+            else:
+                result = b"".join(word.to_bytes(size, "big") for word in words)
+
+            rest = digits[full:]
+            if len(rest) == 1:
+                raise DecodeError(f"{cls.__name__}: truncated input (single trailing character)")
+            if rest:
+                # A partial group of k digits was padded, it holds k - 1 bytes
+                if cls.little_endian:
+                    result += cls._decode_word(rest).to_bytes(len(rest) - 1, "big")
+                else:
+                    padded = rest + bytes([cls.base - 1]) * (chars - len(rest))
+                    result += cls._decode_word(padded).to_bytes(size, "big")[: len(rest) - 1]
+        except (struct.error, OverflowError) as e:
+            raise DecodeError(f"{cls.__name__}: group value out of range") from e
+
+        return result
+
+    @classmethod
+    def output_ratio(cls, is_decoding: bool = False, **kwargs) -> Optional[float]:
+        ratio = cls.chars_per_group / cls.bytes_per_group
+        return 1 / ratio if is_decoding else ratio
+
+    @classmethod
+    def split_alignment(cls, is_decoding: bool = False, **kwargs) -> int:
+        """Inputs can be cut between groups, only the last group can be partial"""
+        return cls.chars_per_group if is_decoding else cls.bytes_per_group
+
+    @classmethod
+    def encode_stream(cls, chunks: Iterable[bytes], **kwargs) -> Iterator[bytes]:
+        """Encode the full groups of each chunk, carrying the remainder to the next one"""
+        rest = b""
+        for chunk in chunks:
+            data = rest + chunk
+            full = len(data) - len(data) % cls.bytes_per_group
+            rest = data[full:]
+            if full:
+                yield cls.encode(data[:full], **kwargs)
+        if rest:
+            yield cls.encode(rest, **kwargs)
+
+    @classmethod
+    def decode_stream(cls, chunks: Iterable[bytes], **kwargs) -> Iterator[bytes]:
+        """Decode the full groups of each chunk, carrying the remainder to the next one"""
+        rest = b""
+        for chunk in chunks:
+            data = rest + chunk
+            full = len(data) - len(data) % cls.chars_per_group
+            rest = data[full:]
+            if full:
+                yield cls.decode(data[:full], **kwargs)
+        if rest:
+            yield cls.decode(rest, **kwargs)
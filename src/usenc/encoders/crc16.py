@@ -0,0 +1,52 @@
+from .checksum import CHECKSUMS, ChecksumEncoder
+
+
+class Crc16Encoder(ChecksumEncoder):
+    """
+    CRC16 checksum encoding
+
+    Computes a 16 bits CRC of input bytes and outputs it as hex digits.
+    Checksums are one-way and cannot be decoded.
+
+    Available variants (polynomial, initial value, reflection and final xor):
+
+        - arc: 0x8005, init 0x0000, reflected (default)
+        - modbus: 0x8005, init 0xFFFF, reflected
+        - usb: 0x8005, init 0xFFFF, reflected, xor 0xFFFF
+        - xmodem: 0x1021, init 0x0000
+        - ccitt-false: 0x1021, init 0xFFFF
+        - kermit: 0x1021, init 0x0000, reflected
+        - x25: 0x1021, init 0xFFFF, reflected, xor 0xFFFF
+
+    Examples:
+    hello world -> 39C1
+    123456789 -> BB3D
+    """
+
+    algorithm = "crc16-arc"
+
+    variants = [name[len("crc16-") :] for name in CHECKSUMS if name.startswith("crc16-")]
+
+    params = {
+        **{k: v for k, v in ChecksumEncoder.params.items() if k not in {"algorithm"}},
+        "variant": {
+            "type": str,
+            "default": "arc",
+            "choices": variants,
+            "help": "CRC16 variant (polynomial and parameters)",
+        },
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": False},
+        "decimal": {"params": "--decimal", "roundtrip": False},
+        "modbus": {"params": "--variant modbus", "roundtrip": False},
+        "xmodem": {"params": "--variant xmodem", "roundtrip": False},
+        "ccitt_false": {"params": "--variant ccitt-false", "roundtrip": False},
+        "kermit": {"params": "--variant kermit", "roundtrip": False},
+        "x25": {"params": "--variant x25 --lowercase", "roundtrip": False},
+    }
+
+    @classmethod
+    def _algorithm(cls, *, variant: str = "", **kwargs) -> str:
+        return f"crc16-{variant}" if variant else super()._algorithm(**kwargs)
@@ -0,0 +1,27 @@
+from .checksum import ChecksumEncoder
+
+
+class Crc32Encoder(ChecksumEncoder):
+    """
+    CRC32 checksum encoding
+
+    Computes the CRC32 checksum (ISO-HDLC, as used by zip, gzip and png) of input
+    bytes and outputs it as hex digits. Checksums are one-way and cannot be decoded.
+
+    Note: CRC32 detects accidental changes, it must not be used for security purposes.
+
+    Examples:
+    hello world -> 0D4A1185
+    123456789 -> CBF43926
+    """
+
+    algorithm = "crc32"
+
+    # Exclude algorithm parameter since it's defined as a class attribute
+    params = {k: v for k, v in ChecksumEncoder.params.items() if k not in {"algorithm"}}
+
+    tests = {
+        "base": {"params": "", "roundtrip": False},
+        "decimal": {"params": "--decimal", "roundtrip": False},
+        "lowercase": {"params": "--lowercase", "roundtrip": False},
+    }
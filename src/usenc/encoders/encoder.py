@@ -1,4 +1,4 @@
-from typing import Any, Dict, TypedDict
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, TypedDict
 
 
 class EncodeError(Exception):
@@ -13,6 +13,19 @@ class DecodeError(Exception):
     pass
 
 
+class Capabilities(NamedTuple):
+    """How an encoder processes its input, used to choose an execution strategy"""
+
+    output_ratio: Optional[float]  # Output size / input size, None if not fixed
+    byte_oriented: bool  # Works on raw bytes, not on characters decoded with input_charset
+    charset_sensitive: bool  # Output depends on the input and output charsets
+    reversible: bool  # Encoded output can be decoded
+    stateless: bool  # Each record is processed independently of the others
+    streamable: bool  # Processes a stream chunk by chunk, with bounded memory
+    batched: bool  # Has a batch implementation faster than one call per record
+    split_alignment: int  # See `Encoder.split_alignment`
+
+
 class Encoder:
     """Base class for encoders - makes adding new encoders simple"""
 
@@ -24,6 +37,7 @@ class Encoder:
         nargs: str
         const: str
         required: bool
+        choices: Any
 
     class ConfigTests(TypedDict):
         params: str
@@ -32,6 +46,12 @@ class Encoder:
     params: Dict[str, Args] = {}
     tests: Dict[str, ConfigTests] = {"base": {"params": "", "roundtrip": False}}
 
+    # Capabilities (see `Capabilities`), subclasses override what differs
+    byte_oriented: bool = True
+    charset_sensitive: bool = False
+    reversible: bool = True
+    stateless: bool = True
+
     @classmethod
     def encode(cls, text: bytes, **kwargs) -> bytes:
         raise NotImplementedError
@@ -39,3 +59,77 @@ class Encoder:
     @classmethod
     def decode(cls, text: bytes, **kwargs) -> bytes:
         raise NotImplementedError
+
+    @classmethod
+    def capabilities(cls, is_decoding: bool = False, **kwargs) -> Capabilities:
+        """Capabilities of the encoder (or decoder) with the given parameters"""
+        mode = "decode" if is_decoding else "encode"
+        return Capabilities(
+            output_ratio=cls.output_ratio(is_decoding, **kwargs),
+            byte_oriented=cls.byte_oriented,
+            charset_sensitive=cls.charset_sensitive,
+            reversible=cls.reversible,
+            stateless=cls.stateless,
+            streamable=cls._overrides(f"{mode}_stream"),
+            batched=cls._overrides(f"{mode}_batch"),
+            split_alignment=cls.split_alignment(is_decoding, **kwargs),
+        )
+
+    @classmethod
+    def _overrides(cls, method: str) -> bool:
+        """Whether the encoder replaces the default implementation of a method"""
+        return getattr(cls, method).__func__ is not getattr(Encoder, method).__func__
+
+    @classmethod
+    def output_ratio(cls, is_decoding: bool = False, **kwargs) -> Optional[float]:
+        """Ratio of output size to input size on large inputs, None if it is not fixed"""
+        return None
+
+    @classmethod
+    def split_alignment(cls, is_decoding: bool = False, **kwargs) -> int:
+        """
+        Alignment (in bytes) of the points where a bulk input can be cut
+
+        Each part can then be encoded (or decoded) separately and the outputs
+        concatenated, which allows parallel processing. 0 means the input can not be cut.
+        """
+        return 0
+
+    @classmethod
+    def encode_stream(cls, chunks: Iterable[bytes], **kwargs) -> Iterator[bytes]:
+        """
+        Encode an input given as successive chunks, yielding the output in chunks
+
+        The default implementation joins all the chunks and encodes them at once.
+        Encoders that can work incrementally override it to keep memory bounded.
+        """
+        yield cls.encode(b"".join(chunks), **kwargs)
+
+    @classmethod
+    def decode_stream(cls, chunks: Iterable[bytes], **kwargs) -> Iterator[bytes]:
+        """
+        Decode an input given as successive chunks, yielding the output in chunks
+
+        The default implementation joins all the chunks and decodes them at once.
+        Encoders that can work incrementally override it to keep memory bounded.
+        """
+        yield cls.decode(b"".join(chunks), **kwargs)
+
+    @classmethod
+    def encode_batch(cls, texts: Iterable[bytes], **kwargs) -> List[bytes]:
+        """
+        Encode many independent inputs with the same parameters
+
+        The default implementation calls `encode` on each input. Encoders with
+        a per-call setup cost override it to do the setup once for the batch.
+        """
+        return [cls.encode(text, **kwargs) for text in texts]
+
+    @classmethod
+    def decode_batch(cls, texts: Iterable[bytes], **kwargs) -> List[bytes]:
+        """
+        Decode many independent inputs with the same parameters
+
+        The default implementation calls `decode` on each input.
+        """
+        return [cls.decode(text, **kwargs) for text in texts]
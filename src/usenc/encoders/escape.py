@@ -1,8 +1,88 @@
+import codecs
 import re
+from functools import lru_cache, partial
+from typing import Callable, Dict, List, Optional, Pattern
 
 from ..utils import escape_for_char_class, transform_keywords
 from .encoder import DecodeError, EncodeError, Encoder
 
+# Charsets where encoding each character separately gives back the original bytes,
+# and where characters boundaries can be found from the bytes alone
+BYTE_TRANSPARENT_CHARSETS = {"utf-8", "ascii", "iso8859-1"}
+
+# Escapes whose meaning depends on the character set (\s, \w, \d, \uNNNN, \x80, ...)
+CHARSET_DEPENDENT_ESCAPE = re.compile(r"\\(?!x[0-7][0-9a-fA-F])[A-Za-z0-9]")
+
+# Parts of character classes that match every non-ASCII character
+NON_ASCII_RANGES = ("\\s\\S", "\\x80-\\U0010ffff", "\\u0080-\\U0010ffff")
+
+# Selection of every byte, escaped without a regex
+ALL_BYTES = re.compile(b"[\\x00-\\xff]+")
+
+
+@lru_cache(maxsize=32)
+def lookup_codec(charset: str) -> codecs.CodecInfo:
+    """Codec of a charset, looked up once per charset name"""
+    return codecs.lookup(charset)
+
+
+def byte_transparent(input_charset: str, output_charset: str) -> bool:
+    """Whether both charsets are the same charset, in which characters are their own bytes"""
+    try:
+        name = lookup_codec(input_charset).name
+        return name == lookup_codec(output_charset).name and name in BYTE_TRANSPARENT_CHARSETS
+    except LookupError:
+        return False
+
+
+@lru_cache(maxsize=64)
+def _character_class(character_class: str, include: str, exclude: str) -> str:
+    """Regex matching one character to be encoded"""
+    # Convert include and exlude strings as regex character classes
+    safe_include = transform_keywords(escape_for_char_class(include))
+    safe_exclude = transform_keywords(escape_for_char_class(exclude))
+
+    regex = rf"[{character_class}]"
+    if safe_include != "":
+        regex = rf"({regex}|[{safe_include}])"
+    if safe_exclude != "":
+        regex = rf"(?![{safe_exclude}]){regex}"
+    return regex
+
+
+@lru_cache(maxsize=64)
+def _bytes_regex(regex: str) -> Pattern[bytes]:
+    """Compiled bytes version of an ASCII regex"""
+    return re.compile(regex.encode("ascii"))
+
+
+@lru_cache(maxsize=64)
+def _selected_bytes(char_regex: str) -> Optional[Pattern[bytes]]:
+    """
+    Bytes regex matching runs of the bytes selected by a one character regex,
+    ALL_BYTES if every byte is selected, None if selection can not be done on bytes
+
+    Selection is done per byte when the regex treats every non-ASCII character
+    the same way: then every byte of a multi-byte UTF-8 character (or every
+    high byte of latin-1) gets the same answer as the character itself.
+    """
+    rest = char_regex
+    for uniform in NON_ASCII_RANGES:
+        rest = rest.replace(uniform, "")
+    if not rest.isascii() or CHARSET_DEPENDENT_ESCAPE.search(rest):
+        return None
+
+    single = re.compile(char_regex)
+    selected = [i for i in range(128) if single.fullmatch(chr(i))]
+    if single.fullmatch("\u00e9"):
+        selected += range(128, 256)
+
+    if len(selected) == 256:
+        return ALL_BYTES
+    if not selected:
+        return re.compile(b"(?!)")
+    return re.compile(b"[" + b"".join(re.escape(bytes([i])) for i in selected) + b"]+")
+
 
 class EscapeEncoder(Encoder):
     """
@@ -50,6 +130,10 @@ class EscapeEncoder(Encoder):
 
     prefix: str = ""
     suffix: str = ""
+
+    # Characters are decoded with input_charset and encoded one by one
+    byte_oriented = False
+    charset_sensitive = True
     character_class: str = "\\s\\S"
     decode_class: str = "[a-fA-F0-9]{2}"
 
@@ -57,10 +141,35 @@ class EscapeEncoder(Encoder):
     def encode_char(cls, c: str, **kwargs) -> str:
         raise NotImplementedError
 
+    @classmethod
+    def byte_table(
+        cls, prefix: str, suffix: str, lowercase: bool, output_charset: str, **kwargs
+    ) -> Optional[List[bytes]]:
+        """
+        Encoded form of each byte, for encoders that escape the bytes of the
+        characters rather than their code points (None otherwise)
+        """
+        return None
+
     @classmethod
     def decode_char(cls, seq: str, **kwargs) -> str:
         raise NotImplementedError
 
+    @classmethod
+    def split_alignment(
+        cls, is_decoding: bool = False, regex: str = "", input_charset: str = "utf8", **kwargs
+    ) -> int:
+        """
+        Characters are encoded one by one, inputs can be cut between any two characters
+        (a custom regex may match across the cut, escape sequences are not split-safe)
+        """
+        if is_decoding or regex:
+            return 0
+        try:
+            return 1 if lookup_codec(input_charset).name in BYTE_TRANSPARENT_CHARSETS else 0
+        except LookupError:
+            return 0
+
     @classmethod
     def encode(
         cls,
@@ -75,18 +184,20 @@ class EscapeEncoder(Encoder):
         output_charset: str = "utf8",
         **kwargs,
     ) -> bytes:
+        prefix = cls.prefix if prefix == "" else prefix
+        suffix = cls.suffix if suffix == "" else suffix
+
+        char_regex = None
         if regex == "":
-            # Convert include and exlude strings as regex character classes
-            # Build a regex that matches characters to be encoded
-            safe_include = transform_keywords(escape_for_char_class(include))
-            safe_exclude = transform_keywords(escape_for_char_class(exclude))
-
-            regex = rf"[{cls.character_class}]"
-            if safe_include != "":
-                regex = rf"({regex}|[{safe_include}])"
-            if safe_exclude != "":
-                regex = rf"(?![{safe_exclude}]){regex}"
-            regex = rf"(?:{regex})+"
+            char_regex = _character_class(cls.character_class, include, exclude)
+            regex = rf"(?:{char_regex})+"
+
+        # Same charset on both sides: escape the selected bytes directly
+        if char_regex is not None and byte_transparent(input_charset, output_charset):
+            table = cls.byte_table(prefix, suffix, lowercase, output_charset, **kwargs)
+            selected = _selected_bytes(char_regex) if table is not None else None
+            if table is not None and selected is not None:
+                return cls._encode_bytes(text, table, selected, input_charset)
 
         try:
             # Use a custom provided regex
@@ -94,31 +205,44 @@ class EscapeEncoder(Encoder):
         except re.error as e:
             raise EncodeError(f"regex error: {e}") from e
 
-        prefix = cls.prefix if prefix == "" else prefix
-        suffix = cls.suffix if suffix == "" else suffix
+        encode_char = partial(
+            cls.encode_char,
+            lowercase=lowercase,
+            prefix=prefix,
+            suffix=suffix,
+            input_charset=input_charset,
+            output_charset=output_charset,
+            **kwargs,
+        )
 
         def replace(match):
             # Encode this part of the string
-            enc_string = ""
-            for x in match.group(0):
-                enc_string += cls.encode_char(
-                    x,
-                    lowercase=lowercase,
-                    prefix=prefix,
-                    suffix=suffix,
-                    input_charset=input_charset,
-                    output_charset=output_charset,
-                    **kwargs,
-                )
-            return enc_string
+            return "".join(map(encode_char, match.group(0)))
 
         try:
-            return enc_regex.sub(replace, text.decode(input_charset)).encode(output_charset)
+            decoded = lookup_codec(input_charset).decode(text)[0]
+            return lookup_codec(output_charset).encode(enc_regex.sub(replace, decoded))[0]
         except UnicodeDecodeError as e:
             raise EncodeError(f"input-charset '{input_charset}' decoding failed: {e}") from e
         except UnicodeEncodeError as e:
             raise EncodeError(f"output-charset '{output_charset}' encoding failed: {e}") from e
 
+    @staticmethod
+    def _encode_bytes(
+        text: bytes, table: List[bytes], selected: Pattern[bytes], charset: str
+    ) -> bytes:
+        """Escape the selected bytes of text with their encoded form from table"""
+        codec = lookup_codec(charset)
+        if codec.name != "iso8859-1":
+            try:
+                codec.decode(text)
+            except UnicodeDecodeError as e:
+                raise EncodeError(f"input-charset '{charset}' decoding failed: {e}") from e
+
+        if selected is ALL_BYTES:
+            return b"".join(map(table.__getitem__, text))
+        return selected.sub(lambda match: b"".join(map(table.__getitem__, match.group())), text)
+
     @classmethod
     def decode(
         cls,
@@ -136,24 +260,60 @@ class EscapeEncoder(Encoder):
         prefix = cls.prefix if prefix == "" else prefix
         suffix = cls.suffix if suffix == "" else suffix
 
+        decode_char = partial(
+            cls.decode_char,
+            prefix=prefix,
+            suffix=suffix,
+            input_charset=input_charset,
+            output_charset=output_charset,
+            **kwargs,
+        )
+
         def replace(match):
             # Decode a sequence of chars
-            return cls.decode_char(
-                match.group(0),
-                prefix=prefix,
-                suffix=suffix,
-                input_charset=input_charset,
-                output_charset=output_charset,
-                **kwargs,
-            )
+            return decode_char(match.group(0))
+
+        regex = f"({re.escape(prefix)}({cls.decode_class}){re.escape(suffix)})+"
+
+        # Same charset on both sides: only the escape sequences go through str
+        if regex.isascii() and byte_transparent(input_charset, output_charset):
+            return cls._decode_sequences(text, _bytes_regex(regex), decode_char, input_charset)
 
         try:
-            return re.sub(
-                f"({re.escape(prefix)}({cls.decode_class}){re.escape(suffix)})+",
-                replace,
-                text.decode(input_charset),
-            ).encode(output_charset)
+            return lookup_codec(output_charset).encode(
+                re.sub(regex, replace, lookup_codec(input_charset).decode(text)[0])
+            )[0]
         except UnicodeDecodeError as e:
             raise DecodeError(f"input-charset '{input_charset}' decoding failed: {e}") from e
         except UnicodeEncodeError as e:
             raise DecodeError(f"output-charset '{output_charset}' encoding failed: {e}") from e
+
+    @staticmethod
+    def _decode_sequences(
+        text: bytes, regex: Pattern[bytes], decode_char: Callable[[str], str], charset: str
+    ) -> bytes:
+        """Replace each run of escape sequences of text by its decoded characters"""
+        codec = lookup_codec(charset)
+        if codec.name != "iso8859-1" and not text.isascii():
+            try:
+                codec.decode(text)
+            except UnicodeDecodeError as e:
+                raise DecodeError(f"input-charset '{charset}' decoding failed: {e}") from e
+
+        # Escaped texts repeat the same few sequences, each run is decoded once
+        decoded: Dict[bytes, bytes] = {}
+
+        def replace_bytes(match):
+            run = match.group(0)
+            try:
+                return decoded[run]
+            except KeyError:
+                # Prefix and suffix are ASCII, so runs never start or end inside a character
+                result = codec.encode(decode_char(codec.decode(run)[0]))[0]
+                decoded[run] = result
+                return result
+
+        try:
+            return regex.sub(replace_bytes, text)
+        except UnicodeEncodeError as e:
+            raise DecodeError(f"output-charset '{charset}' encoding failed: {e}") from e
@@ -0,0 +1,42 @@
+from .checksum import ChecksumEncoder
+
+
+class Fnv1Encoder(ChecksumEncoder):
+    """
+    FNV-1 hash encoding
+
+    Computes the FNV-1 (Fowler-Noll-Vo) hash of input bytes and outputs it as hex
+    digits. FNV-1 multiplies the hash by the FNV prime then xors it with each
+    byte, see fnv1a for the variant with better dispersion on short inputs.
+    Hashes are one-way and cannot be decoded.
+
+    Note: FNV is a fast non-cryptographic hash for hash tables and deduplication,
+    it must not be used for security purposes.
+
+    Examples:
+    hello world -> 548DA96F
+    hello world (64 bits) -> 7DCF62CDB1910E6F
+    """
+
+    algorithm = "fnv1-32"
+
+    params = {
+        **{k: v for k, v in ChecksumEncoder.params.items() if k not in {"algorithm"}},
+        "bits": {
+            "type": int,
+            "default": 32,
+            "choices": [32, 64],
+            "help": "Hash size in bits",
+        },
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": False},
+        "bits64": {"params": "--bits 64", "roundtrip": False},
+        "decimal": {"params": "--decimal", "roundtrip": False},
+        "lowercase": {"params": "--bits 64 --lowercase", "roundtrip": False},
+    }
+
+    @classmethod
+    def _algorithm(cls, *, bits: int = 0, **kwargs) -> str:
+        return f"fnv1-{bits}" if bits else super()._algorithm(**kwargs)
@@ -0,0 +1,41 @@
+from .checksum import ChecksumEncoder
+
+
+class Fnv1aEncoder(ChecksumEncoder):
+    """
+    FNV-1a hash encoding
+
+    Computes the FNV-1a (Fowler-Noll-Vo) hash of input bytes and outputs it as hex
+    digits. FNV-1a xors each byte into the hash then multiplies it by the FNV prime.
+    Hashes are one-way and cannot be decoded.
+
+    Note: FNV is a fast non-cryptographic hash for hash tables and deduplication,
+    it must not be used for security purposes.
+
+    Examples:
+    hello world -> D58B3FA7
+    hello world (64 bits) -> 779A65E7023CD2E7
+    """
+
+    algorithm = "fnv1a-32"
+
+    params = {
+        **{k: v for k, v in ChecksumEncoder.params.items() if k not in {"algorithm"}},
+        "bits": {
+            "type": int,
+            "default": 32,
+            "choices": [32, 64],
+            "help": "Hash size in bits",
+        },
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": False},
+        "bits64": {"params": "--bits 64", "roundtrip": False},
+        "decimal": {"params": "--decimal", "roundtrip": False},
+        "lowercase": {"params": "--bits 64 --lowercase", "roundtrip": False},
+    }
+
+    @classmethod
+    def _algorithm(cls, *, bits: int = 0, **kwargs) -> str:
+        return f"fnv1a-{bits}" if bits else super()._algorithm(**kwargs)
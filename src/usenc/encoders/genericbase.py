@@ -0,0 +1,176 @@
+from functools import lru_cache
+from typing import Dict, Tuple
+
+from .encoder import DecodeError, EncodeError, Encoder
+
+# Number of digits extracted with a plain divmod loop at the leaves of the recursion
+LEAF_DIGITS = 16
+
+# Up to this number of digits, one divmod (or multiplication) per digit is faster
+DIRECT_DIGITS = 256
+
+INVALID = 0xFF
+
+
+@lru_cache(maxsize=1024)
+def _power(base: int, exponent: int) -> int:
+    """Cached powers of the base, the same exponents are reused by every conversion"""
+    return int(base**exponent)
+
+
+@lru_cache(maxsize=64)
+def _tables(alphabet: bytes) -> Tuple[bytes, bytes]:
+    """Translation tables from digit values to alphabet bytes and back (INVALID if not a digit)"""
+    encode_table = bytes(alphabet) + bytes(256 - len(alphabet))
+    decode_table = bytearray([INVALID]) * 256
+    for i, char in enumerate(alphabet):
+        decode_table[char] = i
+    return encode_table, bytes(decode_table)
+
+
+def _to_padded_digits(n: int, base: int, level: int) -> bytearray:
+    """Digit values of n (most significant first), padded to exactly LEAF_DIGITS << level"""
+    if level == 0:
+        digits = bytearray(LEAF_DIGITS)
+        for i in range(LEAF_DIGITS - 1, -1, -1):
+            n, digits[i] = divmod(n, base)
+        return digits
+
+    high, low = divmod(n, _power(base, LEAF_DIGITS << (level - 1)))
+    return _to_padded_digits(high, base, level - 1) + _to_padded_digits(low, base, level - 1)
+
+
+def _to_digits(n: int, base: int) -> bytearray:
+    """Digit values of n (most significant first), without leading zeros"""
+    if n < _power(base, DIRECT_DIGITS):
+        digits = bytearray()
+        while n:
+            n, digit = divmod(n, base)
+            digits.append(digit)
+        digits.reverse()
+        return digits
+
+    # Split by the largest cached power below n, the low part is padded to its full size
+    level = 0
+    while _power(base, LEAF_DIGITS << (level + 1)) <= n:
+        level += 1
+    high, low = divmod(n, _power(base, LEAF_DIGITS << level))
+    return _to_digits(high, base) + _to_padded_digits(low, base, level)
+
+
+def _from_digits(digits: bytes, base: int) -> int:
+    """Integer value of the digit values (most significant first)"""
+    if len(digits) <= DIRECT_DIGITS:
+        n = 0
+        for digit in digits:
+            n = n * base + digit
+        return n
+
+    # Split so that the low part has LEAF_DIGITS << k digits, to reuse cached powers
+    low_len = LEAF_DIGITS
+    while low_len * 2 < len(digits):
+        low_len *= 2
+    high = _from_digits(digits[:-low_len], base)
+    return high * _power(base, low_len) + _from_digits(digits[-low_len:], base)
+
+
+class GenericBaseEncoder(Encoder):
+    """
+    Base encoder for arbitrary base encodings (base36, base58, base62, etc.)
+
+    The input is read as a single big-endian number and written in the target base.
+    Each leading zero byte is encoded as one leading zero digit (the first character
+    of the alphabet), so that leading zeros survive the roundtrip.
+
+    The conversion splits the number by powers of the base (divide and conquer)
+    instead of extracting one digit at a time, which would be quadratic in the
+    input length. Powers of the base are cached and shared across calls.
+    """
+
+    params = {
+        "alphabet": {
+            "type": str,
+            "default": None,
+            "help": "Custom alphabet to use for encoding (must have the same length as the base)",
+        },
+    }
+
+    tests = {"base": {"params": "", "roundtrip": True}}
+
+    # Subclasses must define these
+    alphabet: bytes = b"0123456789"
+    base: int = 10
+
+    # Dictionary of alternative alphabets (can be overridden by subclasses)
+    alphabets: Dict[str, bytes] = {}
+
+    @classmethod
+    def _get_alphabet(cls, alphabet_param: str = "") -> bytes:
+        """Get the alphabet to use, either from parameter, named alphabet, or default"""
+        if not alphabet_param:
+            return cls.alphabet
+
+        if alphabet_param in cls.alphabets:
+            return cls.alphabets[alphabet_param]
+
+        try:
+            alphabet = alphabet_param.encode("ascii")
+        except UnicodeEncodeError as e:
+            raise EncodeError(f"Alphabet must be ASCII: {e}") from e
+
+        if len(alphabet) != cls.base:
+            raise EncodeError(
+                f"{cls.__name__}: alphabet length ({len(alphabet)}) must equal the base ({cls.base})"
+            )
+        if len(set(alphabet)) != len(alphabet):
+            raise EncodeError(f"{cls.__name__}: alphabet characters must be unique")
+        return alphabet
+
+    @classmethod
+    def encode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        """
+        Encode bytes as a number in the encoder base
+
+        Args:
+            text: Input bytes to encode
+            alphabet: Custom alphabet string or name of predefined alphabet
+
+        Returns:
+            Encoded bytes
+        """
+        alphabet_bytes = cls._get_alphabet(alphabet)
+        encode_table, _ = _tables(alphabet_bytes)
+
+        body = text.lstrip(b"\x00")
+        zeros = len(text) - len(body)
+
+        digits = bytes(_to_digits(int.from_bytes(body, "big"), cls.base))
+
+        return alphabet_bytes[:1] * zeros + digits.translate(encode_table)
+
+    @classmethod
+    def decode(cls, text: bytes, alphabet: str = "", **kwargs) -> bytes:
+        """
+        Decode a number written in the encoder base back to bytes
+
+        Args:
+            text: Encoded bytes to decode
+            alphabet: Custom alphabet string or name of predefined alphabet
+
+        Returns:
+            Decoded bytes
+        """
+        alphabet_bytes = cls._get_alphabet(alphabet)
+        _, decode_table = _tables(alphabet_bytes)
+
+        digits = text.translate(decode_table)
+        invalid = digits.find(INVALID)
+        if invalid != -1:
+            byte = text[invalid]
+            raise DecodeError(f"Invalid character '{chr(byte)}' (0x{byte:02x}) for {cls.__name__}")
+
+        body = digits.lstrip(b"\x00")
+        zeros = len(digits) - len(body)
+
+        n = _from_digits(body, cls.base)
+        return b"\x00" * zeros + n.to_bytes((n.bit_length() + 7) // 8, "big")
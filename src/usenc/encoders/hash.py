@@ -1,4 +1,5 @@
 import hashlib
+from typing import Iterable, Iterator
 
 from .encoder import DecodeError, EncodeError, Encoder
 
@@ -38,19 +39,11 @@ class HashEncoder(Encoder):
     # Subclasses can define this to avoid requiring algorithm parameter
     algorithm: str = ""
 
-    @classmethod
-    def encode(cls, text: bytes, algorithm: str = "", lowercase: bool = False, **kwargs) -> bytes:
-        """
-        Compute hash of input bytes and return hex digest as bytes
-
-        Args:
-            text: Input bytes to hash
-            algorithm: Hash algorithm name (required if not defined in class)
-            lowercase: If True, output lowercase hex; otherwise uppercase
+    reversible = False
 
-        Returns:
-            Hex digest as bytes
-        """
+    @classmethod
+    def _new_hasher(cls, algorithm: str = ""):
+        """Create a hashlib object for the requested algorithm"""
         # Use parameter if provided, otherwise fall back to class attribute
         algorithm = algorithm if algorithm else cls.algorithm
 
@@ -58,18 +51,46 @@ class HashEncoder(Encoder):
             raise EncodeError("algorithm parameter is required")
 
         try:
-            hasher = hashlib.new(algorithm)
+            return hashlib.new(algorithm)
         except ValueError as e:
             raise EncodeError(f"Unknown hash algorithm '{algorithm}': {e}") from e
 
-        hasher.update(text)
-        digest = hasher.hexdigest()
+    @staticmethod
+    def _format_digest(hasher, lowercase: bool = False) -> bytes:
+        digest: str = hasher.hexdigest()
 
         if not lowercase:
             digest = digest.upper()
 
         return digest.encode("ascii")
 
+    @classmethod
+    def encode(cls, text: bytes, algorithm: str = "", lowercase: bool = False, **kwargs) -> bytes:
+        """
+        Compute hash of input bytes and return hex digest as bytes
+
+        Args:
+            text: Input bytes to hash
+            algorithm: Hash algorithm name (required if not defined in class)
+            lowercase: If True, output lowercase hex; otherwise uppercase
+
+        Returns:
+            Hex digest as bytes
+        """
+        hasher = cls._new_hasher(algorithm)
+        hasher.update(text)
+        return cls._format_digest(hasher, lowercase)
+
+    @classmethod
+    def encode_stream(
+        cls, chunks: Iterable[bytes], algorithm: str = "", lowercase: bool = False, **kwargs
+    ) -> Iterator[bytes]:
+        """Compute the hash incrementally over the chunks"""
+        hasher = cls._new_hasher(algorithm)
+        for chunk in chunks:
+            hasher.update(chunk)
+        yield cls._format_digest(hasher, lowercase)
+
     @classmethod
     def decode(cls, text: bytes, **kwargs) -> bytes:
         """
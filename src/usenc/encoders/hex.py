@@ -1,4 +1,31 @@
-from .escape import EscapeEncoder
+import binascii
+import re
+from functools import lru_cache
+from typing import List, Optional, Pattern
+
+from .. import accel
+from .encoder import DecodeError, EncodeError
+from .escape import EscapeEncoder, byte_transparent, lookup_codec
+
+
+@lru_cache(maxsize=32)
+def _hex_table(prefix: str, suffix: str, lowercase: bool) -> List[str]:
+    """Escaped form of each byte value"""
+    hex_format = "{:02x}" if lowercase else "{:02X}"
+    return [prefix + hex_format.format(b) + suffix for b in range(256)]
+
+
+@lru_cache(maxsize=32)
+def _hex_byte_table(prefix: str, suffix: str, lowercase: bool, charset: str) -> List[bytes]:
+    """Escaped form of each byte value, encoded in the output charset"""
+    codec = lookup_codec(charset)
+    return [codec.encode(escaped)[0] for escaped in _hex_table(prefix, suffix, lowercase)]
+
+
+@lru_cache(maxsize=32)
+def _hex_decode_regex(prefix: bytes, suffix: bytes) -> Pattern[bytes]:
+    """Bytes regex matching runs of escaped bytes"""
+    return re.compile(b"(?:" + re.escape(prefix) + b"[a-fA-F0-9]{2}" + re.escape(suffix) + b")+")
 
 
 class HexEncoder(EscapeEncoder):
@@ -17,6 +44,124 @@ class HexEncoder(EscapeEncoder):
     character_class: str = "\\s\\S"
     decode_class: str = "[a-fA-F0-9]{2}"
 
+    @classmethod
+    def encode(
+        cls,
+        text: bytes,
+        prefix: str = "",
+        suffix: str = "",
+        include: str = "",
+        exclude: str = "",
+        regex: str = "",
+        lowercase: bool = False,
+        input_charset: str = "utf8",
+        output_charset: str = "utf8",
+        **kwargs,
+    ) -> bytes:
+        # When every character is encoded, encode the bytes of large inputs directly
+        # with the NumPy backend if the charsets leave them unchanged
+        if (
+            cls.character_class == HexEncoder.character_class
+            and not (include or exclude or regex)
+            and accel.use_numpy(len(text))
+            and byte_transparent(input_charset, output_charset)
+        ):
+            try:
+                text.decode(input_charset)
+                prefix_bytes = (prefix or cls.prefix).encode(output_charset)
+                suffix_bytes = (suffix or cls.suffix).encode(output_charset)
+            except UnicodeDecodeError as e:
+                raise EncodeError(f"input-charset '{input_charset}' decoding failed: {e}") from e
+            except UnicodeEncodeError as e:
+                raise EncodeError(f"output-charset '{output_charset}' encoding failed: {e}") from e
+
+            digits = b"0123456789abcdef" if lowercase else b"0123456789ABCDEF"
+            return accel.hex_encode(text, digits, prefix_bytes, suffix_bytes)
+
+        return super().encode(
+            text,
+            prefix=prefix,
+            suffix=suffix,
+            include=include,
+            exclude=exclude,
+            regex=regex,
+            lowercase=lowercase,
+            input_charset=input_charset,
+            output_charset=output_charset,
+            **kwargs,
+        )
+
+    @classmethod
+    def decode(
+        cls,
+        text: bytes,
+        prefix: str = "",
+        suffix: str = "",
+        include: str = "",
+        exclude: str = "",
+        regex: str = "",
+        lowercase: bool = False,
+        input_charset: str = "utf8",
+        output_charset: str = "utf8",
+        **kwargs,
+    ) -> bytes:
+        # Same charset on both sides: unescape the bytes directly, then check the result
+        if byte_transparent(input_charset, output_charset):
+            codec = lookup_codec(input_charset)
+            try:
+                prefix_bytes = codec.encode(prefix or cls.prefix)[0]
+                suffix_bytes = codec.encode(suffix or cls.suffix)[0]
+            except UnicodeEncodeError:
+                pass
+            else:
+                return cls._decode_bytes(text, prefix_bytes, suffix_bytes, input_charset)
+
+        return super().decode(
+            text,
+            prefix=prefix,
+            suffix=suffix,
+            include=include,
+            exclude=exclude,
+            regex=regex,
+            lowercase=lowercase,
+            input_charset=input_charset,
+            output_charset=output_charset,
+            **kwargs,
+        )
+
+    @staticmethod
+    def _decode_bytes(text: bytes, prefix: bytes, suffix: bytes, charset: str) -> bytes:
+        """Replace each run of escaped bytes by the bytes"""
+        step = len(prefix) + 2 + len(suffix)
+        start = len(prefix)
+
+        def replace(match):
+            run = match.group()
+            if step == 2:
+                return binascii.unhexlify(run)
+            return binascii.unhexlify(
+                b"".join([run[i : i + 2] for i in range(start, len(run), step)])
+            )
+
+        result = _hex_decode_regex(prefix, suffix).sub(replace, text)
+        codec = lookup_codec(charset)
+        if codec.name != "iso8859-1":
+            try:
+                codec.decode(text)
+                codec.decode(result)
+            except UnicodeDecodeError as e:
+                raise DecodeError(f"input-charset '{charset}' decoding failed: {e}") from e
+        return result
+
+    @classmethod
+    def byte_table(
+        cls, prefix: str, suffix: str, lowercase: bool, output_charset: str, **kwargs
+    ) -> Optional[List[bytes]]:
+        try:
+            return _hex_byte_table(prefix, suffix, lowercase, output_charset)
+        except UnicodeEncodeError:
+            return None
+
     @classmethod
     def encode_char(
         cls,
@@ -28,8 +173,8 @@ class HexEncoder(EscapeEncoder):
         output_charset: str = "utf8",
         **kwargs,
     ) -> str:
-        hex_format = "{:02x}" if lowercase else "{:02X}"
-        return "".join([prefix + hex_format.format(b) + suffix for b in c.encode(output_charset)])
+        table = _hex_table(prefix, suffix, lowercase)
+        return "".join(map(table.__getitem__, lookup_codec(output_charset).encode(c)[0]))
 
     @classmethod
     def decode_char(
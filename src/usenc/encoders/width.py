@@ -0,0 +1,248 @@
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, Optional, Pattern, Tuple, Type
+
+from ..utils import escape_for_char_class, transform_keywords
+from .encoder import DecodeError, EncodeError, Encoder
+from .escape import BYTE_TRANSPARENT_CHARSETS, byte_transparent, lookup_codec
+
+# Ideographic space and the Halfwidth and Fullwidth Forms block, where every
+# compatibility width form is
+FORMS_CODES = (0x3000, *range(0xFF00, 0xFFF0))
+
+# Halfwidth sound marks (voiced and semi-voiced)
+SOUND_MARKS = "\uff9e\uff9f"
+
+
+def _forms(tag: str) -> Dict[str, str]:
+    """Compatibility forms with the `<wide>` or `<narrow>` tag, and the character they stand for"""
+    forms = {}
+    for code in FORMS_CODES:
+        fields = unicodedata.decomposition(chr(code)).split()
+        if fields[:1] == [tag]:
+            forms[chr(code)] = chr(int(fields[1], 16))
+    return forms
+
+
+# ！ -> !, ｶ -> カ
+WIDE = _forms("<wide>")
+NARROW = _forms("<narrow>")
+
+# Halfwidth sound marks stand for the combining marks, fullwidth text uses the spacing ones
+NARROW["\uff9e"] = "\u309b"
+NARROW["\uff9f"] = "\u309c"
+COMBINING_MARKS = {"\u3099": "\uff9e", "\u309a": "\uff9f"}
+
+
+def _voiced() -> Dict[str, str]:
+    """Voiced katakana and their two halfwidth characters: ガ -> ｶﾞ"""
+    narrowed = {full: narrow for narrow, full in NARROW.items()}
+    voiced = {}
+    for code in range(0x30A0, 0x3100):
+        decomposed = unicodedata.normalize("NFD", chr(code))
+        if len(decomposed) == 2 and decomposed[0] in narrowed:
+            voiced[chr(code)] = narrowed[decomposed[0]] + COMBINING_MARKS[decomposed[1]]
+    return voiced
+
+
+VOICED = _voiced()
+
+# Conversions to each width, before include and exclude
+CONVERSIONS: Dict[str, Dict[str, str]] = {
+    "full": {
+        **{char: wide for wide, char in WIDE.items()},
+        **NARROW,
+    },
+    "half": {
+        **WIDE,
+        **{full: narrow for narrow, full in NARROW.items()},
+        **COMBINING_MARKS,
+        **VOICED,
+    },
+}
+
+# Pairs composed before the table pass when converting to full width: ｶﾞ -> ガ
+COMPOSITIONS: Dict[str, Dict[str, str]] = {
+    "full": {pair: char for char, pair in VOICED.items()},
+    "half": {},
+}
+
+OTHER_WIDTH = {"full": "half", "half": "full"}
+
+
+@lru_cache(maxsize=64)
+def width_tables(
+    width: str, include: str = "", exclude: str = ""
+) -> Tuple[Dict[int, str], Dict[str, str], Optional[Pattern[str]]]:
+    """
+    `str.translate` table converting characters to a width, the pairs to compose
+    before it and the regex matching them, with include and exclude resolved
+
+    Raises re.error on invalid include or exclude character classes.
+    """
+    safe_include = transform_keywords(escape_for_char_class(include)) or "\\s\\S"
+    safe_exclude = transform_keywords(escape_for_char_class(exclude))
+    regex = rf"[{safe_include}]"
+    if safe_exclude != "":
+        regex = rf"(?![{safe_exclude}]){regex}"
+    selected = re.compile(regex).fullmatch
+
+    table = {
+        ord(char): converted for char, converted in CONVERSIONS[width].items() if selected(char)
+    }
+    pairs = {pair: char for pair, char in COMPOSITIONS[width].items() if all(map(selected, pair))}
+    pattern = re.compile("|".join(map(re.escape, sorted(pairs)))) if pairs else None
+    return table, pairs, pattern
+
+
+class WidthEncoder(Encoder):
+    """
+    Generic Unicode width encoder.
+
+    Converts characters to the width of `cls.width` ("full" or "half") with
+    precomputed `str.translate` tables, and back to the other width when decoding.
+    Characters to be converted are fine tuned by the `include` and `exclude`
+    parameters, which are resolved into the tables once per value.
+    """
+
+    params = {
+        "include": {
+            "type": str,
+            "default": "",
+            "help": "Only convert these characters (can contain 'all', 'utf8' or 'ascii')",
+        },
+        "exclude": {"type": str, "default": "", "help": "Characters that should not be converted"},
+    }
+
+    tests = {
+        "base": {"params": "", "roundtrip": False},
+        "include": {"params": "--include abcdef", "roundtrip": False},
+        "exclude": {"params": "--exclude aeiou", "roundtrip": False},
+    }
+
+    # Characters are decoded with input_charset and converted one by one
+    byte_oriented = False
+    charset_sensitive = True
+    width: str = "full"
+
+    @classmethod
+    def _convert(
+        cls,
+        text: bytes,
+        width: str,
+        include: str,
+        exclude: str,
+        input_charset: str,
+        output_charset: str,
+        error: Type[Exception],
+    ) -> bytes:
+        # ASCII fast path: ASCII characters are already half width
+        if width == "half" and text.isascii() and byte_transparent(input_charset, output_charset):
+            return text
+
+        try:
+            table, pairs, pattern = width_tables(width, include, exclude)
+        except re.error as e:
+            raise error(f"include or exclude error: {e}") from e
+
+        try:
+            decoded = lookup_codec(input_charset).decode(text)[0]
+        except UnicodeDecodeError as e:
+            raise error(f"input-charset '{input_charset}' decoding failed: {e}") from e
+
+        # Composition pass, only for inputs with halfwidth sound marks
+        if pattern is not None and any(mark in decoded for mark in SOUND_MARKS):
+            decoded = pattern.sub(lambda match: pairs[match.group()], decoded)
+
+        try:
+            return lookup_codec(output_charset).encode(decoded.translate(table))[0]
+        except UnicodeEncodeError as e:
+            raise error(f"output-charset '{output_charset}' encoding failed: {e}") from e
+
+    @classmethod
+    def encode(
+        cls,
+        text: bytes,
+        include: str = "",
+        exclude: str = "",
+        input_charset: str = "utf8",
+        output_charset: str = "utf8",
+        **kwargs,
+    ) -> bytes:
+        return cls._convert(
+            text, cls.width, include, exclude, input_charset, output_charset, EncodeError
+        )
+
+    @classmethod
+    def decode(
+        cls,
+        text: bytes,
+        include: str = "",
+        exclude: str = "",
+        input_charset: str = "utf8",
+        output_charset: str = "utf8",
+        **kwargs,
+    ) -> bytes:
+        return cls._convert(
+            text,
+            OTHER_WIDTH[cls.width],
+            include,
+            exclude,
+            input_charset,
+            output_charset,
+            DecodeError,
+        )
+
+    @classmethod
+    def split_alignment(
+        cls, is_decoding: bool = False, input_charset: str = "utf8", **kwargs
+    ) -> int:
+        """
+        Characters are converted one by one, inputs can be cut between any two
+        characters (except when converting to full width, where pairs are composed)
+        """
+        width = OTHER_WIDTH[cls.width] if is_decoding else cls.width
+        if COMPOSITIONS[width]:
+            return 0
+        try:
+            return 1 if lookup_codec(input_charset).name in BYTE_TRANSPARENT_CHARSETS else 0
+        except LookupError:
+            return 0
+
+
+class FullwidthEncoder(WidthEncoder):
+    """
+    Unicode full width forms
+
+    Converts ASCII characters to their fullwidth forms (U+FF01 to U+FF5E, and the
+    ideographic space U+3000 for space), and halfwidth katakana, hangul and symbols
+    to their normal forms, composing voiced katakana (ｶﾞ -> ガ). Decoding converts
+    to half width, like the halfwidth encoder.
+
+    Examples:
+    hello world -> ｈｅｌｌｏ　ｗｏｒｌｄ
+    ¥1000 -> ￥１０００
+    ﾊﾟｿｺﾝ -> パソコン
+    """
+
+    tests = {**WidthEncoder.tests, "base": {"params": "", "roundtrip": True}}
+
+    width = "full"
+
+
+class HalfwidthEncoder(WidthEncoder):
+    """
+    Unicode half width forms
+
+    Converts fullwidth ASCII characters (U+FF01 to U+FF5E, and the ideographic
+    space U+3000) to ASCII, and katakana, hangul and symbols to their halfwidth
+    forms, splitting voiced katakana in two characters (ガ -> ｶﾞ). Decoding
+    converts to full width, like the fullwidth encoder.
+
+    Examples:
+    ｈｅｌｌｏ　ｗｏｒｌｄ -> hello world
+    パソコン -> ﾊﾟｿｺﾝ
+    """
+
+    width = "half"
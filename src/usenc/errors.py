@@ -0,0 +1,113 @@
+"""
+Handling of the records an encoder fails on
+"""
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+from .encoders.encoder import DecodeError, EncodeError
+
+POLICIES = ("fail", "skip", "passthrough", "replace")
+
+# Errors raised by encoders on invalid inputs (ValueError also covers charset errors)
+CODEC_ERRORS = (EncodeError, DecodeError, ValueError)
+
+
+class ErrorPolicy:
+    """
+    What to do with the records a codec fails on, and how many there were
+
+    - `fail`: the error is raised and the run stops
+    - `skip`: the record is dropped from the output
+    - `passthrough`: the record is written unchanged
+    - `replace`: the record is written as `replacement`
+
+    With `fail`, codecs are returned as is. Otherwise a wrapped codec returns None
+    for a skipped record. A wrapped batch codec is called on the whole batch and
+    only retries record by record when the batch fails, so valid batches never
+    go through an exception handler per record.
+    """
+
+    def __init__(self, policy: str = "fail", replacement: bytes = b""):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown error policy: {policy}")
+        self.policy = policy
+        self.replacement = replacement
+        self.errors = 0
+        self.first_error = ""
+        # Wrapped codecs may run on several threads (--threads)
+        self.lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+
+    def failed(self, text: bytes, error: Exception) -> Optional[bytes]:
+        """Count a failed record and return what to write instead (None to skip it)"""
+        with self.lock:
+            self.errors += 1
+            if not self.first_error:
+                self.first_error = str(error)
+
+        if self.policy == "passthrough":
+            return text
+        if self.policy == "replace":
+            return self.replacement
+        return None
+
+    def wrap(self, codec: Callable[[bytes], bytes]) -> Callable[[bytes], Optional[bytes]]:
+        """Return `codec` applying the policy to the records it fails on"""
+        if self.policy == "fail":
+            return codec
+
+        def guarded(text: bytes) -> Optional[bytes]:
+            try:
+                return codec(text)
+            except CODEC_ERRORS as e:
+                return self.failed(text, e)
+
+        return guarded
+
+    def wrap_batch(
+        self, batch_codec: Callable[[List[bytes]], List[bytes]]
+    ) -> Callable[[List[bytes]], List[bytes]]:
+        """Return `batch_codec` applying the policy, skipped records are left out of its output"""
+        if self.policy == "fail":
+            return batch_codec
+
+        single = self.wrap(lambda text: batch_codec([text])[0])
+
+        def guarded(batch: List[bytes]) -> List[bytes]:
+            try:
+                return batch_codec(batch)
+            except CODEC_ERRORS:
+                results = map(single, batch)
+                return [result for result in results if result is not None]
+
+        return guarded
+
+    def merge(self, other: "ErrorPolicy"):
+        """Add the failed records of another run (e.g. of another file)"""
+        self.errors += other.errors
+        self.first_error = self.first_error or other.first_error
+
+    def summary(self) -> str:
+        """One line description of the failed records"""
+        action = {"skip": "skipped", "passthrough": "passed through", "replace": "replaced"}
+        s = "" if self.errors == 1 else "s"
+        text = f"{self.errors} failed record{s} ({action.get(self.policy, self.policy)})"
+        if self.first_error:
+            text += f", first error: {self.first_error}"
+        return text
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "policy": self.policy,
+            "errors": self.errors,
+            "first_error": self.first_error,
+        }
@@ -0,0 +1,141 @@
+"""
+Multi-file processing
+
+Input files are selected with a glob pattern, each one is encoded into a file of
+the same relative path under an output directory. Files are scheduled across a
+pool of worker processes, each file is processed by one worker with the same
+pipeline as a single input (see `cli.process_encoding`).
+"""
+
+import glob
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .compression import EXTENSIONS, strip_extension
+from .errors import ErrorPolicy
+from .stats import Stats
+
+GLOB_CHARS = frozenset("*?[")
+
+
+class FileResult(NamedTuple):
+    input: Path
+    output: Path
+    bytes_in: int
+    bytes_out: int
+    elapsed: float
+    stats: Optional[Stats]
+    errors: Optional[ErrorPolicy]
+
+
+def glob_base(pattern: str) -> Path:
+    """Leading directories of a glob pattern, before the first component with a wildcard"""
+    parts = Path(pattern).parts
+    base = []
+    for part in parts[:-1]:
+        if GLOB_CHARS.intersection(part):
+            break
+        base.append(part)
+    return Path(*base) if base else Path(".")
+
+
+def expand_inputs(
+    pattern: str, output_dir: Path, compress: Optional[str] = None, decompress: bool = True
+) -> List[Tuple[Path, Path]]:
+    """
+    Input files matching `pattern` (`**` matches any number of directories), with
+    their output path: the same path relative to the pattern base, under `output_dir`
+
+    If inputs are decompressed (`decompress`), the compression extension of their
+    name is dropped. The one of `compress` is added if the output is compressed.
+    """
+    base = glob_base(pattern)
+    pairs = []
+    for name in sorted(glob.glob(pattern, recursive=True)):
+        path = Path(name)
+        if not path.is_file():
+            continue
+        output = output_dir / path.relative_to(base)
+        if decompress:
+            output = strip_extension(output)
+        if compress is not None:
+            output = output.with_name(output.name + EXTENSIONS[compress])
+        if output.resolve() == path.resolve():
+            raise ValueError(f"output file would overwrite its input: {path}")
+        pairs.append((path, output))
+    return pairs
+
+
+def _process_file(task: Tuple[Path, Path, bool, bool, Dict[str, Any]]) -> FileResult:
+    """Worker: encode (or decode) one file"""
+    # cli imports this module, import its pipeline only when a file is processed
+    from .cli import process_encoding
+
+    input_file, output_file, is_decoding, with_stats, kwargs = task
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+
+    stats = Stats(kwargs["encoder_name"], is_decoding) if with_stats else None
+    errors = kwargs.pop("errors", None)
+    if errors is not None:
+        errors = ErrorPolicy(errors.policy, errors.replacement)
+
+    start = time.perf_counter()
+    process_encoding(input_file, output_file, is_decoding, stats=stats, errors=errors, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    return FileResult(
+        input_file,
+        output_file,
+        input_file.stat().st_size,
+        output_file.stat().st_size,
+        elapsed,
+        stats,
+        errors,
+    )
+
+
+def process_files(
+    files: List[Tuple[Path, Path]],
+    is_decoding: bool,
+    jobs: int = 1,
+    with_stats: bool = False,
+    **process_args,
+) -> Iterator[Tuple[Path, Optional[FileResult], Optional[BaseException]]]:
+    """
+    Encode (or decode) each (input, output) pair of files with a pool of `jobs` processes
+
+    `process_args` are given to `cli.process_encoding` (encoder name, parameters,
+    bulk mode, error policy, ...). Results are yielded as files complete, a file
+    that fails yields its exception instead of stopping the other files.
+    """
+    tasks = [(i, o, is_decoding, with_stats, dict(process_args)) for i, o in files]
+
+    if jobs <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            try:
+                yield task[0], _process_file(task), None
+            except Exception as e:
+                yield task[0], None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        futures: Dict[Future, Path] = {
+            executor.submit(_process_file, task): task[0] for task in tasks
+        }
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                yield futures[future], None, error
+            else:
+                yield futures[future], future.result(), None
+
+
+def format_progress(done: int, total: int, result: FileResult) -> str:
+    """Progress line of a completed file"""
+    rate = result.bytes_in / result.elapsed / 1e6 if result.elapsed > 0 else 0.0
+    return (
+        f"[{done}/{total}] {result.input} -> {result.output}: "
+        f"{result.bytes_in / 1e6:.1f} MB in {result.elapsed:.2f}s ({rate:.1f} MB/s)"
+    )
@@ -0,0 +1,180 @@
+"""
+Structured record formats (TSV, CSV, JSON Lines)
+
+Records are parsed in a streaming fashion and only the selected fields are
+passed through the codec. The other fields keep their values, but csv and jsonl
+records are serialized again: csv quoting and JSON spacing and escapes may differ
+from the input, tsv lines are only changed in the selected fields.
+"""
+
+import csv
+import json
+from typing import Any, BinaryIO, Callable, Iterable, List, Optional
+
+FORMATS = ["lines", "tsv", "csv", "jsonl"]
+
+
+def parse_fields(spec: str) -> List[int]:
+    """
+    Parse a field selection like `cut -f` (1-based, comma separated, with ranges)
+
+    Examples:
+        "3,5" -> [2, 4]
+        "1-3,7" -> [0, 1, 2, 6]
+    """
+    fields: List[int] = []
+    for part in spec.split(","):
+        start, sep, end = part.partition("-")
+        try:
+            if sep:
+                fields.extend(range(int(start) - 1, int(end)))
+            else:
+                fields.append(int(start) - 1)
+        except ValueError as e:
+            raise ValueError(f"invalid field selection '{spec}'") from e
+
+    if any(field < 0 for field in fields):
+        raise ValueError(f"invalid field selection '{spec}' (fields start at 1)")
+    return sorted(set(fields))
+
+
+def parse_keys(spec: str) -> List[List[str]]:
+    """
+    Parse a comma separated list of dotted key paths
+
+    Examples:
+        "user.email,path" -> [["user", "email"], ["path"]]
+    """
+    return [key.split(".") for key in spec.split(",") if key]
+
+
+class _Latin1Writer:
+    """Text adapter over a binary stream, latin-1 maps each char back to its original byte"""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+
+    def write(self, s: str):
+        self.stream.write(s.encode("latin-1"))
+
+
+def process_tsv(
+    infile: Iterable[bytes],
+    outfile: BinaryIO,
+    codec: Callable[[bytes], Optional[bytes]],
+    fields: List[int],
+) -> int:
+    records = 0
+    for line in infile:
+        records += 1
+        columns = line.rstrip(b"\r\n").split(b"\t")
+        for field in fields:
+            if field < len(columns):
+                value = codec(columns[field])
+                if value is None:
+                    break
+                columns[field] = value
+        else:
+            outfile.write(b"\t".join(columns) + b"\n")
+    return records
+
+
+def process_csv(
+    infile: Iterable[bytes],
+    outfile: BinaryIO,
+    codec: Callable[[bytes], Optional[bytes]],
+    fields: List[int],
+) -> int:
+    # latin-1 decodes any byte to the char of the same value, so the csv module can parse
+    # the structure (which is ASCII) while field contents are kept byte for byte
+    reader = csv.reader(line.decode("latin-1") for line in infile)
+    writer = csv.writer(_Latin1Writer(outfile), lineterminator="\n")
+    records = 0
+    for row in reader:
+        records += 1
+        for field in fields:
+            if field < len(row):
+                value = codec(row[field].encode("latin-1"))
+                if value is None:
+                    break
+                row[field] = value.decode("latin-1")
+        else:
+            writer.writerow(row)
+    return records
+
+
+def _encodable(value: Any) -> bool:
+    return isinstance(value, (str, int, float)) and not isinstance(value, bool)
+
+
+def process_jsonl(
+    infile: Iterable[bytes],
+    outfile: BinaryIO,
+    codec: Callable[[bytes], Optional[bytes]],
+    keys: List[List[str]],
+) -> int:
+    records = 0
+    for n, line in enumerate(infile, 1):
+        if not line.strip():
+            outfile.write(b"\n")
+            continue
+
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"record {n}: invalid JSON ({e})") from e
+        records += 1
+
+        for path in keys:
+            parent = record
+            for key in path[:-1]:
+                parent = parent.get(key) if isinstance(parent, dict) else None
+            if isinstance(parent, dict) and _encodable(parent.get(path[-1])):
+                # Bytes that are not UTF-8 (the output of a decoder, ...) are carried as
+                # the lone surrogates of surrogateescape, in both directions
+                try:
+                    text = str(parent[path[-1]]).encode("utf8", "surrogateescape")
+                except UnicodeEncodeError as e:
+                    raise ValueError(f"record {n}: key {'.'.join(path)}: {e}") from e
+                value = codec(text)
+                if value is None:
+                    break
+                parent[path[-1]] = value.decode("utf8", "surrogateescape")
+        else:
+            # Lone surrogates are written as \uXXXX escapes, the rest of the record as UTF-8
+            output = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+            outfile.write(output.encode("utf8", "backslashreplace") + b"\n")
+    return records
+
+
+def process_records(
+    infile: Iterable[bytes],
+    outfile: BinaryIO,
+    codec: Callable[[bytes], Optional[bytes]],
+    record_format: str,
+    fields: Optional[List[int]] = None,
+    keys: Optional[List[List[str]]] = None,
+) -> int:
+    """
+    Apply `codec` to the selected fields of each record read from `infile`
+
+    Args:
+        infile: Binary input, iterated line by line
+        outfile: Binary output
+        codec: Function encoding (or decoding) a single value, a record is dropped
+            when it returns None for one of its fields (see `ErrorPolicy`)
+        record_format: One of `tsv`, `csv` or `jsonl`
+        fields: 0-based column indexes (for `tsv` and `csv`)
+        keys: Key paths (for `jsonl`)
+
+    Returns:
+        Number of records read (blank `jsonl` lines are not records)
+    """
+    if record_format == "tsv":
+        return process_tsv(infile, outfile, codec, fields or [])
+    elif record_format == "csv":
+        return process_csv(infile, outfile, codec, fields or [])
+    elif record_format == "jsonl":
+        return process_jsonl(infile, outfile, codec, keys or [])
+    else:
+        raise ValueError(f"Unknown record format: {record_format}")
@@ -0,0 +1,166 @@
+"""
+Record framing for binary payloads
+
+Line mode cuts records on newlines and strips their trailing whitespace, which
+binary records can not go through. A framing cuts the input into records that
+are passed to the codec byte for byte, and writes the outputs back in the same
+framing:
+
+    null:   records terminated by a NUL byte (`-z`, like `sort -z` or `xargs -0`)
+    fixed:  records of a fixed size, outputs are written back to back
+    u16/u32: records preceded by their length (unsigned big-endian integer)
+
+The input is read in large buffers which are cut with `bytes.split`, slices or
+`struct.unpack_from`, no Python code runs per byte. Records are returned one
+buffer at a time so that they can be given to batch codecs.
+"""
+
+import struct
+from typing import BinaryIO, Iterator, List, Optional
+
+# Amount of input read at once
+BUFFER_SIZE = 1 << 18
+
+LENGTH_PREFIXES = {"u16": struct.Struct(">H"), "u32": struct.Struct(">I")}
+
+
+class Framing:
+    """How records are cut from the input and written to the output"""
+
+    def read(self, stream: BinaryIO) -> Iterator[List[bytes]]:
+        """Records of `stream`, as lists of the records completed by each read"""
+        raise NotImplementedError
+
+    def join(self, records: List[bytes]) -> bytes:
+        """Output of `records`, framed"""
+        raise NotImplementedError
+
+
+class Delimited(Framing):
+    """Records terminated by `delimiter`, the last one may miss its delimiter"""
+
+    def __init__(self, delimiter: bytes = b"\0"):
+        self.delimiter = delimiter
+
+    def read(self, stream: BinaryIO) -> Iterator[List[bytes]]:
+        delimiter = self.delimiter
+        # Parts of a record spanning several reads, joined once its delimiter is found
+        pending: List[bytes] = []
+        while True:
+            chunk = stream.read(BUFFER_SIZE)
+            if not chunk:
+                break
+            records = chunk.split(delimiter)
+            if len(records) == 1:
+                pending.append(chunk)
+                continue
+            if pending:
+                pending.append(records[0])
+                records[0] = b"".join(pending)
+            last = records.pop()
+            pending = [last] if last else []
+            yield records
+        if pending:
+            yield [b"".join(pending)]
+
+    def join(self, records: List[bytes]) -> bytes:
+        return self.delimiter.join(records) + self.delimiter
+
+
+class FixedSize(Framing):
+    """Records of `size` bytes, the last one may be shorter"""
+
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError(f"record size ({size}) must be at least 1 byte")
+        self.size = size
+
+    def read(self, stream: BinaryIO) -> Iterator[List[bytes]]:
+        size = self.size
+        # Reads of whole records, the last read of a stream may be short
+        buffer_size = max(BUFFER_SIZE // size, 1) * size
+        rest = b""
+        while True:
+            chunk = stream.read(buffer_size)
+            if not chunk:
+                break
+            data = rest + chunk if rest else chunk
+            end = len(data) - len(data) % size
+            rest = data[end:]
+            if end:
+                yield [data[start : start + size] for start in range(0, end, size)]
+        if rest:
+            yield [rest]
+
+    def join(self, records: List[bytes]) -> bytes:
+        return b"".join(records)
+
+
+class LengthPrefixed(Framing):
+    """Records preceded by their length, as a `prefix` (u16 or u32) unsigned big-endian integer"""
+
+    def __init__(self, prefix: str = "u32"):
+        if prefix not in LENGTH_PREFIXES:
+            raise ValueError(f"Unknown length prefix: {prefix}")
+        self.prefix = prefix
+
+    def read(self, stream: BinaryIO) -> Iterator[List[bytes]]:
+        header = LENGTH_PREFIXES[self.prefix]
+        unpack_from = header.unpack_from
+        header_size = header.size
+        data = b""
+        start = 0
+        count = 0
+        while True:
+            chunk = stream.read(BUFFER_SIZE)
+            if not chunk:
+                break
+            data = data[start:] + chunk if start < len(data) else chunk
+            start = 0
+
+            records: List[bytes] = []
+            while len(data) - start >= header_size:
+                (length,) = unpack_from(data, start)
+                end = start + header_size + length
+                if end > len(data):
+                    # Records larger than a read are completed at once
+                    if end - len(data) > BUFFER_SIZE:
+                        data = data[start:] + stream.read(end - len(data))
+                        end -= start
+                        start = 0
+                    if end > len(data):
+                        break
+                records.append(data[start + header_size : end])
+                start = end
+            if records:
+                count += len(records)
+                yield records
+
+        if start < len(data):
+            raise ValueError(
+                f"record {count + 1}: truncated, {len(data) - start} bytes left "
+                f"after the last whole {self.prefix} length-prefixed record"
+            )
+
+    def join(self, records: List[bytes]) -> bytes:
+        pack = LENGTH_PREFIXES[self.prefix].pack
+        try:
+            return b"".join([part for record in records for part in (pack(len(record)), record)])
+        except struct.error as e:
+            longest = max(map(len, records))
+            raise ValueError(
+                f"output record of {longest} bytes does not fit a {self.prefix} length prefix"
+            ) from e
+
+
+def make_framing(
+    null_data: bool = False, record_size: int = 0, length_prefixed: Optional[str] = None
+) -> Optional[Framing]:
+    """Framing selected by the CLI options, None for line mode"""
+    if null_data:
+        return Delimited(b"\0")
+    if record_size:
+        return FixedSize(record_size)
+    if length_prefixed:
+        return LengthPrefixed(length_prefixed)
+    return None
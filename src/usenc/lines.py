@@ -0,0 +1,77 @@
+"""
+Line reading with bounded memory
+
+Lines are read up to `max_line_buffer` bytes at a time. Lines shorter than that
+are returned whole, longer lines (a minified dump without any newline, ...) are
+returned as an iterator of chunks, so that they can be given to the streaming
+interface of an encoder without ever being held in memory at once.
+
+Encoders that can neither stream nor be split (base58, bech32, punycode, ...)
+need the whole line, see `bounded_lines`.
+"""
+
+from typing import BinaryIO, Iterator, Union
+
+from .encoders.encoder import Capabilities
+
+# Lines longer than this are streamed in chunks of this size
+DEFAULT_MAX_LINE_BUFFER = 1 << 24
+
+
+def bounded_lines(capabilities: Capabilities) -> bool:
+    """Whether long lines are processed with bounded memory by an encoder with `capabilities`"""
+    return capabilities.streamable or capabilities.split_alignment > 0
+
+
+def stripped_chunks(first: bytes, stream: BinaryIO, size: int) -> Iterator[bytes]:
+    """
+    Chunks of the line starting with `first`, read `size` bytes at a time up to its
+    newline, with the trailing whitespace of the line removed like `bytes.rstrip`
+
+    Whitespace at the end of a chunk is held back until something else follows it.
+    """
+    readline = stream.readline
+    pending = b""
+    chunk = first
+    while chunk:
+        stripped = chunk.rstrip()
+        if stripped:
+            yield pending + stripped
+            pending = chunk[len(stripped) :]
+        else:
+            pending += chunk
+        if chunk.endswith(b"\n"):
+            return
+        chunk = readline(size)
+
+
+def read_lines(
+    stream: BinaryIO, max_line_buffer: int = DEFAULT_MAX_LINE_BUFFER
+) -> Iterator[Union[bytes, Iterator[bytes]]]:
+    """
+    Lines of `stream` (with their newline), or for lines of `max_line_buffer` bytes
+    or more, an iterator of their chunks without the trailing whitespace (see
+    `stripped_chunks`)
+
+    The chunks of a long line are read as they are iterated, the caller has to
+    consume them before asking for the next line. A `max_line_buffer` of 0 reads
+    whole lines whatever their length.
+    """
+    if max_line_buffer <= 0:
+        yield from stream
+        return
+
+    readline = stream.readline
+    while True:
+        line = readline(max_line_buffer)
+        if not line:
+            return
+        if len(line) < max_line_buffer or line.endswith(b"\n"):
+            yield line
+            continue
+
+        chunks = stripped_chunks(line, stream, max_line_buffer)
+        yield chunks
+        # Skip what the caller left of the line, the next line starts after its newline
+        for _ in chunks:
+            pass
@@ -0,0 +1,159 @@
+"""
+Output layer for pipes and files
+
+Encoded records are accumulated in memory and written with `os.writev` once
+`flush_size` bytes are pending, instead of one `write` per record through the
+small buffer of `sys.stdout.buffer`. Small records are joined in a single buffer
+when they are flushed, large chunks are handed to `os.writev` as they are.
+
+On Linux, pipes are also enlarged (`F_SETPIPE_SZ`) so that the process at the
+other end of a shell pipeline reads large blocks instead of waking up every 64 KiB.
+"""
+
+import io
+import os
+import stat
+import sys
+from typing import BinaryIO, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore[assignment]
+
+# Default amount of output accumulated before it is written
+DEFAULT_FLUSH_SIZE = 1 << 18
+
+# Capacity requested for output pipes (the default maximum of unprivileged processes)
+PIPE_SIZE = 1 << 20
+
+# Flushed records smaller than this on average are joined rather than written apart
+COALESCE_SIZE = 1 << 12
+
+# fcntl commands of Linux, only exposed by the fcntl module from Python 3.10
+F_SETPIPE_SZ = getattr(fcntl, "F_SETPIPE_SZ", 1031)
+F_GETPIPE_SZ = getattr(fcntl, "F_GETPIPE_SZ", 1032)
+
+PIPE_MAX_SIZE_FILE = "/proc/sys/fs/pipe-max-size"
+
+
+def _iov_max() -> int:
+    try:
+        return os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 1024
+
+
+# Maximum number of buffers of one writev call
+IOV_MAX = _iov_max()
+
+
+def enlarge_pipe(fd: int, size: int = PIPE_SIZE) -> int:
+    """
+    Grow the capacity of a pipe to `size` bytes (or to the system maximum if lower)
+
+    Returns the capacity of the pipe, or 0 if `fd` is not a pipe or the capacity
+    can not be changed on this platform. Pipes are never shrunk.
+    """
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return 0
+    try:
+        if not stat.S_ISFIFO(os.fstat(fd).st_mode):
+            return 0
+        current = fcntl.fcntl(fd, F_GETPIPE_SZ)
+        if current >= size:
+            return current
+        try:
+            return fcntl.fcntl(fd, F_SETPIPE_SZ, size)
+        except PermissionError:
+            # Above the maximum of unprivileged processes
+            with open(PIPE_MAX_SIZE_FILE) as f:
+                maximum = int(f.read())
+            if maximum <= current:
+                return current
+            return fcntl.fcntl(fd, F_SETPIPE_SZ, maximum)
+    except (OSError, ValueError):
+        return 0
+
+
+class VectoredWriter(io.RawIOBase):
+    """
+    Binary stream accumulating writes and flushing them with `os.writev`
+
+    Writes are kept in memory until `flush_size` bytes are pending (or the stream
+    is flushed or closed), then written in as few system calls as possible: small
+    records are joined in one buffer, large chunks are written without a copy.
+    The file descriptor is not closed with the stream.
+    """
+
+    def __init__(self, fd: int, flush_size: int = DEFAULT_FLUSH_SIZE):
+        super().__init__()
+        self._fd = fd
+        self.flush_size = flush_size
+        self._buffers: List[bytes] = []
+        self._pending = 0
+        self.syscalls = 0
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:  # type: ignore[override]
+        # Called once per record: keep it to an append, copies are left to the flush
+        self._buffers.append(data if type(data) is bytes else bytes(data))
+        self._pending += len(data)
+        if self._pending >= self.flush_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        buffers, pending = self._buffers, self._pending
+        if not buffers:
+            return
+        self._buffers = []
+        self._pending = 0
+
+        if pending < COALESCE_SIZE * len(buffers):
+            buffers = [b"".join(buffers)]
+        views = list(map(memoryview, buffers))
+
+        start = 0
+        while start < len(views):
+            written = os.writev(self._fd, views[start : start + IOV_MAX])
+            self.syscalls += 1
+            # Skip the buffers written entirely, and the written part of the next one
+            while start < len(views) and written >= len(views[start]):
+                written -= len(views[start])
+                start += 1
+            if written:
+                views[start] = views[start][written:]
+
+    def close(self):
+        if not self.closed:
+            try:
+                self.flush()
+            finally:
+                super().close()
+
+
+def open_output(stream: BinaryIO, flush_size: int = DEFAULT_FLUSH_SIZE) -> Optional[VectoredWriter]:
+    """
+    `VectoredWriter` over the file descriptor of `stream`, whose capacity is enlarged
+    if it is a pipe
+
+    Returns None if `stream` has no file descriptor or `os.writev` is not available,
+    the caller then writes to `stream` itself.
+    """
+    if not hasattr(os, "writev"):
+        return None
+    try:
+        fd = stream.fileno()
+    except (AttributeError, OSError):
+        return None
+
+    # What was written through the stream itself goes first
+    stream.flush()
+    enlarge_pipe(fd)
+    return VectoredWriter(fd, flush_size)
@@ -0,0 +1,150 @@
+"""
+Parallel bulk encoding
+
+A large bulk input is cut in parts at boundaries where the encoder can restart
+(see `Encoder.split_alignment`), the parts are encoded concurrently by a pool of
+processes and the outputs are written back in order.
+
+When the input is a regular file, each worker maps the file in memory and reads
+its own part, so the input is never sent through the pool.
+"""
+
+import codecs
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from .core import EncoderNotFoundError
+from .encoders import ENCODERS
+
+# Parts smaller than this are not worth the cost of a worker round trip
+MIN_PART_SIZE = 1 << 20
+
+# Number of parts per worker, so that a slow part does not hold the whole pool
+PARTS_PER_JOB = 4
+
+Source = Union[bytes, str]
+
+
+def split_alignment(encoder_name: str, is_decoding: bool = False, **encoder_params) -> int:
+    """Alignment of the safe split points of the encoder input, 0 if it can not be split"""
+    encoder = ENCODERS.get(encoder_name)
+    if not encoder:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+    return encoder.split_alignment(is_decoding, **encoder_params)
+
+
+def splits_utf8(alignment: int, input_charset: str = "utf8", **encoder_params) -> bool:
+    """Whether cuts must also avoid splitting UTF-8 characters (character aligned encoders)"""
+    return alignment == 1 and codecs.lookup(input_charset).name == "utf-8"
+
+
+def char_boundary(data: Union[bytes, mmap.mmap], cut: int, low: int = 0) -> int:
+    """Move a cut back (not below `low`) to the start of the UTF-8 character it falls in"""
+    while cut > low and cut < len(data) and data[cut] & 0xC0 == 0x80:
+        cut -= 1
+    return cut
+
+
+def aligned_chunks(chunks: Iterable[bytes], alignment: int, utf8: bool = False) -> Iterator[bytes]:
+    """
+    Re-cut a stream of chunks at multiples of `alignment` (and UTF-8 character starts
+    with `utf8`), so that each chunk can be encoded separately
+    """
+    rest = b""
+    for chunk in chunks:
+        data = rest + chunk if rest else chunk
+        cut = len(data) - len(data) % alignment
+        if utf8 and cut:
+            # The last character may continue in the next chunk, keep it for later
+            cut = char_boundary(data, cut - 1)
+        rest = data[cut:]
+        if cut:
+            yield data[:cut]
+    if rest:
+        yield rest
+
+
+def split_ranges(
+    data: Union[bytes, mmap.mmap], parts: int, alignment: int, utf8: bool = False
+) -> List[Tuple[int, int]]:
+    """
+    Cut data in at most `parts` ranges of similar size, at multiples of `alignment`
+
+    With `utf8` (only meaningful with an alignment of 1), cuts are moved back to the
+    start of a UTF-8 character so that no character is split between two ranges.
+    """
+    size = len(data)
+    step = max(-(-size // parts), 1)
+    step += -step % alignment
+
+    cuts = [0]
+    for cut in range(step, size, step):
+        if utf8:
+            cut = char_boundary(data, cut, cuts[-1])
+        if cut > cuts[-1]:
+            cuts.append(cut)
+    cuts.append(size)
+    return list(zip(cuts, cuts[1:]))
+
+
+def _process_part(task: Tuple[Source, int, int, str, bool, Dict[str, Any]]) -> bytes:
+    """Worker: encode (or decode) one part of the input"""
+    source, start, end, encoder_name, is_decoding, params = task
+    if isinstance(source, str) and start == end:
+        data = b""
+    elif isinstance(source, str):
+        with open(source, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            data = m[start:end]
+    else:
+        data = source
+
+    encoder = ENCODERS[encoder_name]
+    method = encoder.decode if is_decoding else encoder.encode
+    return method(data, **params)
+
+
+def process_parallel(
+    source: Source, encoder_name: str, is_decoding: bool, jobs: int, **encoder_params
+) -> Iterator[bytes]:
+    """
+    Encode (or decode) a bulk input with a pool of `jobs` processes, yielding outputs in order
+
+    Args:
+        source: Input bytes, or the path of the input file
+        encoder_name: Encoder to use, its input must be splittable (see `split_alignment`)
+        is_decoding: Decode instead of encode
+        jobs: Number of worker processes
+    """
+    alignment = split_alignment(encoder_name, is_decoding, **encoder_params)
+    if alignment == 0:
+        raise ValueError(f"{encoder_name} input can not be split")
+
+    utf8 = splits_utf8(alignment, **encoder_params)
+
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                ranges = [(0, 0)]
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                    parts = min(jobs * PARTS_PER_JOB, max(size // MIN_PART_SIZE, 1))
+                    ranges = split_ranges(m, parts, alignment, utf8)
+    else:
+        size = len(source)
+        parts = min(jobs * PARTS_PER_JOB, max(size // MIN_PART_SIZE, 1))
+        ranges = split_ranges(source, parts, alignment, utf8)
+
+    def task(start: int, end: int) -> Tuple[Source, int, int, str, bool, Dict[str, Any]]:
+        part = source if isinstance(source, str) else source[start:end]
+        return (part, start, end, encoder_name, is_decoding, encoder_params)
+
+    if len(ranges) == 1 or jobs <= 1:
+        for start, end in ranges:
+            yield _process_part(task(start, end))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(ranges))) as executor:
+        yield from executor.map(_process_part, [task(start, end) for start, end in ranges])
@@ -0,0 +1,68 @@
+"""
+Execution planner
+
+Chooses how the CLI runs an encoder, from the capabilities it reports
+(see `Encoder.capabilities`) and from the requested processing mode.
+
+Strategies:
+
+    remote:  records are sent to a running `usenc serve`
+    parallel: the bulk input is split between worker processes
+    stream:  the bulk input is read in chunks, processed incrementally by the encoder
+    split:   the bulk input is read in chunks cut at aligned points, one call per chunk
+    whole:   the bulk input is read at once and processed in one call
+    batch:   lines are processed in batches by the encoder batch implementation
+    lines:   one call per line (or per record field)
+"""
+
+from typing import NamedTuple
+
+from .core import EncoderNotFoundError
+from .encoders import ENCODERS
+from .encoders.encoder import Capabilities
+
+
+class Plan(NamedTuple):
+    strategy: str
+    capabilities: Capabilities
+
+
+def plan(
+    encoder_name: str,
+    is_decoding: bool,
+    is_bulk: bool,
+    jobs: int = 1,
+    remote: bool = False,
+    per_record: bool = False,
+    **encoder_params,
+) -> Plan:
+    """
+    Choose the fastest strategy to process an input
+
+    Args:
+        encoder_name: Encoder to use
+        is_decoding: Decode instead of encode
+        is_bulk: Process the input as a whole instead of line by line
+        jobs: Number of worker processes allowed
+        remote: Records are processed by a server
+        per_record: Each line must go through its own call (cache, latency stats, record formats)
+    """
+    encoder = ENCODERS.get(encoder_name)
+    if not encoder:
+        raise EncoderNotFoundError(f"Unknown encoder: {encoder_name}")
+    capabilities = encoder.capabilities(is_decoding, **encoder_params)
+
+    if remote:
+        strategy = "remote"
+    elif not is_bulk:
+        strategy = "batch" if capabilities.batched and not per_record else "lines"
+    elif jobs > 1 and capabilities.split_alignment:
+        strategy = "parallel"
+    elif capabilities.streamable:
+        strategy = "stream"
+    elif capabilities.split_alignment:
+        strategy = "split"
+    else:
+        strategy = "whole"
+
+    return Plan(strategy, capabilities)
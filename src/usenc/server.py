@@ -0,0 +1,248 @@
+"""
+Encoding server
+
+A long-running `usenc serve` process keeps the encoders loaded and answers
+requests from thin clients over a Unix domain socket or a local TCP port, so
+that short invocations do not pay for interpreter startup and encoder discovery.
+
+Each request is a frame made of a 8-byte header (`>II`: metadata length, payload
+length) followed by the JSON metadata and the payload. The metadata gives the
+encoder and its options, either parsed (`{"encoder": ..., "decode": ..., "params": {...}}`)
+or as command line arguments (`"args": [...]`, sent by the thin client of `client`).
+Each response is a 5-byte header (`>BI`: status, length) followed by the result,
+or by the error message if status is not `STATUS_OK`. A connection can carry any
+number of requests.
+
+Connections are served by a bounded pool of worker threads, and the codec of each
+(encoder, options) pair is prepared once and reused by the following requests.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from functools import lru_cache
+from queue import Queue
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from .client import (
+    DEFAULT_ADDRESS,
+    REQUEST_HEADER,
+    RESPONSE_HEADER,
+    STATUS_DECODE_ERROR,
+    STATUS_ENCODE_ERROR,
+    STATUS_ERROR,
+    STATUS_NOT_FOUND,
+    STATUS_OK,
+    Address,
+    Client,
+    ServerError,
+    parse_address,
+)
+from .core import EncoderNotFoundError, prepare
+from .encoders.encoder import DecodeError, EncodeError
+
+__all__ = [
+    "DEFAULT_ADDRESS",
+    "Address",
+    "Client",
+    "ServerError",
+    "parse_address",
+    "DEFAULT_WORKERS",
+    "make_server",
+    "serve",
+]
+
+ERRORS: Dict[int, Type[Exception]] = {
+    STATUS_ENCODE_ERROR: EncodeError,
+    STATUS_DECODE_ERROR: DecodeError,
+    STATUS_NOT_FOUND: EncoderNotFoundError,
+    STATUS_ERROR: RuntimeError,
+}
+
+# Number of connections served at the same time, the others wait for a free worker
+DEFAULT_WORKERS = 16
+
+# Largest frames accepted, a connection sending a larger one is closed
+MAX_METADATA_SIZE = 1 << 16
+MAX_PAYLOAD_SIZE = 1 << 28
+
+
+@lru_cache(maxsize=256)
+def _prepared_codec(encoder_name: str, is_decoding: bool, params: str) -> Callable[[bytes], bytes]:
+    """Codec of an (encoder, options) pair, prepared once for all the connections"""
+    return prepare(encoder_name, is_decoding, **json.loads(params))
+
+
+@lru_cache(maxsize=256)
+def _parse_metadata(metadata: bytes) -> Callable[[bytes], bytes]:
+    """Parse request metadata, cached as clients repeat the same metadata for each record"""
+    try:
+        request = json.loads(metadata)
+        encoder_name = request["encoder"]
+        is_decoding = bool(request.get("decode"))
+        params = request.get("params", {})
+        args = request.get("args")
+        if not isinstance(encoder_name, str) or not isinstance(params, dict):
+            raise TypeError("encoder must be a string and params an object")
+        if args is not None and not (
+            isinstance(args, list) and all(isinstance(arg, str) for arg in args)
+        ):
+            raise TypeError("args must be a list of strings")
+    except (ValueError, KeyError, TypeError) as e:
+        raise ServerError(f"invalid request metadata: {e}") from e
+
+    if args is not None:
+        # cli builds the parsers of the encoder options, it imports this module
+        from .cli import parse_encoder_args
+
+        params = parse_encoder_args(encoder_name, args)
+    # Options in a canonical form, so that clients sending them in another order share the codec
+    return _prepared_codec(encoder_name, is_decoding, json.dumps(params, sort_keys=True))
+
+
+def _status(e: Exception) -> int:
+    for status, error in ERRORS.items():
+        if isinstance(e, error):
+            return status
+    return STATUS_ERROR
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """Serve requests from a single connection until the client closes it"""
+
+    def setup(self):
+        super().setup()
+        if self.request.family in (socket.AF_INET, socket.AF_INET6):
+            self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self):
+        while True:
+            header = self.rfile.read(REQUEST_HEADER.size)
+            if len(header) < REQUEST_HEADER.size:
+                return
+            metadata_len, payload_len = REQUEST_HEADER.unpack(header)
+            if metadata_len > MAX_METADATA_SIZE or payload_len > MAX_PAYLOAD_SIZE:
+                # The rest of the frame is not read, the connection can not be used anymore
+                self.respond(
+                    STATUS_ERROR,
+                    f"request too large: {metadata_len} bytes of metadata (at most "
+                    f"{MAX_METADATA_SIZE}), {payload_len} bytes of payload (at most "
+                    f"{MAX_PAYLOAD_SIZE})".encode(),
+                )
+                return
+            metadata = self.rfile.read(metadata_len)
+            payload = self.rfile.read(payload_len)
+            if len(metadata) < metadata_len or len(payload) < payload_len:
+                return
+
+            try:
+                codec = _parse_metadata(metadata)
+                status, result = STATUS_OK, codec(payload)
+            except Exception as e:
+                status, result = _status(e), str(e).encode("utf8")
+
+            self.respond(status, result)
+
+    def respond(self, status: int, result: bytes):
+        self.wfile.write(RESPONSE_HEADER.pack(status, len(result)) + result)
+        self.wfile.flush()
+
+
+class WorkerPoolMixIn(socketserver.BaseServer):
+    """
+    Serve connections from a pool of `workers` threads instead of one thread per
+    connection, the connections accepted while every worker is busy are queued
+    """
+
+    workers = DEFAULT_WORKERS
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.connections: Queue[Optional[Tuple[Any, Any]]] = Queue()
+        self.threads: List[threading.Thread] = []
+
+    def process_request(self, request, client_address):
+        if not self.threads:
+            for _ in range(max(self.workers, 1)):
+                # Daemon threads, so that a client keeping its connection open does not block exit
+                thread = threading.Thread(target=self.process_connections, daemon=True)
+                thread.start()
+                self.threads.append(thread)
+        self.connections.put((request, client_address))
+
+    def process_connections(self):
+        while True:
+            connection = self.connections.get()
+            if connection is None:
+                return
+            request, client_address = connection
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        for _ in self.threads:
+            self.connections.put(None)
+        self.threads = []
+
+
+class PooledTCPServer(WorkerPoolMixIn, socketserver.TCPServer):
+    allow_reuse_address = True
+
+
+if hasattr(socket, "AF_UNIX"):
+
+    class PooledUnixServer(WorkerPoolMixIn, socketserver.UnixStreamServer):
+        pass
+
+
+def _remove_stale_socket(path: str):
+    """Remove the socket left at `path` by a server that is not running anymore"""
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ServerError(f"{path} already exists and is not a socket")
+
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)
+        return
+    finally:
+        probe.close()
+    raise ServerError(f"a server is already listening on {path}")
+
+
+def make_server(address: Address, workers: int = DEFAULT_WORKERS) -> WorkerPoolMixIn:
+    """Create a server whose connections are served by a pool of `workers` threads"""
+    server: WorkerPoolMixIn
+    if isinstance(address, tuple):
+        server = PooledTCPServer(address, RequestHandler)
+    elif not hasattr(socket, "AF_UNIX"):
+        raise ServerError("Unix domain sockets are not supported on this platform")
+    else:
+        _remove_stale_socket(address)
+        server = PooledUnixServer(address, RequestHandler)
+    server.workers = workers
+    return server
+
+
+def serve(address: Address, workers: int = DEFAULT_WORKERS):
+    """Serve requests until interrupted"""
+    server = make_server(address, workers)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if isinstance(address, str) and os.path.exists(address):
+            os.unlink(address)
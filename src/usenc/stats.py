@@ -0,0 +1,253 @@
+"""
+Runtime statistics for encoding runs
+"""
+
+import json
+import time
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, Optional, TextIO
+
+from .cache import CodecCache
+from .errors import ErrorPolicy
+
+
+class Stats:
+    """
+    Collects counters and timings while an input is processed.
+
+    Pass an instance to `cli.process_encoding` (or wrap your own streams and codec
+    with `reader`, `writer` and `timed`) and call `report` once the run is over.
+
+    Per-record latencies are accumulated in a log-scale histogram (16 buckets per
+    power of two) so that percentiles are available without keeping every sample.
+    """
+
+    def __init__(self, encoder_name: str = "", is_decoding: bool = False):
+        self.encoder_name = encoder_name
+        self.is_decoding = is_decoding
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.calls = 0
+        # Input records, when they are not one codec call each (--format with several fields)
+        self.records: Optional[int] = None
+        self.read_time = 0.0
+        self.codec_time = 0.0
+        self.write_time = 0.0
+        self.latencies: Dict[int, int] = {}
+        self.cache: Optional[CodecCache] = None
+        self.errors: Optional[ErrorPolicy] = None
+        self.strategy = ""
+        self.start_time = time.perf_counter()
+        self.end_time = 0.0
+
+    def reader(self, stream: BinaryIO) -> "StatsReader":
+        """Wrap an input stream to count bytes and measure read time"""
+        return StatsReader(stream, self)
+
+    def writer(self, stream: BinaryIO) -> "StatsWriter":
+        """Wrap an output stream to count bytes and measure write time"""
+        return StatsWriter(stream, self)
+
+    def timed(self, method: Callable[..., bytes]) -> Callable[..., bytes]:
+        """Wrap a codec function to measure its latency on each call"""
+
+        def wrapper(*args, **kwargs) -> bytes:
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.record(time.perf_counter() - start)
+
+        return wrapper
+
+    def timed_stream(
+        self, method: Callable[[Iterable[bytes]], Iterator[bytes]]
+    ) -> Callable[[Iterable[bytes]], Iterator[bytes]]:
+        """
+        Wrap a streaming codec function to measure its processing time
+
+        Reading the input chunks happens while the codec runs, the time spent
+        reading is not counted as codec time. The whole stream is recorded as one call.
+        """
+
+        def wrapper(chunks: Iterable[bytes]) -> Iterator[bytes]:
+            output = method(chunks)
+            elapsed = 0.0
+            while True:
+                start = time.perf_counter()
+                read_time = self.read_time
+                try:
+                    chunk = next(output)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start - (self.read_time - read_time)
+                yield chunk
+            self.record(elapsed)
+
+        return wrapper
+
+    @property
+    def lines(self) -> int:
+        """Number of records (lines) processed"""
+        return self.calls if self.records is None else self.records
+
+    def record(self, latency: float):
+        """Record the latency (in seconds) of one codec call"""
+        self.calls += 1
+        self.codec_time += latency
+
+        # Keep the 4 most significant bits of the latency in nanoseconds
+        ns = int(latency * 1e9)
+        shift = max(ns.bit_length() - 4, 0)
+        bucket = (ns >> shift) << shift
+        self.latencies[bucket] = self.latencies.get(bucket, 0) + 1
+
+    def merge(self, other: "Stats"):
+        """Add the counters, times and latencies of another run (e.g. of another file)"""
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        if self.records is not None or other.records is not None:
+            self.records = self.lines + other.lines
+        self.calls += other.calls
+        self.read_time += other.read_time
+        self.codec_time += other.codec_time
+        self.write_time += other.write_time
+        for bucket, count in other.latencies.items():
+            self.latencies[bucket] = self.latencies.get(bucket, 0) + count
+        self.strategy = self.strategy or other.strategy
+
+    def stop(self):
+        """Mark the end of the run"""
+        self.end_time = time.perf_counter()
+
+    def percentile(self, p: float) -> float:
+        """Approximate latency percentile (in seconds), p in [0, 100]"""
+        total = sum(self.latencies.values())
+        if total == 0:
+            return 0.0
+
+        rank = p / 100 * total
+        seen = 0
+        for bucket in sorted(self.latencies):
+            seen += self.latencies[bucket]
+            if seen >= rank:
+                return bucket / 1e9
+        return max(self.latencies) / 1e9
+
+    @property
+    def total_time(self) -> float:
+        end = self.end_time if self.end_time else time.perf_counter()
+        return end - self.start_time
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Statistics as a JSON-serializable dict (times in seconds)"""
+        total_time = self.total_time
+        d = {
+            "encoder": self.encoder_name,
+            "mode": "decode" if self.is_decoding else "encode",
+            "strategy": self.strategy,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "lines": self.lines,
+            "calls": self.calls,
+            "time": {
+                "read": self.read_time,
+                "codec": self.codec_time,
+                "write": self.write_time,
+                "total": total_time,
+            },
+            "throughput": self.bytes_in / total_time if total_time > 0 else 0.0,
+            "latency": {
+                "p50": self.percentile(50),
+                "p90": self.percentile(90),
+                "p99": self.percentile(99),
+                "max": self.percentile(100),
+            },
+        }
+        if self.cache is not None:
+            d["cache"] = self.cache.as_dict()
+        if self.errors is not None:
+            d["errors"] = self.errors.as_dict()
+        return d
+
+    def format_text(self) -> str:
+        """Human readable report"""
+        d = self.as_dict()
+        times = d["time"]
+        latency = d["latency"]
+        lines = [
+            f"usenc stats ({d['encoder']} {d['mode']})",
+            f"  strategy:    {d['strategy']}",
+            f"  bytes in:    {d['bytes_in']}",
+            f"  bytes out:   {d['bytes_out']}",
+            f"  lines:       {d['lines']}",
+            f"  calls:       {d['calls']}",
+            f"  read time:   {times['read']:.6f}s",
+            f"  {d['mode']} time: {times['codec']:.6f}s",
+            f"  write time:  {times['write']:.6f}s",
+            f"  total time:  {times['total']:.6f}s",
+            f"  throughput:  {d['throughput'] / 1e6:.2f} MB/s",
+            "  latency:     p50={:.1f}us p90={:.1f}us p99={:.1f}us max={:.1f}us".format(
+                *(latency[k] * 1e6 for k in ("p50", "p90", "p99", "max"))
+            ),
+        ]
+        if "cache" in d:
+            cache = d["cache"]
+            lines.append(
+                f"  cache:       {cache['hits']} hits, {cache['misses']} misses "
+                f"({cache['hit_rate']:.1%}){'' if cache['enabled'] else ', disabled'}"
+            )
+        if "errors" in d:
+            errors = d["errors"]
+            lines.append(f"  errors:      {errors['errors']} ({errors['policy']})")
+        return "\n".join(lines)
+
+    def report(self, file: TextIO, fmt: str = "text"):
+        """Write the report to `file` in `text` or `json` format"""
+        if fmt == "json":
+            file.write(json.dumps(self.as_dict()) + "\n")
+        else:
+            file.write(self.format_text() + "\n")
+
+
+class StatsReader:
+    """Input stream wrapper that records read time and input size"""
+
+    def __init__(self, stream: BinaryIO, stats: Stats):
+        self.stream = stream
+        self.stats = stats
+
+    def read(self, size: int = -1) -> bytes:
+        start = time.perf_counter()
+        data = self.stream.read(size)
+        self.stats.read_time += time.perf_counter() - start
+        self.stats.bytes_in += len(data)
+        return data
+
+    def readline(self, size: int = -1) -> bytes:
+        start = time.perf_counter()
+        line = self.stream.readline(size)
+        self.stats.read_time += time.perf_counter() - start
+        self.stats.bytes_in += len(line)
+        return line
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self.readline, b"")
+
+
+class StatsWriter:
+    """Output stream wrapper that records write time and output size"""
+
+    def __init__(self, stream: BinaryIO, stats: Stats):
+        self.stream = stream
+        self.stats = stats
+
+    def write(self, data: bytes) -> int:
+        start = time.perf_counter()
+        written = self.stream.write(data)
+        self.stats.write_time += time.perf_counter() - start
+        self.stats.bytes_out += len(data)
+        return written
+
+    def flush(self):
+        self.stream.flush()
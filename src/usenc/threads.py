@@ -0,0 +1,108 @@
+"""
+Thread-pool execution
+
+Batches of records are processed by a pool of threads, without pickling and
+without the startup of worker processes. Threads only run encoders at the same
+time where the GIL is released: `hashlib` (md5, sha1, sha256) and `zlib` (crc32,
+adler32) release it on large inputs, and free-threaded builds of CPython (3.13t
+and later) run every encoder in parallel.
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, Iterator, List
+
+# Batches smaller than this (in bytes of input) are processed by the calling thread
+MIN_THREAD_BATCH = 1 << 16
+
+# Number of batches queued per thread, so that a slow batch does not stall the others
+BATCHES_PER_THREAD = 2
+
+_executors: Dict[int, ThreadPoolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def thread_count(threads: int) -> int:
+    """Number of threads to use, 0 meaning one per CPU"""
+    return threads if threads > 0 else os.cpu_count() or 1
+
+
+def shared_executor(threads: int) -> ThreadPoolExecutor:
+    """Pool of `threads` threads shared by all the batch codecs of the process"""
+    with _executors_lock:
+        executor = _executors.get(threads)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="usenc")
+            _executors[threads] = executor
+        return executor
+
+
+def threaded_batch(
+    batch_codec: Callable[[List[bytes]], List[bytes]], threads: int
+) -> Callable[[Iterable[bytes]], List[bytes]]:
+    """
+    Return `batch_codec` cutting large batches in one part per thread, processed
+    by a shared pool of `threads` threads (0 for one per CPU)
+
+    The outputs are returned in the order of the inputs. Batches of less than
+    `MIN_THREAD_BATCH` bytes are processed by the calling thread.
+    """
+    threads = thread_count(threads)
+
+    def run(texts: Iterable[bytes]) -> List[bytes]:
+        texts = list(texts)
+        if threads <= 1 or len(texts) < 2 or sum(map(len, texts)) < MIN_THREAD_BATCH:
+            return batch_codec(texts)
+
+        step = -(-len(texts) // threads)
+        parts = [texts[start : start + step] for start in range(0, len(texts), step)]
+        results: List[bytes] = []
+        for part in shared_executor(threads).map(batch_codec, parts):
+            results.extend(part)
+        return results
+
+    return run
+
+
+class OrderedPool:
+    """
+    Pool of threads processing batches in the background, returning their results
+    in submission order
+
+    At most `BATCHES_PER_THREAD` batches per thread are pending, `submit` returns
+    the results of the oldest batches once that limit is reached, so the input is
+    not read ahead of the output without bound.
+    """
+
+    def __init__(self, batch_codec: Callable[[List[bytes]], List[bytes]], threads: int):
+        self.batch_codec = batch_codec
+        self.threads = thread_count(threads)
+        self.executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="usenc")
+        self.pending: Deque[Future[List[bytes]]] = deque()
+
+    def submit(self, batch: List[bytes]) -> List[List[bytes]]:
+        """Queue `batch`, and return the results of the batches that have to be written first"""
+        self.pending.append(self.executor.submit(self.batch_codec, batch))
+        ready = []
+        while len(self.pending) > self.threads * BATCHES_PER_THREAD:
+            ready.append(self.pending.popleft().result())
+        return ready
+
+    def drain(self) -> Iterator[List[bytes]]:
+        """Results of all the pending batches"""
+        while self.pending:
+            yield self.pending.popleft().result()
+
+    def close(self):
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.executor.shutdown()
+
+    def __enter__(self) -> "OrderedPool":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -4,8 +4,8 @@ from usenc import cli
 from usenc.encoders import ENCODERS
 
 
-def load_samples_file(path):
-    """Load test samples, filtering out comments and empty lines."""
+def load_samples_file(path, comments=True):
+    """Load test samples, filtering out comments (snapshots have none, # can be encoded output)."""
     samples = []
 
     with open(path, "rb") as f:
@@ -13,7 +13,7 @@ def load_samples_file(path):
             # Strip trailing newline but preserve the content
             line = line.rstrip(b"\n")
             # Skip comment lines (starting with #)
-            if line.startswith(b"#"):
+            if comments and line.startswith(b"#"):
                 continue
             # Include all lines, even empty ones (they're valid test cases)
             samples.append(line)
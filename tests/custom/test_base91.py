@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import accel
+from usenc.encoders.base91 import (
+    BASE91_ALPHABET,
+    Base91DecodeState,
+    Base91Encoder,
+    Base91EncodeState,
+)
+from usenc.encoders.encoder import DecodeError, EncodeError
+
+SAMPLE = bytes((i * 167 + 13) % 256 for i in range(1001)) + b"\x00" * 40
+
+
+def _reference_encode(data: bytes) -> bytes:
+    """Byte by byte encoder of the basE91 reference implementation"""
+    out = bytearray()
+    queue = bits = 0
+    for byte in data:
+        queue |= byte << bits
+        bits += 8
+        if bits > 13:
+            value = queue & 8191
+            if value > 88:
+                queue >>= 13
+                bits -= 13
+            else:
+                value = queue & 16383
+                queue >>= 14
+                bits -= 14
+            out += bytes((BASE91_ALPHABET[value % 91], BASE91_ALPHABET[value // 91]))
+    if bits:
+        out.append(BASE91_ALPHABET[queue % 91])
+        if bits > 7 or queue > 90:
+            out.append(BASE91_ALPHABET[queue // 91])
+    return bytes(out)
+
+
+@pytest.fixture(params=[False, True], ids=["python", "numpy"])
+def backend(request, monkeypatch):
+    """Run with the pure Python path and with the NumPy backend (for any size)"""
+    if request.param and not accel.HAS_NUMPY:
+        pytest.skip("NumPy is not available")
+    monkeypatch.setattr(accel, "NUMPY_MIN_SIZE", 0 if request.param else 1 << 62)
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        (b"", b""),
+        (b"a", b"GB"),
+        (b"hello", b"TPwJh>A"),
+        (b"hello world", b"TPwJh>Io2Tv!lE"),
+        (b"\x00\x00", b"AAA"),
+    ],
+)
+def test_base91_vectors(text, expected):
+    assert Base91Encoder.encode(text) == expected
+    assert Base91Encoder.decode(expected) == text
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 7, 8, 9, 15, 16, 17, 100, 1041])
+def test_reference_implementation(backend, size):
+    """Test that the table-driven paths match the byte by byte reference, in both directions"""
+    encoded = Base91Encoder.encode(SAMPLE[:size])
+    assert encoded == _reference_encode(SAMPLE[:size])
+    assert Base91Encoder.decode(encoded) == SAMPLE[:size]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 13, 64, 500])
+def test_stream(backend, chunk_size):
+    """Test that streaming gives the same output as a single call, whatever the chunk size"""
+    encoded = Base91Encoder.encode(SAMPLE)
+    chunks = [SAMPLE[i : i + chunk_size] for i in range(0, len(SAMPLE), chunk_size)]
+    assert b"".join(Base91Encoder.encode_stream(chunks)) == encoded
+
+    chunks = [encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+    assert b"".join(Base91Encoder.decode_stream(chunks)) == SAMPLE
+
+
+def test_state_objects():
+    """State objects can be fed by hand and reused after finish"""
+    encoder = Base91EncodeState()
+    for _ in range(2):
+        output = encoder.update(b"hello") + encoder.update(b" world") + encoder.finish()
+        assert output == b"TPwJh>Io2Tv!lE"
+
+    decoder = Base91DecodeState()
+    assert decoder.update(b"TPwJh>Io2") + decoder.update(b"Tv!lE") + decoder.finish() == (
+        b"hello world"
+    )
+
+
+def test_numpy_blocks(monkeypatch):
+    """The NumPy backend carries the pending bits from block to block"""
+    if not accel.HAS_NUMPY:
+        pytest.skip("NumPy is not available")
+    monkeypatch.setattr(accel, "NUMPY_MIN_SIZE", 0)
+    monkeypatch.setattr(sys.modules[Base91Encoder.__module__], "ACCEL_BLOCK", 5)
+    assert Base91Encoder.encode(SAMPLE) == _reference_encode(SAMPLE)
+
+
+def test_custom_alphabet():
+    alphabet = BASE91_ALPHABET[::-1].decode()
+    encoded = Base91Encoder.encode(b"hello world", alphabet=alphabet)
+    assert encoded == Base91Encoder.encode(b"hello world").translate(
+        bytes.maketrans(BASE91_ALPHABET, BASE91_ALPHABET[::-1])
+    )
+    assert Base91Encoder.decode(encoded, alphabet=alphabet) == b"hello world"
+
+    with pytest.raises(EncodeError, match="must be 91"):
+        Base91Encoder.encode(b"hello", alphabet="abc")
+    with pytest.raises(EncodeError, match="unique"):
+        Base91Encoder.encode(b"hello", alphabet="a" * 91)
+
+
+@pytest.mark.parametrize("text", [b"TPwJh Io2Tv!lE", b"TPwJh>Io2Tv!l'", b"TPwJh>Io2Tv!l'" * 50])
+def test_invalid_character(backend, text):
+    with pytest.raises(DecodeError, match="Invalid character"):
+        Base91Encoder.decode(text)
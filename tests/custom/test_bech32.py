@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.bech32 import GENERATOR, Bech32Encoder, polymod
+from usenc.encoders.encoder import DecodeError, EncodeError
+
+NPUB = b"npub180cvv07tjdrrgpa0j7j7tmnyl2yr6yr7l8j4s3evf6u64th6gkwsyjh6w6"
+NPUB_KEY = bytes.fromhex("3bf0c63fcb93463407af97a5e5ee64fa883d107ef9e558472c4eb9aaaefa459d")
+
+# Valid and invalid strings from the test vectors of BIP 173 and BIP 350
+VALID = [
+    (b"A12UEL5L", b"valid bech32"),
+    (b"a12uel5l", b"valid bech32"),
+    (b"abcdef1qpzry9x8gf2tvdw0s3jn54khce6mua7lmqqqxw", b"valid bech32"),
+    (b"split1checkupstagehandshakeupstreamerranterredcaperred2y9e3w", b"valid bech32"),
+    (b"?1ezyfcl", b"valid bech32"),
+    (b"bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4", b"valid bech32"),
+    (b"A1LQFN3A", b"valid bech32m"),
+    (b"abcdef1l7aum6echk45nj3s0wdvt2fg8x9yrzpqzd3ryx", b"valid bech32m"),
+]
+INVALID = [
+    (b"A1G7SGD8", b"invalid: invalid checksum"),
+    (b"a12UEL5L", b"invalid: mixed case"),
+    (b"1nwldj5", b"invalid: missing human-readable part or separator"),
+    (b"pzry9x0s0muk", b"invalid: missing human-readable part or separator"),
+    (b"x1b4n0q5v", b"invalid: invalid character 'b' in data part"),
+    (b"li1dgmt3", b"invalid: checksum too short"),
+    (b"\x201xj0phk", b"invalid: invalid character in human-readable part"),
+    (b"", b"invalid: missing human-readable part or separator"),
+]
+
+
+def _reference_polymod(values: bytes, state: int = 1) -> int:
+    """Symbol by symbol polymod of the BIP 173 reference implementation"""
+    for value in values:
+        top = state >> 25
+        state = (state & 0x1FFFFFF) << 5 ^ value
+        for i in range(5):
+            state ^= GENERATOR[i] if top >> i & 1 else 0
+    return state
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 10, 33])
+def test_polymod_table(size):
+    """Test that the two symbols per lookup polymod matches the reference"""
+    values = bytes((i * 7 + 3) % 32 for i in range(size))
+    assert polymod(values) == _reference_polymod(values)
+    assert polymod(values, 0x1234567) == _reference_polymod(values, 0x1234567)
+
+
+@pytest.mark.parametrize("text,expected", VALID + INVALID)
+def test_validate_vectors(text, expected):
+    assert Bech32Encoder.decode(text, validate=True) == expected
+
+
+@pytest.mark.parametrize("text,expected", INVALID)
+def test_decode_invalid(text, expected):
+    with pytest.raises(DecodeError, match=expected.decode().split(": ", 1)[1]):
+        Bech32Encoder.decode(text)
+
+
+def test_npub():
+    """Nostr public keys are bech32 encoded 32 byte keys"""
+    assert Bech32Encoder.encode(NPUB_KEY, hrp="npub") == NPUB
+    assert Bech32Encoder.decode(NPUB, hrp="npub") == NPUB_KEY
+    assert Bech32Encoder.decode(NPUB.upper()) == NPUB_KEY
+
+
+def test_variant():
+    encoded = Bech32Encoder.encode(b"hello", hrp="test", variant="bech32m")
+    assert Bech32Encoder.decode(encoded, validate=True) == b"valid bech32m"
+    assert Bech32Encoder.decode(encoded, variant="bech32m") == b"hello"
+    with pytest.raises(DecodeError, match="bech32m checksum, expected bech32"):
+        Bech32Encoder.decode(encoded)
+
+
+def test_hrp():
+    with pytest.raises(EncodeError, match="hrp parameter is required"):
+        Bech32Encoder.encode(b"hello")
+    with pytest.raises(EncodeError, match="printable ASCII"):
+        Bech32Encoder.encode(b"hello", hrp="a b")
+    with pytest.raises(DecodeError, match="human-readable part 'npub', expected 'nsec'"):
+        Bech32Encoder.decode(NPUB, hrp="nsec")
+    assert Bech32Encoder.decode(NPUB, hrp="nsec", validate=True) == (
+        b"invalid: human-readable part 'npub'"
+    )
+
+
+def test_decode_padding():
+    """Segwit addresses start with a version symbol, their data part is not whole bytes"""
+    with pytest.raises(DecodeError, match="invalid padding"):
+        Bech32Encoder.decode(b"bc1qw508d6qejxtdg4y5r3zarvary0c5xw7kv8f3t4")
+
+
+def test_validate_batch():
+    """Batch validation reports invalid inputs without raising"""
+    texts = [text for text, _ in VALID + INVALID]
+    expected = [result for _, result in VALID + INVALID]
+    assert Bech32Encoder.decode_batch(texts, validate=True) == expected
+    assert Bech32Encoder.capabilities(is_decoding=True, validate=True).batched
+
+
+def test_decode_batch():
+    encoded = [Bech32Encoder.encode(bytes([i]) * i, hrp="test") for i in range(20)]
+    assert Bech32Encoder.decode_batch(encoded) == [bytes([i]) * i for i in range(20)]
+    with pytest.raises(DecodeError):
+        Bech32Encoder.decode_batch(encoded + [b"A1G7SGD8"])
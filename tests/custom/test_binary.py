@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.binary import BinaryEncoder
+from usenc.encoders.encoder import DecodeError, EncodeError
+
+DATA = bytes(range(256)) + b"hello world"
+
+
+def _reference(data: bytes, separator: str = "", group: int = 1) -> bytes:
+    """Bits of each byte with format, joined by group"""
+    groups = [data[i : i + group] for i in range(0, len(data), group)]
+    bits = ["".join(format(byte, "08b") for byte in g) for g in groups]
+    return separator.join(bits).encode()
+
+
+@pytest.mark.parametrize("size", [0, 1, 2, 3, 7, 100])
+@pytest.mark.parametrize("separator,group", [("", 1), (" ", 1), (", ", 2), ("|", 3), (" ", 8)])
+def test_reference(size, separator, group):
+    """Test the whole buffer conversion and separator layout against per byte formatting"""
+    data = DATA[:size]
+    encoded = BinaryEncoder.encode(data, separator=separator, group=group)
+    assert encoded == _reference(data, separator, group)
+    assert BinaryEncoder.decode(encoded, separator=separator) == data
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 64])
+@pytest.mark.parametrize("separator,group", [("", 1), (" ", 1), (":", 3)])
+def test_streams(chunk_size, separator, group):
+    """Test that streams carry partial groups and bits across chunks"""
+    encoded = BinaryEncoder.encode(DATA, separator=separator, group=group)
+
+    chunks = [DATA[i : i + chunk_size] for i in range(0, len(DATA), chunk_size)]
+    stream = BinaryEncoder.encode_stream(chunks, separator=separator, group=group)
+    assert b"".join(stream) == encoded
+
+    chunks = [encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+    stream = BinaryEncoder.decode_stream(chunks, separator=separator, group=group)
+    assert b"".join(stream) == DATA
+
+
+def test_decode_ignores_whitespace():
+    assert BinaryEncoder.decode(b" 01101000\n0110\t1001\r\n") == b"hi"
+
+
+@pytest.mark.parametrize(
+    "text,message",
+    [
+        (b"01101002", "Invalid character '2'"),
+        (b"0110100", "7 bits"),
+        (b"01101000:01101001", "Invalid character ':'"),
+    ],
+)
+def test_decode_invalid(text, message):
+    with pytest.raises(DecodeError, match=message):
+        BinaryEncoder.decode(text)
+
+
+def test_decode_stream_truncated():
+    with pytest.raises(DecodeError, match="3 bits"):
+        b"".join(BinaryEncoder.decode_stream([b"0110", b"1000011"]))
+
+
+@pytest.mark.parametrize("separator,group", [("0", 1), (" 1", 1), (" ", 0)])
+def test_invalid_params(separator, group):
+    with pytest.raises(EncodeError):
+        BinaryEncoder.encode(b"hi", separator=separator, group=group)
+    with pytest.raises(DecodeError):
+        BinaryEncoder.decode(b"01101000", separator=separator, group=group)
+
+
+def test_output_ratio():
+    assert BinaryEncoder.output_ratio() == 8
+    assert BinaryEncoder.output_ratio(separator=" ", group=2) == 8.5
+    assert BinaryEncoder.output_ratio(is_decoding=True) == 1 / 8
@@ -0,0 +1,72 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.adler32 import Adler32Encoder
+from usenc.encoders.checksum import ChecksumEncoder
+from usenc.encoders.crc16 import Crc16Encoder
+from usenc.encoders.crc32 import Crc32Encoder
+from usenc.encoders.encoder import DecodeError, EncodeError
+
+# Check values of the CRC catalogue for the input "123456789"
+CRC16_CHECKS = {
+    "arc": b"BB3D",
+    "modbus": b"4B37",
+    "usb": b"B4C8",
+    "xmodem": b"31C3",
+    "ccitt-false": b"29B1",
+    "kermit": b"2189",
+    "x25": b"906E",
+}
+
+
+def test_checksum_no_algorithm():
+    """Test error when algorithm is not provided and not defined in class"""
+    with pytest.raises(EncodeError, match="algorithm parameter is required"):
+        ChecksumEncoder.encode(b"test")
+
+
+def test_checksum_invalid_algorithm():
+    """Test error with invalid checksum algorithm name"""
+    with pytest.raises(EncodeError, match="Unknown checksum algorithm"):
+        ChecksumEncoder.encode(b"test", algorithm="crc64")
+
+
+def test_checksum_cannot_decode():
+    """Test that checksum encoders cannot decode"""
+    with pytest.raises(DecodeError, match="checksums cannot be decoded"):
+        Crc32Encoder.decode(b"CBF43926")
+
+
+def test_check_values():
+    assert Crc32Encoder.encode(b"123456789") == b"CBF43926"
+    assert Adler32Encoder.encode(b"123456789") == b"091E01DE"
+    for variant, check in CRC16_CHECKS.items():
+        assert Crc16Encoder.encode(b"123456789", variant=variant) == check, variant
+
+
+def test_decimal_output():
+    assert Crc32Encoder.encode(b"123456789", decimal=True) == b"3421780262"
+
+
+def test_stream_matches_encode():
+    data = bytes(range(256)) * 100
+    chunks = [data[i : i + 1000] for i in range(0, len(data), 1000)]
+
+    assert list(Crc32Encoder.encode_stream(chunks)) == [Crc32Encoder.encode(data)]
+    assert list(Adler32Encoder.encode_stream(chunks)) == [Adler32Encoder.encode(data)]
+    for variant in CRC16_CHECKS:
+        assert list(Crc16Encoder.encode_stream(chunks, variant=variant)) == [
+            Crc16Encoder.encode(data, variant=variant)
+        ]
+
+
+def test_batch_matches_encode():
+    texts = [b"hello world", b"", b"123456789", bytes(range(256))]
+    for variant in CRC16_CHECKS:
+        for options in ({}, {"decimal": True}, {"lowercase": True}):
+            assert Crc16Encoder.encode_batch(texts, variant=variant, **options) == [
+                Crc16Encoder.encode(text, variant=variant, **options) for text in texts
+            ], variant
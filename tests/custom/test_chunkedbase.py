@@ -0,0 +1,122 @@
+import base64
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.base45 import Base45Encoder
+from usenc.encoders.base85 import Base85Encoder
+from usenc.encoders.chunkedbase import ChunkedBaseEncoder
+from usenc.encoders.encoder import DecodeError, EncodeError
+
+SAMPLE = bytes((i * 167 + 13) % 256 for i in range(1001)) + b"\x00" * 8
+
+
+class TestEncoder(ChunkedBaseEncoder):
+    """Generic engine with 4 bytes groups and the RFC 1924 alphabet"""
+
+
+@pytest.mark.parametrize(
+    "text,expected",
+    [
+        (b"AB", b"BB8"),
+        (b"Hello!!", b"%69 VD92EX0"),
+        (b"base-45", b"UJCLQE7W581"),
+        (b"ietf!", b"QED8WEX0"),
+    ],
+)
+def test_base45_vectors(text, expected):
+    """Test the examples of RFC 9285"""
+    assert Base45Encoder.encode(text) == expected
+    assert Base45Encoder.decode(expected) == text
+
+
+def test_base45_out_of_range():
+    with pytest.raises(DecodeError, match="group value out of range"):
+        Base45Encoder.decode(b"GGW")
+
+
+def test_base45_truncated():
+    with pytest.raises(DecodeError, match="truncated input"):
+        Base45Encoder.decode(b"BB8A")
+
+
+def test_base45_invalid_character():
+    with pytest.raises(DecodeError, match=r"Invalid character 'a' \(0x61\) for Base45Encoder"):
+        Base45Encoder.decode(b"BBa")
+
+
+def test_z85_vector():
+    """Test the example of the Z85 specification"""
+    data = bytes.fromhex("864FD26FB559F75B")
+    assert Base85Encoder.encode(data, alphabet="z85") == b"HelloWorld"
+    assert Base85Encoder.decode(b"HelloWorld", alphabet="z85") == data
+
+
+def test_ascii85_zero_groups():
+    assert Base85Encoder.encode(b"\x00" * 8) == b"zz"
+    assert Base85Encoder.decode(b"zz") == b"\x00" * 8
+
+
+def test_base85_invalid_character():
+    with pytest.raises(DecodeError, match=r"Invalid character '.' \(0x22\)"):
+        Base85Encoder.decode(b'Hello"', alphabet="z85")
+    with pytest.raises(DecodeError, match="Non-Ascii85 digit"):
+        Base85Encoder.decode(b"BOu!v")
+
+
+def test_base85_custom_alphabet():
+    alphabet = Base85Encoder.alphabets["z85"][::-1].decode()
+    encoded = Base85Encoder.encode(SAMPLE, alphabet=alphabet)
+    assert Base85Encoder.decode(encoded, alphabet=alphabet) == SAMPLE
+
+
+def test_generic_engine_matches_b85():
+    """Test the generic 4 bytes group engine against python base64 module"""
+    for size in range(9):
+        assert TestEncoder.encode(SAMPLE[:size]) == base64.b85encode(SAMPLE[:size])
+    encoded = TestEncoder.encode(SAMPLE)
+    assert encoded == base64.b85encode(SAMPLE)
+    assert TestEncoder.decode(encoded) == SAMPLE
+
+
+def test_wrong_alphabet_length():
+    with pytest.raises(EncodeError, match=r"alphabet length \(10\) must equal the base \(45\)"):
+        Base45Encoder.encode(b"test", alphabet="0123456789")
+
+
+@pytest.mark.parametrize("alphabet", ["ascii", "rfc1924", "z85"])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_base85_stream(alphabet, chunk_size):
+    """Test that streaming gives the same result as encoding the whole input"""
+    encoded = Base85Encoder.encode(SAMPLE, alphabet=alphabet)
+    chunks = [SAMPLE[i : i + chunk_size] for i in range(0, len(SAMPLE), chunk_size)]
+    assert b"".join(Base85Encoder.encode_stream(chunks, alphabet=alphabet)) == encoded
+
+    chunks = [encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+    assert b"".join(Base85Encoder.decode_stream(chunks, alphabet=alphabet)) == SAMPLE
+
+
+def test_ascii85_stream_whitespace():
+    chunks = [b"BOu!r", b"D]j7\n", b"Bz B", b"P@"]
+    assert b"".join(Base85Encoder.decode_stream(chunks)) == b"hello wo\x00\x00\x00\x00hi"
+
+
+@pytest.mark.parametrize("encoded", [b"ab z", b"abzcd", b"BOu!rDz]j7B"])
+def test_ascii85_stream_misplaced_z(encoded):
+    """Test that decode_stream rejects a z inside a group like decode does"""
+    with pytest.raises(DecodeError, match="z inside Ascii85 5-tuple"):
+        Base85Encoder.decode(encoded)
+    for chunk_size in (1, 3, len(encoded)):
+        chunks = [encoded[i : i + chunk_size] for i in range(0, len(encoded), chunk_size)]
+        with pytest.raises(DecodeError, match="z inside Ascii85 5-tuple"):
+            b"".join(Base85Encoder.decode_stream(chunks))
+
+
+def test_base45_stream():
+    encoded = Base45Encoder.encode(SAMPLE)
+    chunks = [SAMPLE[i : i + 5] for i in range(0, len(SAMPLE), 5)]
+    assert b"".join(Base45Encoder.encode_stream(chunks)) == encoded
+    chunks = [encoded[i : i + 5] for i in range(0, len(encoded), 5)]
+    assert b"".join(Base45Encoder.decode_stream(chunks)) == SAMPLE
@@ -21,3 +21,45 @@ def test_unimplemented_encode():
 def test_unimplemented_decode():
     with pytest.raises(NotImplementedError):
         EscapeEncoder.decode(b"68656C6C6F20776F726C64")
+
+
+def test_selected_bytes():
+    from usenc.encoders.escape import ALL_BYTES, _selected_bytes
+
+    assert _selected_bytes(r"[\s\S]") is ALL_BYTES
+    assert _selected_bytes(r"[\w]") is None
+    assert _selected_bytes(r"[é]") is None
+    selected = _selected_bytes(r"[^A-Za-z0-9]")
+    assert selected.sub(b"_", "a-bé".encode()) == b"a_b_"
+
+
+def test_lookup_codec_cached():
+    from usenc.encoders.escape import lookup_codec
+
+    assert lookup_codec("utf8") is lookup_codec("utf8")
+
+
+@pytest.mark.parametrize("charset", ["utf8", "latin1"])
+@pytest.mark.parametrize(
+    "encoder, text",
+    [
+        ("html", "caf&#eacute; &#lt;b&#gt; &#26085; ok é"),
+        ("unicode", "x\\u00E9 é \\u65E5\\u0041"),
+    ],
+)
+def test_decode_bytes_matches_str(monkeypatch, encoder, text, charset):
+    """Decoding on bytes gives the output of the str pipeline"""
+    from usenc.encoders import ENCODERS, escape
+
+    decode = ENCODERS[encoder].decode
+
+    def run():
+        try:
+            return decode(text.encode(charset), input_charset=charset, output_charset=charset)
+        except Exception as e:
+            # Positions in error messages are relative to the sequence on bytes
+            return type(e)
+
+    fast = run()
+    monkeypatch.setattr(escape, "byte_transparent", lambda *charsets: False)
+    assert fast == run()
@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.checksum import ChecksumEncoder
+from usenc.encoders.encoder import Encoder
+from usenc.encoders.fnv1 import Fnv1Encoder
+from usenc.encoders.fnv1a import Fnv1aEncoder
+
+# Reference values from the FNV test suite
+FNV_VECTORS = [
+    (Fnv1Encoder, 32, b"", b"811C9DC5"),
+    (Fnv1Encoder, 32, b"a", b"050C5D7E"),
+    (Fnv1Encoder, 32, b"foobar", b"31F0B262"),
+    (Fnv1aEncoder, 32, b"a", b"E40C292C"),
+    (Fnv1aEncoder, 32, b"foobar", b"BF9CF968"),
+    (Fnv1Encoder, 64, b"", b"CBF29CE484222325"),
+    (Fnv1Encoder, 64, b"a", b"AF63BD4C8601B7BE"),
+    (Fnv1Encoder, 64, b"foobar", b"340D8765A4DDA9C2"),
+    (Fnv1aEncoder, 64, b"a", b"AF63DC4C8601EC8C"),
+    (Fnv1aEncoder, 64, b"foobar", b"85944171F73967E8"),
+]
+
+
+def _reference(data: bytes, bits: int, xor_first: bool) -> int:
+    h, prime = (0x811C9DC5, 0x01000193) if bits == 32 else (0xCBF29CE484222325, 0x100000001B3)
+    for byte in data:
+        h = ((h ^ byte) * prime if xor_first else (h * prime) ^ byte) % (1 << bits)
+    return h
+
+
+@pytest.mark.parametrize("encoder,bits,text,expected", FNV_VECTORS)
+def test_fnv_vectors(encoder, bits, text, expected):
+    """Test reference values of FNV-1 and FNV-1a"""
+    assert encoder.encode(text, bits=bits) == expected
+
+
+@pytest.mark.parametrize("size", [7, 32, 33, 64, 1000, 1003])
+@pytest.mark.parametrize("algorithm", ["fnv1-32", "fnv1-64", "fnv1a-32", "fnv1a-64"])
+def test_fnv_word_loop(algorithm, size):
+    """Test that the 8-byte unrolled loop matches the byte by byte definition"""
+    data = bytes(range(256)) * 4
+    data = data[:size]
+    bits = int(algorithm.rsplit("-", 1)[1])
+    expected = _reference(data, bits, algorithm.startswith("fnv1a"))
+    assert ChecksumEncoder.encode(data, algorithm=algorithm, decimal=True) == str(expected).encode()
+
+
+def test_fnv_default_bits():
+    """Test that FNV encoders default to 32 bits"""
+    assert Fnv1aEncoder.encode(b"hello world") == b"D58B3FA7"
+    assert Fnv1Encoder.encode(b"hello world") == b"548DA96F"
+
+
+def test_fnv_stream():
+    """Test that streaming computes the same hash as encoding the whole input"""
+    data = b"hello world" * 100
+    chunks = [data[i : i + 37] for i in range(0, len(data), 37)]
+    assert b"".join(Fnv1aEncoder.encode_stream(chunks, bits=64)) == Fnv1aEncoder.encode(
+        data, bits=64
+    )
+
+
+def test_fnv_batch():
+    """Test that batch mode gives the same results as encoding each input"""
+    texts = [b"", b"a", b"hello world", b"x" * 100]
+    assert Fnv1Encoder.encode_batch(texts, bits=64, lowercase=True) == [
+        Fnv1Encoder.encode(text, bits=64, lowercase=True) for text in texts
+    ]
+    assert Fnv1aEncoder.encode_batch(texts) == [Fnv1aEncoder.encode(text) for text in texts]
+
+
+def test_encoder_default_batch():
+    """Test the default batch implementation of the base Encoder"""
+
+    class UpperEncoder(Encoder):
+        @classmethod
+        def encode(cls, text: bytes, **kwargs) -> bytes:
+            return text.upper()
+
+        @classmethod
+        def decode(cls, text: bytes, **kwargs) -> bytes:
+            return text.lower()
+
+    assert UpperEncoder.encode_batch([b"a", b"b"]) == [b"A", b"B"]
+    assert UpperEncoder.decode_batch([b"A", b"B"]) == [b"a", b"b"]
@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.base36 import Base36Encoder
+from usenc.encoders.base58 import Base58Encoder
+from usenc.encoders.base62 import Base62Encoder
+from usenc.encoders.encoder import DecodeError, EncodeError
+from usenc.encoders.genericbase import GenericBaseEncoder
+
+
+def _reference(text: bytes, encoder) -> bytes:
+    """Plain repeated divmod conversion"""
+    n = int.from_bytes(text, "big")
+    digits = b""
+    while n:
+        n, digit = divmod(n, encoder.base)
+        digits = encoder.alphabet[digit : digit + 1] + digits
+    return digits
+
+
+def test_base58_vectors():
+    """Test reference values of the bitcoin base58 encoding"""
+    assert Base58Encoder.encode(b"Hello World!") == b"2NEpo7TZRRrLZSi2U"
+    assert Base58Encoder.encode(bytes.fromhex("0000287fb4cd")) == b"11233QC4"
+    assert Base58Encoder.decode(b"11233QC4") == bytes.fromhex("0000287fb4cd")
+
+
+def test_leading_zeros():
+    """Test that each leading zero byte is kept as one leading zero digit"""
+    assert Base58Encoder.encode(b"\x00") == b"1"
+    assert Base58Encoder.encode(b"\x00\x00\x01") == b"112"
+    assert Base62Encoder.encode(b"\x00\x00") == b"00"
+    assert Base36Encoder.decode(b"00") == b"\x00\x00"
+    assert Base58Encoder.encode(b"") == b""
+    assert Base58Encoder.decode(b"") == b""
+
+
+@pytest.mark.parametrize("encoder", [Base36Encoder, Base58Encoder, Base62Encoder])
+@pytest.mark.parametrize("size", [200, 255, 1000, 5000])
+def test_large_input(encoder, size):
+    """Test that the divide and conquer conversion matches the plain conversion"""
+    text = bytes((i * 167 + 13) % 256 for i in range(size))
+    encoded = encoder.encode(text)
+    assert encoded == _reference(text, encoder)
+    assert encoder.decode(encoded) == text
+
+
+def test_named_alphabet():
+    assert Base36Encoder.encode(b"hello", alphabet="lower") == b"5pzcszu7"
+    assert (
+        Base58Encoder.decode(Base58Encoder.encode(b"hi", alphabet="ripple"), alphabet="ripple")
+        == b"hi"
+    )
+
+
+def test_custom_alphabet():
+    alphabet = "zyxwvutsrqponmlkjihgfedcba9876543210"
+    encoded = Base36Encoder.encode(b"hello", alphabet=alphabet)
+    assert Base36Encoder.decode(encoded, alphabet=alphabet) == b"hello"
+
+
+def test_invalid_character():
+    with pytest.raises(DecodeError, match=r"Invalid character '0' \(0x30\) for Base58Encoder"):
+        Base58Encoder.decode(b"2NEpo70")
+
+
+def test_non_ascii_alphabet():
+    with pytest.raises(EncodeError, match=r"Alphabet must be ASCII"):
+        Base36Encoder.encode(b"test", alphabet="0123456789abcdefghijklmnopqrstuvwxyé")
+
+
+def test_wrong_alphabet_length():
+    with pytest.raises(EncodeError, match=r"alphabet length \(10\) must equal the base \(58\)"):
+        Base58Encoder.encode(b"test", alphabet="0123456789")
+
+
+def test_duplicate_alphabet_characters():
+    with pytest.raises(EncodeError, match=r"alphabet characters must be unique"):
+        Base36Encoder.encode(b"test", alphabet="0" * 36)
+
+
+def test_generic_base_default():
+    """Test the base class on its own (decimal)"""
+    assert GenericBaseEncoder.encode(b"\x01\x00") == b"256"
+    assert GenericBaseEncoder.decode(b"256") == b"\x01\x00"
@@ -24,3 +24,11 @@ def test_hash_cannot_decode():
     """Test that hash encoders cannot decode"""
     with pytest.raises(DecodeError, match="hash functions cannot be decoded"):
         HashEncoder.decode(b"e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855")
+
+
+def test_hash_stream():
+    """Test that hashing chunks incrementally matches hashing the whole input"""
+    chunks = [b"hello", b" ", b"world"]
+    assert list(HashEncoder.encode_stream(chunks, algorithm="md5")) == [
+        HashEncoder.encode(b"hello world", algorithm="md5")
+    ]
@@ -22,3 +22,29 @@ def test_decode_invalid_character():
 
     with pytest.raises(DecodeError, match="output-charset 'ascii' encoding failed"):
         HexEncoder.decode(b"h\xc3\xa9llo", output_charset="ascii")
+
+
+@pytest.mark.parametrize("encoder", ["hex", "url", "cstring"])
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"include": "/é", "exclude": "%"},
+        {"lowercase": True, "prefix": "<", "suffix": ">"},
+        {"input_charset": "latin1", "output_charset": "latin1"},
+    ],
+)
+def test_byte_path_matches_text_path(encoder, params, monkeypatch):
+    from usenc.encoders import ENCODERS
+
+    cls = ENCODERS[encoder]
+    text = "héllo wörld/%?\x00".encode(params.get("input_charset", "utf8"))
+    fast = cls.encode(text, **params)
+
+    monkeypatch.setattr(cls, "byte_table", classmethod(lambda cls, *args, **kwargs: None))
+    assert fast == cls.encode(text, **params)
+
+
+def test_decode_prefix_suffix():
+    assert HexEncoder.decode(b"<68><c3><a9>!", prefix="<", suffix=">") == "hé!".encode()
+    assert HexEncoder.decode("é68é69".encode(), prefix="é") == b"hi"
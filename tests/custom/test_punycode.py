@@ -0,0 +1,88 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.encoder import DecodeError, EncodeError
+from usenc.encoders.punycode import LABEL_CACHE_SIZE, PunycodeEncoder, decode_label, encode_label
+
+# Reference values from RFC 3492 and the IDNA test suites
+PUNYCODE_VECTORS = [
+    ("bücher.example", b"xn--bcher-kva.example"),
+    ("münchen.de", b"xn--mnchen-3ya.de"),
+    ("例え.テスト", b"xn--r8jz45g.xn--zckzah"),
+    ("пример.рф", b"xn--e1afmkfd.xn--p1ai"),
+    ("ليهمابتكلموشعربي؟", b"xn--egbpdaj6bu4bxfgehfvwxn"),
+]
+
+
+@pytest.mark.parametrize("text,expected", PUNYCODE_VECTORS)
+def test_punycode_vectors(text, expected):
+    """Test reference values, in both directions"""
+    assert PunycodeEncoder.encode(text.encode()) == expected
+    assert PunycodeEncoder.decode(expected) == text.encode()
+
+
+def test_case_preserved():
+    """Without --idna, labels are encoded as is"""
+    assert PunycodeEncoder.encode("München.DE".encode()) == b"xn--Mnchen-3ya.DE"
+    assert PunycodeEncoder.encode("München.DE".encode(), idna=True) == b"xn--mnchen-3ya.DE"
+
+
+def test_idna_separators():
+    """Ideographic full stops separate labels with --idna only"""
+    assert PunycodeEncoder.encode("例え。jp".encode(), idna=True) == b"xn--r8jz45g.jp"
+    assert PunycodeEncoder.encode("例え。jp".encode()) == b"xn--" + "例え。jp".encode("punycode")
+
+
+def test_ascii_labels_skip_codec():
+    """ASCII labels and inputs without ACE labels never reach the label codecs"""
+    encode_label.cache_clear()
+    decode_label.cache_clear()
+    assert PunycodeEncoder.encode(b"www.example.com") == b"www.example.com"
+    assert PunycodeEncoder.encode("www.bücher.com".encode()) == b"www.xn--bcher-kva.com"
+    assert PunycodeEncoder.decode(b"www.example.com") == b"www.example.com"
+    assert encode_label.cache_info().currsize == 1
+    assert decode_label.cache_info().currsize == 0
+
+
+def test_label_cache():
+    """Repeated labels are encoded once, and the cache is bounded"""
+    encode_label.cache_clear()
+    for _ in range(3):
+        PunycodeEncoder.encode("bücher.example".encode())
+        PunycodeEncoder.encode("shop.bücher.example".encode())
+    info = encode_label.cache_info()
+    assert (info.hits, info.misses) == (5, 1)
+    assert info.maxsize == LABEL_CACHE_SIZE
+
+
+def test_charsets():
+    """Labels are read with the input charset"""
+    assert PunycodeEncoder.encode("bücher.de".encode("latin1"), input_charset="latin1") == (
+        b"xn--bcher-kva.de"
+    )
+    assert PunycodeEncoder.decode(b"xn--bcher-kva.de", output_charset="latin1") == (
+        "bücher.de".encode("latin1")
+    )
+    assert PunycodeEncoder.encode("bücher".encode("utf-16"), input_charset="utf-16") == (
+        b"xn--bcher-kva"
+    )
+
+
+def test_decode_prefix_case():
+    """The ACE prefix is case insensitive"""
+    assert PunycodeEncoder.decode(b"XN--bcher-kva.de") == "bücher.de".encode()
+
+
+def test_errors():
+    """Invalid labels raise codec errors"""
+    with pytest.raises(DecodeError):
+        PunycodeEncoder.decode(b"xn--bcher-\xff.de")
+    with pytest.raises(DecodeError):
+        PunycodeEncoder.decode(b"xn--zz-.de", idna=True)
+    with pytest.raises(EncodeError):
+        PunycodeEncoder.encode(("ü" * 64).encode(), idna=True)
+    with pytest.raises(EncodeError):
+        PunycodeEncoder.encode(b"b\xfccher")
@@ -0,0 +1,90 @@
+import sys
+import unicodedata
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders.encoder import DecodeError, EncodeError
+from usenc.encoders.width import FullwidthEncoder, HalfwidthEncoder
+
+ASCII = bytes(range(0x20, 0x7F))
+
+
+@pytest.mark.parametrize(
+    "half,full",
+    [
+        ("hello world", "ｈｅｌｌｏ　ｗｏｒｌｄ"),
+        ("¥1000 ¢£¬", "￥１０００　￠￡￢"),
+        ("ﾊﾟｿｺﾝ ﾃﾞｰﾀ", "パソコン　データ"),
+        ("ｳﾞｧｲｵﾘﾝ", "ヴァイオリン"),
+        ("｡｢ﾃｽﾄ｣､", "。「テスト」、"),
+        ("ﾡﾤﾾ", "ㄱㄴㅎ"),
+        ("￩￪￭", "←↑■"),
+    ],
+)
+def test_conversions(half, full):
+    assert FullwidthEncoder.encode(half.encode()) == full.encode()
+    assert HalfwidthEncoder.encode(full.encode()) == half.encode()
+    assert FullwidthEncoder.decode(full.encode()) == half.encode()
+    assert HalfwidthEncoder.decode(half.encode()) == full.encode()
+
+
+def test_ascii_roundtrip():
+    assert HalfwidthEncoder.encode(FullwidthEncoder.encode(ASCII)) == ASCII
+    assert HalfwidthEncoder.encode(ASCII) == ASCII
+
+
+def test_fullwidth_matches_nfkc():
+    """Test that half width forms are what NFKC normalization gives for fullwidth ASCII"""
+    wide = FullwidthEncoder.encode(ASCII).decode()
+    assert unicodedata.normalize("NFKC", wide) == ASCII.decode()
+
+
+def test_sound_marks():
+    """Test that sound marks which can not be composed are converted alone"""
+    assert FullwidthEncoder.encode("ｱﾞﾟ".encode()) == "ア゛゜".encode()
+    assert HalfwidthEncoder.encode("ア゛゙".encode()) == "ｱﾞﾞ".encode()
+
+
+def test_other_characters_unchanged():
+    text = "日本語 ひらがな € 🚀".encode()
+    assert HalfwidthEncoder.encode(text) == text
+    assert FullwidthEncoder.encode(text) == "日本語　ひらがな　€　🚀".encode()
+
+
+@pytest.mark.parametrize(
+    "include,exclude,expected",
+    [
+        ("abc", "", "ａｂｃxyz ﾊﾟ"),
+        ("", "ascii", "abcxyz パ"),
+        ("all", "xyz ", "ａｂｃxyz パ"),
+        # The pair is only composed when both characters are converted
+        ("", "ﾟ", "ａｂｃｘｙｚ　ハﾟ"),
+    ],
+)
+def test_include_exclude(include, exclude, expected):
+    encoded = FullwidthEncoder.encode("abcxyz ﾊﾟ".encode(), include=include, exclude=exclude)
+    assert encoded == expected.encode()
+
+
+def test_charsets():
+    text = "ｈｉ".encode("utf-16")
+    assert HalfwidthEncoder.encode(text, input_charset="utf-16") == b"hi"
+    assert FullwidthEncoder.encode(b"hi", output_charset="utf-16-le") == "ｈｉ".encode("utf-16-le")
+
+
+def test_errors():
+    with pytest.raises(EncodeError, match="input-charset"):
+        FullwidthEncoder.encode(b"\xff")
+    with pytest.raises(DecodeError, match="output-charset"):
+        FullwidthEncoder.decode("ｈｉ　あ".encode(), output_charset="ascii")
+    with pytest.raises(EncodeError, match="include or exclude"):
+        FullwidthEncoder.encode(b"hi", include="\\x4")
+
+
+def test_split_alignment():
+    assert HalfwidthEncoder.split_alignment() == 1
+    assert FullwidthEncoder.split_alignment(is_decoding=True) == 1
+    assert FullwidthEncoder.split_alignment() == 0
+    assert HalfwidthEncoder.split_alignment(input_charset="utf-16") == 0
@@ -0,0 +1,121 @@
+"""
+Check that the NumPy backend gives the same results as the pure Python path
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import accel
+from usenc.encoders import ENCODERS
+from usenc.encoders.encoder import DecodeError, EncodeError
+
+pytestmark = pytest.mark.skipif(not accel.HAS_NUMPY, reason="NumPy is not available")
+
+SAMPLE = bytes((i * 167 + 13) % 256 for i in range(1000))
+TEXT = "héllo wörld € ".encode() * 40
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    """Switch between the pure Python path and the NumPy backend (for any size)"""
+
+    def select(numpy: bool):
+        monkeypatch.setattr(accel, "NUMPY_MIN_SIZE", 0 if numpy else 1 << 62)
+
+    return select
+
+
+class TestBase2N:
+    """NumPy backend of power-of-two bases"""
+
+    @pytest.mark.parametrize(
+        "encoder,params",
+        [
+            ("base16", {}),
+            ("base16", {"alphabet": "lower"}),
+            ("base32", {}),
+            ("base32", {"alphabet": "z", "no_padding": True}),
+            ("base64", {}),
+            ("base64", {"alphabet": "url", "padding": "*"}),
+        ],
+    )
+    @pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 7, 999, 1000])
+    def test_same_result(self, backend, encoder, params, size):
+        encoder_class = ENCODERS[encoder]
+        backend(False)
+        expected = encoder_class.encode(SAMPLE[:size], **params)
+        backend(True)
+        encoded = encoder_class.encode(SAMPLE[:size], **params)
+        assert encoded == expected
+        assert encoder_class.decode(encoded, **params) == SAMPLE[:size]
+
+    def test_invalid_character(self, backend):
+        """Invalid input falls back to the pure Python path for error reporting"""
+        backend(True)
+        with pytest.raises(DecodeError, match=r"Invalid character '!' \(0x21\)"):
+            ENCODERS["base64"].decode(b"aGVsbG8!" * 100)
+
+
+class TestHex:
+    """NumPy backend of the hex encoder"""
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"lowercase": True},
+            {"prefix": "\\x"},
+            {"prefix": "0x", "suffix": ", "},
+            {"input_charset": "latin1", "output_charset": "latin1"},
+        ],
+    )
+    def test_same_result(self, backend, params):
+        hex_encoder = ENCODERS["hex"]
+        backend(False)
+        expected = hex_encoder.encode(TEXT, **params)
+        backend(True)
+        assert hex_encoder.encode(TEXT, **params) == expected
+
+    def test_charset_error(self, backend):
+        backend(True)
+        with pytest.raises(EncodeError, match="input-charset 'utf8' decoding failed"):
+            ENCODERS["hex"].encode(b"\xff" * 10)
+
+    @pytest.mark.parametrize("encoder", ["url", "cstring"])
+    def test_subclass_character_class(self, backend, encoder):
+        """Subclasses only encode some characters, the NumPy backend must not be used"""
+        backend(False)
+        expected = ENCODERS[encoder].encode(TEXT)
+        backend(True)
+        assert ENCODERS[encoder].encode(TEXT) == expected
+
+    def test_charset_conversion_not_accelerated(self, backend, monkeypatch):
+        """Different charsets change the bytes, the NumPy backend must not be used"""
+        backend(True)
+        monkeypatch.setattr(accel, "hex_encode", None)
+        text = "é".encode("latin1")
+        assert ENCODERS["hex"].encode(text, input_charset="latin1") == b"C3A9"
+
+
+def test_use_numpy(monkeypatch):
+    assert not accel.use_numpy(accel.NUMPY_MIN_SIZE - 1)
+    assert accel.use_numpy(accel.NUMPY_MIN_SIZE)
+    assert not accel.use_numpy(accel.NUMPY_MIN_SIZE, factor=2)
+    monkeypatch.setattr(accel, "HAS_NUMPY", False)
+    assert not accel.use_numpy(1 << 30)
+
+
+def test_numpy_imported_lazily():
+    """NumPy is only imported by the first large input, not by `import usenc.cli`"""
+    src = str(Path(__file__).parent.parent / "src")
+    code = (
+        f"import sys; sys.path.insert(0, {src!r}); import usenc.cli; "
+        "assert 'numpy' not in sys.modules; "
+        "from usenc import encode; encode(bytes(1000), 'base64'); "
+        "assert 'numpy' in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
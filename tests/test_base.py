@@ -8,7 +8,8 @@ from pathlib import Path
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-from usenc.encoders.encoder import Encoder
+from usenc.encoders import ENCODERS
+from usenc.encoders.encoder import Capabilities, Encoder
 
 
 class TestBaseEncoder:
@@ -23,3 +24,51 @@ class TestBaseEncoder:
         """Test that base Encoder.decode raises NotImplementedError"""
         with pytest.raises(NotImplementedError):
             Encoder.decode(b"hello, world!")
+
+
+class TestCapabilities:
+    """Tests for the capabilities reported by encoders"""
+
+    def test_defaults(self):
+        assert Encoder.capabilities() == Capabilities(
+            output_ratio=None,
+            byte_oriented=True,
+            charset_sensitive=False,
+            reversible=True,
+            stateless=True,
+            streamable=False,
+            batched=False,
+            split_alignment=0,
+        )
+
+    @pytest.mark.parametrize("name", ENCODERS.keys())
+    def test_every_encoder(self, name):
+        """Capabilities are available for every encoder, in both directions"""
+        for is_decoding in (False, True):
+            capabilities = ENCODERS[name].capabilities(is_decoding)
+            assert capabilities.split_alignment >= 0
+            assert capabilities.output_ratio is None or capabilities.output_ratio > 0
+
+    def test_output_ratio(self):
+        assert ENCODERS["base64"].capabilities().output_ratio == pytest.approx(4 / 3)
+        assert ENCODERS["base64"].capabilities(True).output_ratio == pytest.approx(3 / 4)
+        assert ENCODERS["base85"].capabilities().output_ratio == 1.25
+        assert ENCODERS["base58"].capabilities().output_ratio is None
+
+    def test_charset_sensitive(self):
+        url = ENCODERS["url"].capabilities()
+        assert url.charset_sensitive and not url.byte_oriented
+        assert url.split_alignment == 1
+        assert ENCODERS["url"].capabilities(input_charset="utf-16").split_alignment == 0
+
+    def test_reversible(self):
+        assert not ENCODERS["sha256"].capabilities().reversible
+        assert not ENCODERS["crc32"].capabilities().reversible
+        assert ENCODERS["base64"].capabilities().reversible
+
+    def test_overridden_methods(self):
+        """Streaming and batch support are detected from overridden methods"""
+        assert ENCODERS["sha256"].capabilities().streamable
+        assert ENCODERS["fnv1a"].capabilities().batched
+        assert not ENCODERS["url"].capabilities().streamable
+        assert not ENCODERS["url"].capabilities().batched
@@ -0,0 +1,102 @@
+"""
+Check the codec results cache
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import prepare
+from usenc.cache import CodecCache
+
+
+class TestCodecCache:
+    """Tests for the CodecCache class"""
+
+    def test_hits_and_misses(self):
+        cache = CodecCache(10)
+        codec = prepare("url", cache=cache)
+
+        assert codec(b"a b") == b"a%20b"
+        assert codec(b"a b") == b"a%20b"
+        assert codec(b"c d") == b"c%20d"
+
+        assert cache.hits == 1
+        assert cache.misses == 2
+        assert cache.hit_rate == 1 / 3
+
+    def test_keyed_on_params(self):
+        cache = CodecCache(10)
+        lower = prepare("hex", cache=cache, lowercase=True)
+        upper = prepare("hex", cache=cache)
+        decoder = prepare("hex", True, cache=cache)
+
+        assert lower(b"\xc3\xa9") == b"c3a9"
+        assert upper(b"\xc3\xa9") == b"C3A9"
+        assert decoder(b"41") == b"A"
+        assert cache.misses == 3
+
+    def test_lru_eviction(self):
+        cache = CodecCache(2)
+        codec = prepare("url", cache=cache)
+
+        codec(b"a")
+        codec(b"b")
+        codec(b"a")
+        codec(b"c")  # evicts b
+
+        assert len(cache.data) == 2
+        codec(b"a")
+        assert cache.hits == 2
+        codec(b"b")
+        assert cache.misses == 4
+
+    def test_large_inputs_bypass(self):
+        cache = CodecCache(10, max_input_size=4)
+        codec = prepare("url", cache=cache)
+
+        assert codec(b"hello world") == b"hello%20world"
+        assert cache.hits + cache.misses == 0
+
+    def test_disabled_on_low_hit_rate(self):
+        cache = CodecCache(1000, probe_size=100)
+        codec = prepare("url", cache=cache)
+
+        for i in range(150):
+            assert codec(str(i).encode()) == str(i).encode()
+
+        assert not cache.enabled
+        assert len(cache.data) == 0
+        assert cache.misses == 100
+
+    def test_as_dict(self):
+        cache = CodecCache(10)
+        assert cache.as_dict() == {
+            "size": 0,
+            "maxsize": 10,
+            "hits": 0,
+            "misses": 0,
+            "hit_rate": 0.0,
+            "enabled": True,
+        }
+
+    def test_shared_between_threads(self):
+        cache = CodecCache(50)
+        codec = prepare("url", cache=cache)
+        texts = [f"a b {i % 80}".encode() for i in range(4000)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(codec, texts))
+
+        assert results == [text.replace(b" ", b"%20") for text in texts]
+        assert cache.hits + cache.misses == len(texts)
+        assert len(cache.data) == 50
+
+    def test_not_thread_safe(self):
+        cache = CodecCache(10, thread_safe=False)
+        codec = prepare("url", cache=cache)
+
+        assert cache.lock is None
+        assert [codec(b"a b"), codec(b"a b")] == [b"a%20b", b"a%20b"]
+        assert (cache.hits, cache.misses) == (1, 1)
@@ -2,8 +2,14 @@
 Comprehensive tests for the CLI module
 """
 
+import gzip
 import io
+import json
+import lzma
+import os
+import pstats
 import sys
+import threading
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -14,8 +20,14 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 import argparse
 
+from usenc import encode
 from usenc.cli import add_default_params, add_encoder_params, main, process_encoding, smart_open
 from usenc.encoders import ENCODERS
+from usenc.errors import ErrorPolicy
+from usenc.framing import Delimited, FixedSize, LengthPrefixed
+from usenc.output import VectoredWriter
+from usenc.server import ServerError, make_server
+from usenc.stats import Stats
 
 
 class TestSmartOpen:
@@ -63,6 +75,37 @@ class TestSmartOpen:
         assert not mock_stream.closed
         mock_stream.read()  # Should not raise
 
+    @pytest.mark.parametrize("compression", ["gzip", "bz2", "xz"])
+    def test_smart_open_compressed(self, tmp_path, compression):
+        """Test that compressed outputs are written and compressed inputs detected"""
+        test_file = tmp_path / "output"
+        data = b"line 1\nline 2\n" * 1000
+
+        with smart_open(test_file, "wb", io.BytesIO(), compression) as f:
+            f.write(data)
+
+        assert test_file.read_bytes() != data
+        with smart_open(test_file, "rb", io.BytesIO()) as f:
+            assert list(f) == data.splitlines(keepends=True)
+
+    def test_smart_open_flush_size(self, tmp_path):
+        """Test that outputs with a file descriptor are written with os.writev"""
+        test_file = tmp_path / "output.txt"
+
+        with smart_open(test_file, "wb", io.BytesIO(), flush_size=1 << 16) as f:
+            assert isinstance(f, VectoredWriter)
+            for i in range(1000):
+                f.write(b"line %d\n" % i)
+
+        assert test_file.read_bytes() == b"".join(b"line %d\n" % i for i in range(1000))
+
+    def test_smart_open_compressed_stdin(self, tmp_path):
+        """Test that a compressed default stream is detected"""
+        stream = io.BufferedReader(io.BytesIO(gzip.compress(b"hello")))
+
+        with smart_open(None, "rb", stream) as f:
+            assert f.read() == b"hello"
+
 
 class TestProcessEncoding:
     """Tests for the process_encoding function"""
@@ -133,6 +176,216 @@ class TestProcessEncoding:
         assert len(output_lines) == 1
         assert "line%201%0Aline%202%0Aline%203%0A" in output_lines[0]
 
+    def test_process_encoding_bulk_stream(self, tmp_path):
+        """Test that bulk mode streams the input in chunks"""
+        input_file = tmp_path / "input.bin"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"x" * 100)
+
+        with patch("usenc.cli.CHUNK_SIZE", 7):
+            stats = Stats("crc32")
+            process_encoding(input_file, output_file, False, True, {}, "crc32", {}, stats=stats)
+
+        assert output_file.read_bytes() == encode(b"x" * 100, "crc32")
+        assert stats.lines == 1
+        assert stats.bytes_in == 100
+
+    @pytest.mark.parametrize(
+        "encoder_name,is_decoding",
+        [("base64", False), ("url", False), ("url", True), ("crc32", False), ("base58", False)],
+    )
+    def test_process_encoding_long_lines(self, tmp_path, encoder_name, is_decoding):
+        """Test that lines longer than max_line_buffer give the same output as whole lines"""
+        input_file = tmp_path / "input.txt"
+        lines = [b"short", b"a b%20c/" * 40 + b"  ", b"", b"x" * 31, b"end  "]
+        input_file.write_bytes(b"\n".join(lines) + b"\n")
+
+        outputs = []
+        for max_line_buffer in (0, 16):
+            output_file = tmp_path / f"output{max_line_buffer}.txt"
+            process_encoding(
+                input_file,
+                output_file,
+                is_decoding,
+                False,
+                {},
+                encoder_name,
+                {},
+                max_line_buffer=max_line_buffer,
+            )
+            outputs.append(output_file.read_bytes())
+
+        assert outputs[1] == outputs[0]
+        assert len(outputs[0].splitlines()) == len(lines)
+
+    def test_process_encoding_long_line_decode_stream(self, tmp_path):
+        """Test that a long line is decoded through the streaming interface"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        data = bytes(range(256)) * 20
+        input_file.write_bytes(b"c2hvcnQ=\n" + encode(data, "base64") + b"\n")
+
+        process_encoding(input_file, output_file, True, False, {}, "base64", {}, max_line_buffer=64)
+
+        assert output_file.read_bytes() == b"short\n" + data + b"\n"
+
+    @pytest.mark.parametrize("encoder_name", ["base64", "crc32"])
+    def test_process_encoding_null_data(self, tmp_path, encoder_name):
+        """Test that NUL delimited records are encoded as they are"""
+        input_file = tmp_path / "input.bin"
+        output_file = tmp_path / "output.bin"
+        records = [b"a\nb ", b"", b"\xff\r\n"]
+        input_file.write_bytes(b"\0".join(records))
+
+        process_encoding(
+            input_file, output_file, False, False, {}, encoder_name, {}, framing=Delimited()
+        )
+
+        expected = b"".join(encode(record, encoder_name) + b"\0" for record in records)
+        assert output_file.read_bytes() == expected
+
+    def test_process_encoding_length_prefixed_roundtrip(self, tmp_path):
+        """Test that length-prefixed records go through a roundtrip"""
+        input_file = tmp_path / "input.bin"
+        encoded_file = tmp_path / "encoded.bin"
+        output_file = tmp_path / "output.bin"
+        data = LengthPrefixed("u32").join([b"a\nb", b"", bytes(range(256))])
+        input_file.write_bytes(data)
+
+        framing = LengthPrefixed("u32")
+        process_encoding(input_file, encoded_file, False, False, {}, "base64", {}, framing=framing)
+        process_encoding(encoded_file, output_file, True, False, {}, "base64", {}, framing=framing)
+
+        assert encoded_file.read_bytes().startswith(b"\0\0\0\x04YQpi\0\0\0\0")
+        assert output_file.read_bytes() == data
+
+    def test_process_encoding_record_size_errors(self, tmp_path):
+        """Test that the error policy applies to fixed size records"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(b"6869ZZ7A7A")
+
+        errors = ErrorPolicy("replace", b"??")
+        process_encoding(
+            input_file,
+            output_file,
+            True,
+            False,
+            {},
+            "base16",
+            {},
+            errors=errors,
+            framing=FixedSize(4),
+        )
+
+        assert output_file.read_bytes() == b"hi??z"
+        assert errors.errors == 1
+
+    @pytest.mark.parametrize("encoder_name", ["sha256", "crc32", "url"])
+    def test_process_encoding_threads(self, tmp_path, encoder_name):
+        """Test that batches processed on threads are written in order"""
+        input_file = tmp_path / "input.txt"
+        lines = [b"line %d " % i * (i % 7) for i in range(5000)]
+        lines[2500] = b"x" * 100
+        input_file.write_bytes(b"\n".join(lines) + b"\n")
+
+        outputs = []
+        for threads in (1, 3):
+            output_file = tmp_path / f"output{threads}.txt"
+            process_encoding(
+                input_file,
+                output_file,
+                False,
+                False,
+                {},
+                encoder_name,
+                {},
+                max_line_buffer=64,
+                threads=threads,
+            )
+            outputs.append(output_file.read_bytes())
+
+        assert outputs[1] == outputs[0]
+        assert len(outputs[0].splitlines()) == len(lines)
+
+    def test_process_encoding_threads_errors_and_cache(self, tmp_path):
+        """Test the error policy and the cache shared by the threads"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(b"aGk=\n!!\n" * 3000)
+
+        errors = ErrorPolicy("skip")
+        process_encoding(
+            input_file,
+            output_file,
+            True,
+            False,
+            {},
+            "base64",
+            {},
+            cache_size=10,
+            errors=errors,
+            threads=4,
+        )
+
+        assert output_file.read_bytes() == b"hi\n" * 3000
+        assert errors.errors == 3000
+
+    def test_process_encoding_threads_framing(self, tmp_path):
+        """Test framed records processed on threads"""
+        input_file = tmp_path / "input.bin"
+        output_file = tmp_path / "output.bin"
+        records = [bytes([i % 256]) * i for i in range(3000)]
+        input_file.write_bytes(LengthPrefixed("u16").join(records))
+
+        process_encoding(
+            input_file,
+            output_file,
+            False,
+            False,
+            {},
+            "md5",
+            {},
+            framing=LengthPrefixed("u16"),
+            threads=2,
+        )
+
+        expected = LengthPrefixed("u16").join([encode(record, "md5") for record in records])
+        assert output_file.read_bytes() == expected
+
+    @pytest.mark.parametrize(
+        "data,is_decoding,encoder_name,expected",
+        [
+            (b"BZh1 is a word\n", False, "url", b"BZh1%20is%20a%20word\n"),
+            (b"BZhlbG8=\n", True, "base64", b"\x05\x98elo\n"),
+        ],
+    )
+    def test_process_encoding_magic_prefix_text(
+        self, tmp_path, data, is_decoding, encoder_name, expected
+    ):
+        """Test that text starting with a compression magic is read as it is"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(data)
+
+        process_encoding(input_file, output_file, is_decoding, False, {}, encoder_name, {})
+
+        assert output_file.read_bytes() == expected
+
+    def test_process_encoding_no_decompress(self, tmp_path):
+        """Test that compressed inputs are read as they are without decompress"""
+        input_file = tmp_path / "input.gz"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(gzip.compress(b"hello\n"))
+
+        process_encoding(input_file, output_file, False, False, {}, "base64", {}, decompress=False)
+
+        lines = input_file.read_bytes().splitlines(keepends=True)
+        assert output_file.read_bytes() == b"".join(
+            encode(line.rstrip(), "base64") + b"\n" for line in lines
+        )
+
     def test_process_encoding_empty_file(self, tmp_path):
         """Test encoding an empty file"""
         input_file = tmp_path / "input.txt"
@@ -144,6 +397,200 @@ class TestProcessEncoding:
 
         assert output_file.read_bytes() == b""
 
+    def test_process_encoding_tsv_fields(self, tmp_path):
+        """Test encoding selected fields of a tsv file"""
+        input_file = tmp_path / "input.tsv"
+        output_file = tmp_path / "output.tsv"
+
+        input_file.write_bytes(b"a b\tc d\te f\n")
+
+        process_encoding(
+            input_file, output_file, False, False, {}, "url", {}, record_format="tsv", fields=[2]
+        )
+
+        assert output_file.read_bytes() == b"a b\tc d\te%20f\n"
+
+    def test_process_encoding_with_stats(self, tmp_path):
+        """Test that stats are collected when provided"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"line 1\nline 2\nline 3\n")
+
+        stats = Stats("url")
+        process_encoding(input_file, output_file, False, False, {}, "url", {}, stats=stats)
+
+        assert stats.lines == 3
+        assert stats.bytes_in == 21
+        assert stats.bytes_out == len(output_file.read_bytes())
+
+    @pytest.mark.parametrize(
+        "record_format,data,options,records,calls",
+        [
+            # The empty line is a record with a single field
+            ("tsv", b"a b\tc d\n\ne f\tg\n", {"fields": [0, 1]}, 3, 5),
+            # A quoted field can span several lines
+            ("csv", b'a b,c d\n"e\nf",g\n', {"fields": [0, 1]}, 2, 4),
+            # Blank lines are not records
+            ("jsonl", b'{"a":"x","b":"y"}\n\n{"a":"z","b":"w"}\n', {"keys": [["a"], ["b"]]}, 2, 4),
+        ],
+    )
+    def test_process_encoding_stats_fields(
+        self, tmp_path, record_format, data, options, records, calls
+    ):
+        """Test that stats count records, not codec calls, with several fields per record"""
+        input_file = tmp_path / "input"
+        output_file = tmp_path / "output"
+
+        input_file.write_bytes(data)
+
+        stats = Stats("url")
+        process_encoding(
+            input_file,
+            output_file,
+            False,
+            False,
+            {},
+            "url",
+            {},
+            stats=stats,
+            record_format=record_format,
+            **options,
+        )
+
+        assert stats.lines == records
+        assert stats.calls == calls
+        assert stats.as_dict()["lines"] == records
+
+    def test_process_encoding_with_cache(self, tmp_path):
+        """Test that repeated lines are served from the cache"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"a b\nc d\na b\na b\n")
+
+        stats = Stats("url")
+        process_encoding(
+            input_file, output_file, False, False, {}, "url", {}, stats=stats, cache_size=10
+        )
+
+        assert output_file.read_bytes() == b"a%20b\nc%20d\na%20b\na%20b\n"
+        assert stats.cache is not None
+        assert stats.cache.hits == 2
+        assert stats.cache.misses == 2
+        assert "cache:       2 hits, 2 misses (50.0%)" in stats.format_text()
+
+    def test_process_encoding_on_error(self, tmp_path):
+        """Test that failed lines are counted in the stats with an error policy"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"aGk=\n!!\naGk=\n")
+
+        stats = Stats("base64", True)
+        errors = ErrorPolicy("skip")
+        process_encoding(
+            input_file, output_file, True, False, {}, "base64", {}, stats=stats, errors=errors
+        )
+
+        assert output_file.read_bytes() == b"hi\nhi\n"
+        assert stats.lines == 3
+        assert errors.errors == 1
+        assert "errors:      1 (skip)" in stats.format_text()
+
+    def test_process_encoding_bulk_jobs(self, tmp_path, monkeypatch):
+        """Test that a bulk input split between workers gives the serial output"""
+        monkeypatch.setattr("usenc.parallel.MIN_PART_SIZE", 64)
+        input_file = tmp_path / "input.bin"
+        output_file = tmp_path / "output.txt"
+
+        data = bytes(range(256)) * 20
+        input_file.write_bytes(data)
+
+        stats = Stats("base64")
+        process_encoding(
+            input_file, output_file, False, True, {}, "base64", {}, stats=stats, jobs=3
+        )
+
+        assert output_file.read_bytes() == encode(data, "base64")
+        assert stats.bytes_in == len(data)
+        assert stats.bytes_out == len(output_file.read_bytes())
+
+    def test_process_encoding_batch(self, tmp_path, monkeypatch):
+        """Test that encoders with a batch implementation process lines in batches"""
+        monkeypatch.setattr("usenc.cli.BATCH_SIZE", 3)
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"alice\nbob\n" * 5)
+
+        process_encoding(input_file, output_file, False, False, {}, "fnv1a", {})
+
+        assert output_file.read_bytes() == b"872213E7\n86C6A0D4\n" * 5
+
+    def test_process_encoding_split(self, tmp_path, monkeypatch):
+        """Test that a bulk input read in unaligned chunks gives the same output"""
+        monkeypatch.setattr("usenc.cli.CHUNK_SIZE", 7)
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        data = "héllo wörld € 😀\n".encode() * 20
+        input_file.write_bytes(data)
+
+        stats = Stats("url")
+        process_encoding(input_file, output_file, False, True, {}, "url", {}, stats=stats)
+
+        assert output_file.read_bytes() == encode(data, "url")
+        assert stats.strategy == "split"
+
+    def test_process_encoding_compressed(self, tmp_path, monkeypatch):
+        """Test that compressed inputs are decompressed, also with --jobs"""
+        monkeypatch.setattr("usenc.parallel.MIN_PART_SIZE", 64)
+        input_file = tmp_path / "input.gz"
+        output_file = tmp_path / "output.txt.xz"
+
+        data = bytes(range(256)) * 20
+        input_file.write_bytes(gzip.compress(data))
+
+        process_encoding(
+            input_file,
+            output_file,
+            False,
+            True,
+            {},
+            "base64",
+            {},
+            jobs=3,
+            output_compress="xz",
+            decompress=True,
+        )
+
+        assert lzma.decompress(output_file.read_bytes()) == encode(data, "base64")
+
+    def test_process_encoding_compressed_bulk(self, tmp_path):
+        """Test that bulk mode works on the bytes of a compressed file unless asked to decompress"""
+        input_file = tmp_path / "input.gz"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(gzip.compress(b"hello\n"))
+
+        process_encoding(input_file, output_file, False, True, {}, "sha256", {})
+        assert output_file.read_bytes() == encode(input_file.read_bytes(), "sha256")
+
+        # Line mode still decompresses
+        process_encoding(input_file, output_file, False, False, {}, "base64", {})
+        assert output_file.read_bytes() == b"aGVsbG8=\n"
+
+    def test_process_encoding_bulk_jobs_unsplittable(self, tmp_path):
+        """Test that encoders whose input can not be split fall back to serial processing"""
+        input_file = tmp_path / "input.bin"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"hello world")
+
+        process_encoding(input_file, output_file, False, True, {}, "base58", {}, jobs=3)
+
+        assert output_file.read_bytes() == encode(b"hello world", "base58")
+
 
 class TestAddEncoderParams:
     """Tests for the add_encoder_params function"""
@@ -354,6 +801,126 @@ class TestMain:
         output = mock_stdout.getvalue().decode("utf-8")
         assert "hello%20world" in output
 
+    def test_main_stdout_pipe(self, tmp_path):
+        """Test writing to a pipe on stdout, through the vectored output layer"""
+        input_file = tmp_path / "input.txt"
+        input_file.write_bytes(b"a b\n" * 10000)
+
+        read_fd, write_fd = os.pipe()
+        received = []
+        reader = threading.Thread(target=lambda: received.append(io.FileIO(read_fd).readall()))
+        reader.start()
+        with io.FileIO(write_fd, "wb") as pipe:
+            stdout = MagicMock()
+            stdout.buffer = io.BufferedWriter(pipe)
+            argv = ["usenc", "url", "-i", str(input_file), "--flush-size", "1000"]
+            with patch("sys.argv", argv), patch("sys.stdout", stdout):
+                main()
+        reader.join()
+
+        assert received == [b"a%20b\n" * 10000]
+
+    def test_main_flush_size_negative(self, capsys):
+        """Test that --flush-size can not be negative"""
+        with patch("sys.argv", ["usenc", "url", "--flush-size", "-1"]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert "--flush-size must be positive" in capsys.readouterr().err
+
+    def test_main_max_line_buffer_negative(self, capsys):
+        """Test that --max-line-buffer can not be negative"""
+        with patch("sys.argv", ["usenc", "url", "--max-line-buffer", "-1"]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert "--max-line-buffer must be positive" in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "options,message",
+        [
+            (["base58"], "can not bound the memory of the base58 encoder"),
+            (["hex", "-d"], "can not bound the memory of the hex decoder"),
+            (["url", "--connect", "/tmp/usenc.sock"], "can not be used with --connect"),
+        ],
+    )
+    def test_main_max_line_buffer_unbounded(self, capsys, options, message):
+        """Test that --max-line-buffer is rejected where long lines are read whole anyway"""
+        with patch("sys.argv", ["usenc", *options, "--max-line-buffer", "64"]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert message in capsys.readouterr().err
+
+    def test_main_max_line_buffer_unbounded_default(self, tmp_path):
+        """Test that encoders which need whole lines still run with the default and with 0"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(b"hello\n")
+
+        for options in ([], ["--max-line-buffer", "0"]):
+            argv = ["usenc", "base58", "-i", str(input_file), "-o", str(output_file), *options]
+            with patch("sys.argv", argv):
+                main()
+            assert output_file.read_bytes() == encode(b"hello", "base58") + b"\n"
+
+    @pytest.mark.parametrize(
+        "options,message",
+        [
+            (["-z", "--record-size", "4"], "not allowed with argument"),
+            (["--record-size", "-1"], "--record-size must be positive"),
+            (["--length-prefixed", "u16", "--bulk"], "can not be used with --bulk"),
+            (["-z", "--format", "jsonl", "--keys", "a"], "can not be used with --format jsonl"),
+        ],
+    )
+    def test_main_framing_invalid(self, capsys, options, message):
+        """Test the validation of the record framing options"""
+        with patch("sys.argv", ["usenc", "base64", *options]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert message in capsys.readouterr().err
+
+    @pytest.mark.parametrize(
+        "options,message",
+        [
+            (["--threads", "-1"], "--threads must be positive"),
+            (["--threads", "2", "--bulk"], "--threads can not be used with --bulk"),
+            (["--threads", "2", "--format", "jsonl", "--keys", "a"], "with --format jsonl"),
+            (["--threads", "2", "--connect", "/tmp/x.sock"], "with --connect"),
+            (["--threads", "2", "--stats"], "with --stats"),
+        ],
+    )
+    def test_main_threads_invalid(self, capsys, options, message):
+        """Test the validation of --threads"""
+        with patch("sys.argv", ["usenc", "sha256", *options]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert message in capsys.readouterr().err
+
+    def test_main_null_data(self, tmp_path):
+        """Test NUL delimited records from the command line"""
+        input_file = tmp_path / "input.bin"
+        output_file = tmp_path / "output.bin"
+        input_file.write_bytes(b"a b\0c\nd\0")
+
+        argv = ["usenc", "url", "-z", "-i", str(input_file), "-o", str(output_file)]
+        with patch("sys.argv", argv):
+            main()
+
+        assert output_file.read_bytes() == b"a%20b\0c%0Ad\0"
+
     def test_main_multiple_lines(self, tmp_path):
         """Test processing multiple lines"""
         input_file = tmp_path / "input.txt"
@@ -369,6 +936,294 @@ class TestMain:
         output_lines = output_file.read_bytes()
         assert output_lines == lines
 
+    def test_main_stats(self, tmp_path, capsys):
+        """Test that --stats prints a report to stderr"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"hello world\n")
+
+        with patch(
+            "sys.argv",
+            ["usenc", "url", "--stats", "json", "-i", str(input_file), "-o", str(output_file)],
+        ):
+            main()
+
+        captured = capsys.readouterr()
+        report = json.loads(captured.err)
+        assert report["lines"] == 1
+        assert report["bytes_in"] == 12
+        assert output_file.read_bytes() == b"hello%20world\n"
+
+    def test_main_jsonl_keys(self, tmp_path):
+        """Test encoding selected keys of a jsonl file"""
+        input_file = tmp_path / "input.jsonl"
+        output_file = tmp_path / "output.jsonl"
+
+        input_file.write_bytes(b'{"user": {"email": "a@b.c"}}\n')
+
+        with patch(
+            "sys.argv",
+            [
+                "usenc",
+                "md5",
+                "--lowercase",
+                "--format",
+                "jsonl",
+                "--keys",
+                "user.email",
+                "-i",
+                str(input_file),
+                "-o",
+                str(output_file),
+            ],
+        ):
+            main()
+
+        assert json.loads(output_file.read_bytes()) == {
+            "user": {"email": "5d60d4e28066df254d5452f92c910092"}
+        }
+
+    def test_main_format_requires_fields(self, capsys):
+        """Test that tsv/csv formats require --fields"""
+        with patch("sys.argv", ["usenc", "url", "--format", "tsv"]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert "requires --fields" in capsys.readouterr().err
+
+    def test_main_jobs_requires_bulk(self, capsys):
+        """Test that --jobs is only accepted in bulk mode"""
+        with patch("sys.argv", ["usenc", "url", "--jobs", "4"]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert "--jobs can only be used with --bulk" in capsys.readouterr().err
+
+    def test_main_on_error(self, tmp_path, capsys):
+        """Test that --on-error keeps going on failed lines and reports them"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"aGVsbG8=\n!!bad\nd29ybGQ=\n")
+
+        argv = ["usenc", "base64", "-d", "-i", str(input_file), "-o", str(output_file)]
+        with patch("sys.argv", [*argv, "--on-error", "replace", "--replacement", "?"]):
+            main()
+
+        assert output_file.read_bytes() == b"hello\n?\nworld\n"
+        assert "usenc: 1 failed record (replaced)" in capsys.readouterr().err
+
+        with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+            main()
+        assert exc_info.value.code == 1
+
+    def test_main_on_error_bulk(self, capsys):
+        """Test that --on-error is only accepted in line mode"""
+        with patch("sys.argv", ["usenc", "url", "-b", "--on-error", "skip"]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert "--on-error can not be used with --bulk" in capsys.readouterr().err
+
+    def test_main_output_dir(self, tmp_path, capsys):
+        """Test that --output-dir processes every file matching the input pattern"""
+        (tmp_path / "logs").mkdir()
+        (tmp_path / "logs" / "a.log").write_bytes(b"a b\n")
+        (tmp_path / "logs" / "b.log").write_bytes(b"c/d\n")
+        out = tmp_path / "out"
+
+        with patch(
+            "sys.argv",
+            ["usenc", "url", "-i", str(tmp_path / "logs" / "*.log"), "--output-dir", str(out)],
+        ):
+            main()
+
+        assert (out / "a.log").read_bytes() == b"a%20b\n"
+        assert (out / "b.log").read_bytes() == b"c%2Fd\n"
+        err = capsys.readouterr().err
+        assert "[2/2]" in err
+        assert "usenc: 2 files" in err
+
+    def test_main_output_dir_failed_file(self, tmp_path, capsys):
+        """Test that a failing file does not stop the others but sets the exit code"""
+        (tmp_path / "logs").mkdir()
+        (tmp_path / "logs" / "a.log").write_bytes(b"!!\n")
+        (tmp_path / "logs" / "b.log").write_bytes(b"aGk=\n")
+        out = tmp_path / "out"
+
+        argv = ["usenc", "base64", "-d", "-i", str(tmp_path / "logs" / "*.log")]
+        with patch("sys.argv", [*argv, "--output-dir", str(out)]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        assert (out / "b.log").read_bytes() == b"hi\n"
+        assert "a.log: Error: Invalid character" in capsys.readouterr().err
+
+    def test_main_output_dir_no_match(self, tmp_path, capsys):
+        """Test that a pattern matching no file is an error"""
+        argv = ["usenc", "url", "-i", str(tmp_path / "*.log"), "--output-dir", str(tmp_path)]
+        with patch("sys.argv", argv), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        assert "no input file matches" in capsys.readouterr().err
+
+    def test_main_output_dir_requires_input(self, capsys):
+        """Test that --output-dir needs an input pattern"""
+        with patch("sys.argv", ["usenc", "url", "--output-dir", "out"]), pytest.raises(
+            SystemExit
+        ) as exc_info:
+            main()
+
+        assert exc_info.value.code == 2
+        assert "--output-dir requires -i/--input" in capsys.readouterr().err
+
+    def test_main_jobs(self, tmp_path):
+        """Test bulk encoding with --jobs"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(b"hello world")
+
+        with patch(
+            "sys.argv",
+            ["usenc", "base64", "-b", "-j", "0", "-i", str(input_file), "-o", str(output_file)],
+        ):
+            main()
+
+        assert output_file.read_bytes() == b"aGVsbG8gd29ybGQ="
+
+    def test_main_profile(self, tmp_path):
+        """Test that --profile dumps pstats data"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        profile_file = tmp_path / "usenc.prof"
+
+        input_file.write_bytes(b"hello world\n")
+
+        with patch(
+            "sys.argv",
+            [
+                "usenc",
+                "url",
+                "--profile",
+                str(profile_file),
+                "-i",
+                str(input_file),
+                "-o",
+                str(output_file),
+            ],
+        ):
+            main()
+
+        stats = pstats.Stats(str(profile_file))
+        assert stats.total_calls > 0
+
+    def test_main_connect(self, tmp_path):
+        """Test that --connect delegates records to a running server"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        address = str(tmp_path / "usenc.sock")
+
+        input_file.write_bytes(b"hello world\ntest data\n")
+
+        server = make_server(address)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        try:
+            with patch(
+                "sys.argv",
+                [
+                    "usenc",
+                    "url",
+                    "--connect",
+                    address,
+                    "-i",
+                    str(input_file),
+                    "-o",
+                    str(output_file),
+                ],
+            ):
+                main()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        assert output_file.read_bytes() == b"hello%20world\ntest%20data\n"
+
+    def test_main_decompress_bulk(self, tmp_path):
+        """Test that --decompress decompresses the input in bulk mode"""
+        input_file = tmp_path / "input.gz"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(gzip.compress(b"hello"))
+
+        argv = ["usenc", "base64", "--bulk", "-i", str(input_file), "-o", str(output_file)]
+        with patch("sys.argv", argv):
+            main()
+        assert output_file.read_bytes() == encode(input_file.read_bytes(), "base64")
+
+        with patch("sys.argv", [*argv, "--decompress"]):
+            main()
+        assert output_file.read_bytes() == b"aGVsbG8="
+
+    def test_main_serve(self):
+        """Test that `usenc serve` starts a server on the given address"""
+        with patch("sys.argv", ["usenc", "serve", "localhost:8765"]), patch(
+            "usenc.cli.serve"
+        ) as mock_serve:
+            main()
+
+        mock_serve.assert_called_once_with(("localhost", 8765), 16)
+
+        with patch("sys.argv", ["usenc", "serve", ":8765", "--workers", "2"]), patch(
+            "usenc.cli.serve"
+        ) as mock_serve:
+            main()
+
+        mock_serve.assert_called_once_with(("127.0.0.1", 8765), 2)
+
+    def test_main_serve_error(self, capsys):
+        """Test that server errors print an error line instead of a traceback"""
+        with patch("sys.argv", ["usenc", "serve", "/tmp/usenc.sock"]), patch(
+            "usenc.cli.serve", side_effect=ServerError("Unix domain sockets are not supported")
+        ), pytest.raises(SystemExit) as exc_info:
+            main()
+
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err == "Error: Unix domain sockets are not supported\n"
+
+    def test_main_detect(self, tmp_path):
+        """Test that `usenc detect` reports the encodings of each line"""
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+
+        input_file.write_bytes(
+            b"aGVsbG8gd29ybGQ=\nplain text\nJTNDZGl2JTNFaGVsbG8lM0MlMkZkaXYlM0U=\n"
+        )
+
+        argv = ["usenc", "detect", "--unwrap", "-i", str(input_file), "-o", str(output_file)]
+        with patch("sys.argv", argv):
+            main()
+
+        lines = output_file.read_bytes().splitlines()
+        assert lines[0].startswith(b"base64 --alphabet standard\t")
+        assert lines[1] == b"-\t0.00"
+        assert lines[2].startswith(b"base64 --alphabet standard,url\t")
+
+        with patch("sys.argv", [*argv, "--decode"]):
+            main()
+
+        assert output_file.read_bytes() == b"hello world\nplain text\n<div>hello</div>\n"
+
 
 class TestCLIIntegration:
     """Integration tests for CLI workflows"""
@@ -0,0 +1,77 @@
+"""
+Check compressed input and output streams
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import compression
+from usenc.compression import DecompressedReader, compressor, detect_compression
+
+COMPRESS = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+DATA = b"".join(b"line %d\n" % i for i in range(10000))
+
+
+class TestCompression:
+    """Tests for the compression helpers"""
+
+    @pytest.mark.parametrize("name", ["gzip", "bz2", "xz"])
+    def test_detect_magic(self, name):
+        stream = io.BufferedReader(io.BytesIO(COMPRESS[name](DATA)))
+        assert detect_compression(stream) == name
+        # Peeking does not consume the stream
+        assert stream.read(1) == COMPRESS[name](DATA)[:1]
+
+    def test_detect_plain(self):
+        assert detect_compression(io.BufferedReader(io.BytesIO(DATA))) is None
+        assert detect_compression(io.BufferedReader(io.BytesIO(b""))) is None
+
+    @pytest.mark.parametrize(
+        "text",
+        [b"BZh1 is a word\n", b"BZhlbG8=\n", b"BZh91AY", b"\x1f\x8bA", b"\xfd7zXZ"],
+    )
+    def test_detect_magic_prefix_text(self, text):
+        """Test that inputs starting like a compressed stream are not taken for one"""
+        assert detect_compression(io.BufferedReader(io.BytesIO(text))) is None
+
+    def test_detect_empty_bz2(self):
+        assert detect_compression(io.BufferedReader(io.BytesIO(bz2.compress(b"")))) == "bz2"
+
+    def test_detect_extension(self):
+        # BytesIO can not be peeked, the file name is used instead
+        assert detect_compression(io.BytesIO(b""), Path("a.log.xz")) == "xz"
+        assert detect_compression(io.BytesIO(b""), Path("a.log")) is None
+
+    @pytest.mark.parametrize("name", ["gzip", "bz2", "xz"])
+    def test_roundtrip(self, name, monkeypatch):
+        # Small chunks so that the reader goes through many queued chunks
+        monkeypatch.setattr(compression, "CHUNK_SIZE", 1000)
+        output = io.BytesIO()
+        with compressor(output, name) as f:
+            f.write(DATA)
+        assert not output.closed
+
+        with DecompressedReader(io.BytesIO(output.getvalue()), name) as f:
+            assert f.readline() == b"line 0\n"
+            assert f.read(7) == b"line 1\n"
+            assert f.read() == DATA[14:]
+
+    def test_truncated_input(self):
+        with DecompressedReader(io.BytesIO(gzip.compress(DATA)[:100]), "gzip") as f, pytest.raises(
+            EOFError
+        ):
+            f.read()
+
+    def test_close_before_end(self, monkeypatch):
+        monkeypatch.setattr(compression, "CHUNK_SIZE", 100)
+        f = DecompressedReader(io.BytesIO(gzip.compress(DATA)), "gzip")
+        assert f.readline() == b"line 0\n"
+        f.close()
+        assert f.closed
@@ -8,7 +8,17 @@ from pathlib import Path
 import pytest
 
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-from usenc import EncoderNotFoundError, decode, encode
+from usenc import (
+    EncoderNotFoundError,
+    decode,
+    decode_batch,
+    decode_stream,
+    encode,
+    encode_batch,
+    encode_stream,
+    prepare,
+    prepare_stream,
+)
 
 text = b"<hello world>"
 encoded = b"%3Chello%20world%3E"
@@ -38,3 +48,51 @@ class TestCoreAPI:
 
     def test_decode_params(self):
         assert decode(b"%3Chell%6F%20w%6Frld%3E", "url", include="o") == b"<hello world>"
+
+    def test_prepare(self):
+        codec = prepare("url", include="o")
+        assert codec(b"<hello world>") == b"%3Chell%6F%20w%6Frld%3E"
+
+    def test_prepare_decode(self):
+        codec = prepare("url", is_decoding=True)
+        assert codec(encoded) == text
+
+    def test_prepare_unknown(self):
+        with pytest.raises(EncoderNotFoundError):
+            prepare("unknown")
+
+    def test_encode_stream(self):
+        assert b"".join(encode_stream([b"<hello", b" world>"], "url")) == encoded
+
+    def test_decode_stream(self):
+        assert b"".join(decode_stream([b"%3Chello%20", b"world%3E"], "url")) == text
+
+    def test_stream_unknown(self):
+        with pytest.raises(EncoderNotFoundError):
+            encode_stream([text], "unknown")
+        with pytest.raises(EncoderNotFoundError):
+            decode_stream([encoded], "unknown")
+        with pytest.raises(EncoderNotFoundError):
+            prepare_stream("unknown")
+
+    def test_prepare_stream(self):
+        codec = prepare_stream("crc32")
+        assert list(codec([b"hello ", b"world"])) == [b"0D4A1185"]
+
+    def test_encode_batch(self):
+        assert encode_batch([text, b"a b"], "url") == [encoded, b"a%20b"]
+
+    def test_decode_batch(self):
+        assert decode_batch([encoded, b"a%20b"], "url") == [text, b"a b"]
+
+    def test_batch_threads(self):
+        texts = [bytes([i]) * 4000 for i in range(64)]
+        expected = [encode(text, "sha256") for text in texts]
+        assert encode_batch(texts, "sha256", threads=4) == expected
+        assert decode_batch(encode_batch(texts, "base64", threads=0), "base64", threads=3) == texts
+
+    def test_batch_unknown(self):
+        with pytest.raises(EncoderNotFoundError):
+            encode_batch([text], "unknown")
+        with pytest.raises(EncoderNotFoundError):
+            decode_batch([encoded], "unknown")
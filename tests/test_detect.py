@@ -0,0 +1,102 @@
+"""
+Check the encoding detection
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import decode, detect, encode
+from usenc.detect import profiles, unwrap
+
+SAMPLE = b"user=admin&path=/var/www/html <script>"
+
+
+class TestDetect:
+    """Tests for the detect function"""
+
+    @pytest.mark.parametrize(
+        "encoder",
+        ["base16", "base32", "base36", "base45", "base58", "base62", "base64", "base85"],
+    )
+    def test_base_encoders(self, encoder):
+        candidates = detect(encode(SAMPLE, encoder))
+        assert candidates[0].encoder == encoder
+        assert candidates[0].decoded == SAMPLE
+
+    @pytest.mark.parametrize("encoder", ["url", "cstring", "unicode", "html"])
+    def test_escape_encoders(self, encoder):
+        candidates = detect(encode(SAMPLE, encoder))
+        assert candidates[0].encoder == encoder
+        assert candidates[0].decoded == SAMPLE
+
+    @pytest.mark.parametrize(
+        "encoder, params",
+        [
+            ("base91", {}),
+            ("binary", {}),
+            ("bech32", {"hrp": "test"}),
+            ("bech32", {"hrp": "bc", "variant": "bech32m"}),
+        ],
+    )
+    def test_other_encoders(self, encoder, params):
+        encoded = encode(SAMPLE, encoder, **params)
+        candidate = detect(encoded)[0]
+        assert candidate.encoder == encoder
+        assert candidate.decoded == SAMPLE
+        assert decode(encoded, encoder, **candidate.params) == SAMPLE
+
+    def test_punycode(self):
+        candidate = detect(b"www.xn--bcher-kva.example")[0]
+        assert candidate.encoder == "punycode"
+        assert candidate.decoded == "www.bücher.example".encode()
+
+    def test_html_named_entities(self):
+        encoded = b"caf&eacute; &lt;b&gt; &amp; cr&egrave;me"
+        candidate = detect(encoded)[0]
+        assert candidate.encoder == "html"
+        assert candidate.decoded == "café <b> & crème".encode()
+        assert decode(encoded, "html", **candidate.params) == candidate.decoded
+
+    def test_alphabet_params(self):
+        encoded = encode(b"are you sure??? >>> yes", "base64", alphabet="url")
+        candidate = detect(encoded)[0]
+        assert candidate.params == {"alphabet": "url"}
+        assert decode(encoded, candidate.encoder, **candidate.params) == candidate.decoded
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            b"",
+            b"cafe",
+            b"hello world",
+            b"password",
+            b"Administrator",
+            b"2024-01-01",
+            b"10101010",
+            b"version1abcdef",
+            b"AT&T; stuff",
+        ],
+    )
+    def test_plain_text(self, text):
+        assert detect(text) == []
+
+    def test_sorted_and_limited(self):
+        candidates = detect(encode(SAMPLE, "base16"), limit=10, threshold=0.0)
+        assert len(candidates) > 1
+        assert [c.score for c in candidates] == sorted((c.score for c in candidates), reverse=True)
+        assert len(detect(encode(SAMPLE, "base16"), limit=1, threshold=0.0)) == 1
+
+    def test_unwrap(self):
+        layered = encode(encode(SAMPLE, "url"), "base64")
+        layers = unwrap(layered)
+        assert [layer.encoder for layer in layers] == ["base64", "url"]
+        assert layers[-1].decoded == SAMPLE
+
+    def test_profiles_skip_irreversible(self):
+        encoders = {profile.encoder for profile in profiles()}
+        assert "base64" in encoders
+        assert "md5" not in encoders
+        assert "doubleurl" not in encoders
@@ -0,0 +1,78 @@
+"""
+Check the error policies of line mode
+"""
+
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import prepare, prepare_batch
+from usenc.errors import ErrorPolicy
+
+LINES = [b"aGVsbG8=", b"!!bad", b"d29ybGQ="]
+
+
+class TestErrorPolicy:
+    """Tests for the ErrorPolicy class"""
+
+    def test_fail_returns_codec(self):
+        codec = prepare("base64", True)
+        assert ErrorPolicy().wrap(codec) is codec
+
+    @pytest.mark.parametrize(
+        "policy,expected",
+        [
+            ("skip", [b"hello", None, b"world"]),
+            ("passthrough", [b"hello", b"!!bad", b"world"]),
+            ("replace", [b"hello", b"?", b"world"]),
+        ],
+    )
+    def test_wrap(self, policy, expected):
+        errors = ErrorPolicy(policy, b"?")
+        codec = errors.wrap(prepare("base64", True))
+
+        assert [codec(line) for line in LINES] == expected
+        assert errors.errors == 1
+        assert "Invalid character '!'" in errors.first_error
+
+    @pytest.mark.parametrize(
+        "policy,expected",
+        [
+            ("skip", [b"hello", b"world"]),
+            ("passthrough", [b"hello", b"!!bad", b"world"]),
+            ("replace", [b"hello", b"", b"world"]),
+        ],
+    )
+    def test_wrap_batch(self, policy, expected):
+        errors = ErrorPolicy(policy)
+        batch_codec = errors.wrap_batch(prepare_batch("base64", True))
+
+        assert batch_codec(LINES) == expected
+        assert batch_codec(LINES[:1]) == [b"hello"]
+        assert errors.errors == 1
+
+    def test_unknown_policy(self):
+        with pytest.raises(ValueError, match="Unknown error policy"):
+            ErrorPolicy("ignore")
+
+    def test_summary(self):
+        errors = ErrorPolicy("skip")
+        codec = errors.wrap(prepare("base64", True))
+        codec(b"!a")
+        codec(b"!b")
+
+        assert errors.summary().startswith("2 failed records (skipped), first error:")
+        assert errors.as_dict()["errors"] == 2
+
+    def test_pickle(self):
+        """Test that policies are sent to --output-dir workers without their lock"""
+        errors = ErrorPolicy("replace", b"?")
+        errors.wrap(prepare("base64", True))(b"!a")
+
+        copy = pickle.loads(pickle.dumps(errors))
+        assert copy.as_dict() == errors.as_dict()
+        assert copy.wrap(prepare("base64", True))(b"!b") == b"?"
+        assert copy.errors == 2
@@ -0,0 +1,101 @@
+"""
+Check multi-file processing
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.errors import ErrorPolicy
+from usenc.files import expand_inputs, glob_base, process_files
+
+PROCESS_ARGS = {
+    "is_bulk": False,
+    "global_params": {},
+    "encoder_name": "base64",
+    "encoder_params": {},
+}
+
+
+@pytest.fixture
+def logs(tmp_path):
+    (tmp_path / "logs" / "2024").mkdir(parents=True)
+    (tmp_path / "logs" / "a.log").write_bytes(b"aGk=\n")
+    (tmp_path / "logs" / "b.log").write_bytes(b"aGk=\n!!\n")
+    (tmp_path / "logs" / "notes.txt").write_bytes(b"aGk=\n")
+    (tmp_path / "logs" / "2024" / "c.log").write_bytes(b"aGVsbG8=\n")
+    return tmp_path / "logs"
+
+
+class TestExpandInputs:
+    """Tests for the glob expansion of input files"""
+
+    def test_glob_base(self):
+        assert glob_base("logs/*.log") == Path("logs")
+        assert glob_base("/var/log/**/*.gz") == Path("/var/log")
+        assert glob_base("logs/2024-*/app.log") == Path("logs")
+        assert glob_base("*.log") == Path(".")
+
+    def test_expand_inputs(self, logs, tmp_path):
+        out = tmp_path / "out"
+        assert expand_inputs(f"{logs}/*.log", out) == [
+            (logs / "a.log", out / "a.log"),
+            (logs / "b.log", out / "b.log"),
+        ]
+
+    def test_expand_inputs_recursive(self, logs, tmp_path):
+        out = tmp_path / "out"
+        pairs = expand_inputs(f"{logs}/**/*.log", out)
+        assert (logs / "2024" / "c.log", out / "2024" / "c.log") in pairs
+        assert len(pairs) == 3
+
+    def test_expand_inputs_overwrite(self, logs):
+        with pytest.raises(ValueError, match="would overwrite its input"):
+            expand_inputs(f"{logs}/*.log", logs)
+
+    def test_expand_inputs_compressed(self, tmp_path):
+        (tmp_path / "a.log.gz").write_bytes(b"")
+        out = tmp_path / "out"
+
+        assert expand_inputs(f"{tmp_path}/*.gz", out) == [(tmp_path / "a.log.gz", out / "a.log")]
+        assert expand_inputs(f"{tmp_path}/*.gz", out, "bz2") == [
+            (tmp_path / "a.log.gz", out / "a.log.bz2")
+        ]
+        assert expand_inputs(f"{tmp_path}/*.gz", out, decompress=False) == [
+            (tmp_path / "a.log.gz", out / "a.log.gz")
+        ]
+
+
+class TestProcessFiles:
+    """Tests for the process_files function"""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_process_files(self, logs, tmp_path, jobs):
+        out = tmp_path / "out"
+        files = expand_inputs(f"{logs}/**/*.log", out)
+        results = list(process_files(files, True, jobs, errors=ErrorPolicy("skip"), **PROCESS_ARGS))
+
+        assert sorted(path.name for path, _, _ in results) == ["a.log", "b.log", "c.log"]
+        assert all(error is None for _, _, error in results)
+        assert (out / "a.log").read_bytes() == b"hi\n"
+        assert (out / "b.log").read_bytes() == b"hi\n"
+        assert (out / "2024" / "c.log").read_bytes() == b"hello\n"
+
+        failed = {path.name: result.errors.errors for path, result, _ in results}
+        assert failed == {"a.log": 0, "b.log": 1, "c.log": 0}
+
+    def test_failed_file(self, logs, tmp_path):
+        files = expand_inputs(f"{logs}/*.log", tmp_path / "out")
+        results = {
+            path.name: (result, error)
+            for path, result, error in process_files(
+                files, True, 1, with_stats=True, **PROCESS_ARGS
+            )
+        }
+
+        assert results["a.log"][0].stats.lines == 1
+        assert results["a.log"][0].bytes_out == 3
+        assert results["b.log"][0] is None
+        assert "Invalid character" in str(results["b.log"][1])
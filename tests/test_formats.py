@@ -0,0 +1,120 @@
+"""
+Check the structured record formats
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import prepare
+from usenc.errors import ErrorPolicy
+from usenc.formats import parse_fields, parse_keys, process_records
+
+url = prepare("url")
+
+
+def run(data: bytes, record_format: str, **kwargs) -> bytes:
+    output = io.BytesIO()
+    process_records(io.BytesIO(data), output, url, record_format, **kwargs)
+    return output.getvalue()
+
+
+class TestParse:
+    """Tests for the field and key selection parsers"""
+
+    def test_parse_fields(self):
+        assert parse_fields("3,5") == [2, 4]
+        assert parse_fields("1-3,7") == [0, 1, 2, 6]
+        assert parse_fields("2,2,1") == [0, 1]
+
+    def test_parse_fields_invalid(self):
+        with pytest.raises(ValueError, match="invalid field selection"):
+            parse_fields("a,b")
+        with pytest.raises(ValueError, match="fields start at 1"):
+            parse_fields("0")
+
+    def test_parse_keys(self):
+        assert parse_keys("user.email,path") == [["user", "email"], ["path"]]
+
+
+class TestProcessRecords:
+    """Tests for the process_records function"""
+
+    def test_tsv(self):
+        data = b"1\ta b\tc d\n2\te f\t\n"
+        assert run(data, "tsv", fields=[1]) == b"1\ta%20b\tc d\n2\te%20f\t\n"
+
+    def test_tsv_missing_fields(self):
+        assert run(b"a b\n", "tsv", fields=[0, 3]) == b"a%20b\n"
+
+    def test_csv(self):
+        data = b'id,path\n1,"/a b,c"\n2,/caf\xc3\xa9\n'
+        assert run(data, "csv", fields=[1]) == (b"id,path\n1,%2Fa%20b%2Cc\n2,%2Fcaf%C3%A9\n")
+
+    def test_csv_quoted_newline(self):
+        data = b'1,"line 1\nline 2",x\n'
+        assert run(data, "csv", fields=[1]) == b"1,line%201%0Aline%202,x\n"
+
+    def test_jsonl(self):
+        data = b'{"user": {"email": "a b@example.com"}, "path": "/x y", "n": 1}\n'
+        output = run(data, "jsonl", keys=[["user", "email"], ["path"], ["missing", "key"]])
+        assert json.loads(output) == {
+            "user": {"email": "a%20b%40example.com"},
+            "path": "%2Fx%20y",
+            "n": 1,
+        }
+
+    def test_jsonl_non_string_values(self):
+        data = b'{"a": 12, "b": true, "c": null, "d": [1]}\n'
+        output = run(data, "jsonl", keys=[["a"], ["b"], ["c"], ["d"]])
+        assert json.loads(output) == {"a": "12", "b": True, "c": None, "d": [1]}
+
+    def test_jsonl_binary_values(self):
+        # Decoder outputs that are not UTF-8 are written as escaped lone surrogates
+        data = b'{"a": "/w==", "b": "aGk="}\n'
+        output = io.BytesIO()
+        process_records(io.BytesIO(data), output, prepare("base64", True), "jsonl", keys=[["a"]])
+        assert output.getvalue() == b'{"a":"\\udcff","b":"aGk="}\n'
+        assert json.loads(output.getvalue()) == {"a": "\udcff", "b": "aGk="}
+
+        encoded = io.BytesIO()
+        process_records(
+            io.BytesIO(output.getvalue()), encoded, prepare("base64"), "jsonl", keys=[["a"]]
+        )
+        assert encoded.getvalue() == b'{"a":"/w==","b":"aGk="}\n'
+
+    def test_jsonl_surrogates_kept(self):
+        # Lone surrogates outside of the selected keys are written back as they were
+        data = b'{"a": "x y", "\\ud800": 1, "b": "\\udc80"}\n'
+        assert run(data, "jsonl", keys=[["a"]]) == (b'{"a":"x%20y","\\ud800":1,"b":"\\udc80"}\n')
+
+    def test_jsonl_invalid_selected_value(self):
+        with pytest.raises(ValueError, match="record 1: key a: .* surrogates not allowed"):
+            run(b'{"a": "\\ud800"}\n', "jsonl", keys=[["a"]])
+
+    def test_jsonl_empty_line(self):
+        assert run(b"\n", "jsonl", keys=[["a"]]) == b"\n"
+
+    def test_jsonl_invalid(self):
+        with pytest.raises(ValueError, match="record 2: invalid JSON"):
+            run(b'{"a": 1}\n{a\n', "jsonl", keys=[["a"]])
+
+    def test_failed_records_dropped(self):
+        codec = ErrorPolicy("skip").wrap(prepare("base64", True))
+        data = b"1\taGk=\n2\t!!\n"
+        output = io.BytesIO()
+        process_records(io.BytesIO(data), output, codec, "tsv", fields=[1])
+        assert output.getvalue() == b"1\thi\n"
+
+        data = b'{"a": "aGk="}\n{"a": "!!"}\n{"a": null}\n'
+        output = io.BytesIO()
+        process_records(io.BytesIO(data), output, codec, "jsonl", keys=[["a"]])
+        assert output.getvalue() == b'{"a":"hi"}\n{"a":null}\n'
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unknown record format"):
+            run(b"", "xml")
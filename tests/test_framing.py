@@ -0,0 +1,101 @@
+"""
+Check record framing
+"""
+
+import io
+import struct
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.framing import Delimited, FixedSize, LengthPrefixed, make_framing
+
+
+def records(framing, data: bytes, buffer_size: int = 1 << 18):
+    """All the records read by framing from data, with reads of buffer_size bytes"""
+    stream = io.BufferedReader(io.BytesIO(data))
+    with patch("usenc.framing.BUFFER_SIZE", buffer_size):
+        return [record for batch in framing.read(stream) for record in batch]
+
+
+def prefixed(fmt: str, *payloads: bytes) -> bytes:
+    return b"".join(struct.pack(fmt, len(payload)) + payload for payload in payloads)
+
+
+class TestDelimited:
+    """Tests for NUL delimited records"""
+
+    @pytest.mark.parametrize("buffer_size", [1, 2, 5, 1 << 18])
+    def test_read(self, buffer_size):
+        data = b"a\nb \0\0long record\r\n\0last"
+        expected = [b"a\nb ", b"", b"long record\r\n", b"last"]
+        assert records(Delimited(), data, buffer_size) == expected
+
+    def test_read_terminated(self):
+        assert records(Delimited(), b"a\0b\0") == [b"a", b"b"]
+        assert records(Delimited(), b"") == []
+
+    def test_join(self):
+        assert Delimited().join([b"a", b"", b"b\n"]) == b"a\0\0b\n\0"
+
+
+class TestFixedSize:
+    """Tests for fixed size records"""
+
+    @pytest.mark.parametrize("buffer_size", [1, 4, 7, 1 << 18])
+    def test_read(self, buffer_size):
+        data = b"abc\n\0fghij"
+        assert records(FixedSize(3), data, buffer_size) == [b"abc", b"\n\0f", b"ghi", b"j"]
+
+    def test_join(self):
+        assert FixedSize(2).join([b"ab", b"cde"]) == b"abcde"
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError, match="at least 1 byte"):
+            FixedSize(0)
+
+
+class TestLengthPrefixed:
+    """Tests for length-prefixed records"""
+
+    @pytest.mark.parametrize("prefix,fmt", [("u16", ">H"), ("u32", ">I")])
+    @pytest.mark.parametrize("buffer_size", [1, 3, 8, 1 << 18])
+    def test_read(self, prefix, fmt, buffer_size):
+        payloads = [b"a\nb", b"", b"\0" * 20, b"end"]
+        data = prefixed(fmt, *payloads)
+        assert records(LengthPrefixed(prefix), data, buffer_size) == payloads
+
+    def test_read_large_record(self):
+        """Test that a record larger than a read is read whole"""
+        payloads = [b"x", bytes(range(256)) * 10, b"y"]
+        assert records(LengthPrefixed("u16"), prefixed(">H", *payloads), 16) == payloads
+
+    @pytest.mark.parametrize("data", [b"\0\x01a\0\x05abc", b"\0\x01a\0", b"\0\x01a\0\x02b"])
+    def test_read_truncated(self, data):
+        with pytest.raises(ValueError, match="record 2: truncated"):
+            records(LengthPrefixed("u16"), data)
+
+    def test_join(self):
+        assert LengthPrefixed("u16").join([b"ab", b""]) == b"\0\x02ab\0\0"
+        assert LengthPrefixed("u32").join([b"ab"]) == b"\0\0\0\x02ab"
+
+    def test_join_too_long(self):
+        with pytest.raises(ValueError, match="70000 bytes does not fit a u16"):
+            LengthPrefixed("u16").join([b"a", b"x" * 70000])
+
+    def test_unknown_prefix(self):
+        with pytest.raises(ValueError, match="Unknown length prefix"):
+            LengthPrefixed("u8")
+
+
+class TestMakeFraming:
+    """Tests for make_framing"""
+
+    def test_make_framing(self):
+        assert make_framing() is None
+        assert isinstance(make_framing(null_data=True), Delimited)
+        assert make_framing(record_size=16).size == 16
+        assert make_framing(length_prefixed="u16").prefix == "u16"
@@ -0,0 +1,102 @@
+"""
+Check line reading with bounded memory
+"""
+
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc.encoders import ENCODERS
+from usenc.lines import bounded_lines, read_lines, stripped_chunks
+
+
+def items(data: bytes, max_line_buffer: int):
+    """Items of read_lines, with the chunks of long lines consumed as lists"""
+    stream = io.BufferedReader(io.BytesIO(data))
+    return [
+        line if isinstance(line, bytes) else list(line)
+        for line in read_lines(stream, max_line_buffer)
+    ]
+
+
+class TestReadLines:
+    """Tests for read_lines"""
+
+    def test_short_lines(self):
+        data = b"a\nbb\n\nccc"
+        assert items(data, 8) == [b"a\n", b"bb\n", b"\n", b"ccc"]
+
+    def test_long_line(self):
+        data = b"short\n" + b"x" * 20 + b"\nend\n"
+        assert items(data, 8) == [b"short\n", [b"x" * 8, b"x" * 8, b"x" * 4], b"end\n"]
+
+    def test_line_of_the_limit(self):
+        """Test that a line of exactly the limit with its newline is a whole line"""
+        assert items(b"1234567\nab", 8) == [b"1234567\n", b"ab"]
+        assert items(b"12345678", 8) == [[b"12345678"]]
+
+    def test_no_limit(self):
+        data = b"x" * 100 + b"\ny\n"
+        assert items(data, 0) == [b"x" * 100 + b"\n", b"y\n"]
+
+    def test_unconsumed_long_line(self):
+        """Test that the rest of a long line is skipped when its chunks are not read"""
+        stream = io.BufferedReader(io.BytesIO(b"x" * 50 + b"\nnext\n"))
+        lines = list(read_lines(stream, 8))
+        assert lines[1:] == [b"next\n"]
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            b"abc def   ghi   \r\n",
+            b"abcdefgh        \n",
+            b"a       b       c\t\t\t\t\n",
+            b"        leading and trailing        \n",
+            b"                \n",
+        ],
+    )
+    @pytest.mark.parametrize("size", [1, 3, 8])
+    def test_stripped_chunks(self, line, size):
+        """Test that the chunks of a line join to the stripped line"""
+        stream = io.BufferedReader(io.BytesIO(line[size:] + b"next\n"))
+        chunks = list(stripped_chunks(line[:size], stream, size))
+        assert b"".join(chunks) == line.rstrip()
+        assert all(chunks)
+        assert stream.read() == b"next\n"
+
+
+# Encoders (with their default parameters) that need whole lines, every other one
+# processes long lines with bounded memory
+UNBOUNDED = {
+    ("base36", False),
+    ("base36", True),
+    ("base58", False),
+    ("base58", True),
+    ("base62", False),
+    ("base62", True),
+    ("bech32", False),
+    ("bech32", True),
+    ("cstring", True),
+    ("doubleurl", True),
+    ("fullwidth", False),
+    ("halfwidth", True),
+    ("hex", True),
+    ("html", True),
+    ("punycode", False),
+    ("punycode", True),
+    ("unicode", True),
+    ("url", True),
+}
+
+
+@pytest.mark.parametrize("encoder_name", sorted(ENCODERS))
+@pytest.mark.parametrize("is_decoding", [False, True], ids=["encode", "decode"])
+def test_bounded_lines(encoder_name, is_decoding):
+    encoder = ENCODERS[encoder_name]
+    if is_decoding and not encoder.reversible:
+        pytest.skip("not reversible")
+    capabilities = encoder.capabilities(is_decoding)
+    assert bounded_lines(capabilities) == ((encoder_name, is_decoding) not in UNBOUNDED)
@@ -0,0 +1,137 @@
+"""
+Check the vectored output layer
+"""
+
+import contextlib
+import io
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import output
+from usenc.output import VectoredWriter, enlarge_pipe, open_output
+
+LINES = [b"line %d\n" % i for i in range(1000)]
+
+
+@pytest.fixture
+def pipe():
+    read_fd, write_fd = os.pipe()
+    yield read_fd, write_fd
+    for fd in (read_fd, write_fd):
+        with contextlib.suppress(OSError):
+            os.close(fd)
+
+
+def read_all(fd: int) -> bytes:
+    chunks = []
+    while True:
+        chunk = os.read(fd, 1 << 16)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+class TestVectoredWriter:
+    """Tests for VectoredWriter"""
+
+    def test_write_on_flush(self, tmp_path):
+        path = tmp_path / "out"
+        with path.open("wb") as f:
+            writer = VectoredWriter(f.fileno(), flush_size=1 << 20)
+            for line in LINES:
+                writer.write(line)
+            assert path.read_bytes() == b""
+            writer.close()
+            # The file descriptor is left open
+            assert not f.closed
+        assert path.read_bytes() == b"".join(LINES)
+
+    def test_flush_size(self, tmp_path):
+        path = tmp_path / "out"
+        with path.open("wb") as f:
+            writer = VectoredWriter(f.fileno(), flush_size=100)
+            writer.write(b"x" * 60)
+            assert path.read_bytes() == b""
+            writer.write(b"y" * 60)
+            assert path.read_bytes() == b"x" * 60 + b"y" * 60
+            writer.close()
+
+    def test_small_records_are_joined(self, tmp_path):
+        with (tmp_path / "out").open("wb") as f:
+            writer = VectoredWriter(f.fileno())
+            for line in LINES:
+                writer.write(line)
+            writer.close()
+        assert writer.syscalls == 1
+
+    def test_large_records_iov_max(self, tmp_path, monkeypatch):
+        """Test that large records are written apart, IOV_MAX buffers at most per call"""
+        monkeypatch.setattr(output, "IOV_MAX", 2)
+        records = [bytes([i]) * output.COALESCE_SIZE for i in range(5)]
+        path = tmp_path / "out"
+        with path.open("wb") as f:
+            writer = VectoredWriter(f.fileno())
+            for record in records:
+                writer.write(bytearray(record))
+            writer.close()
+        assert writer.syscalls == 3
+        assert path.read_bytes() == b"".join(records)
+
+    def test_partial_writes(self, tmp_path, monkeypatch):
+        """Test that what writev did not write is written by the next calls"""
+        writev = os.writev
+
+        def short_writev(fd, buffers):
+            data = b"".join(buffers)[:7]
+            return writev(fd, [data])
+
+        monkeypatch.setattr(os, "writev", short_writev)
+        path = tmp_path / "out"
+        with path.open("wb") as f:
+            writer = VectoredWriter(f.fileno())
+            writer.write(b"a" * 10000)
+            writer.write(b"b" * 10000)
+            writer.write(b"hello\n")
+            writer.close()
+        assert path.read_bytes() == b"a" * 10000 + b"b" * 10000 + b"hello\n"
+
+    def test_pipe(self, pipe):
+        read_fd, write_fd = pipe
+        with VectoredWriter(write_fd) as writer:
+            for line in LINES:
+                writer.write(line)
+        os.close(write_fd)
+        assert read_all(read_fd) == b"".join(LINES)
+
+
+class TestPipes:
+    """Tests for enlarge_pipe and open_output"""
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="F_SETPIPE_SZ is Linux only")
+    def test_enlarge_pipe(self, pipe):
+        _, write_fd = pipe
+        size = enlarge_pipe(write_fd, 1 << 18)
+        assert size >= 1 << 18
+        # Never shrunk
+        assert enlarge_pipe(write_fd, 1 << 12) == size
+
+    def test_enlarge_not_a_pipe(self, tmp_path):
+        with (tmp_path / "out").open("wb") as f:
+            assert enlarge_pipe(f.fileno()) == 0
+
+    def test_open_output(self, tmp_path):
+        path = tmp_path / "out"
+        with path.open("wb") as f:
+            f.write(b"first\n")
+            writer = open_output(f, 1 << 16)
+            assert writer is not None
+            writer.write(b"second\n")
+            writer.close()
+        assert path.read_bytes() == b"first\nsecond\n"
+
+    def test_open_output_no_fileno(self):
+        assert open_output(io.BytesIO()) is None
@@ -0,0 +1,139 @@
+"""
+Check that parallel bulk processing gives the same results as serial processing
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import decode, encode, parallel
+from usenc.core import EncoderNotFoundError
+
+SAMPLE = bytes((i * 167 + 13) % 256 for i in range(10000))
+TEXT = "héllo wörld € 😀 ".encode() * 500
+
+
+@pytest.fixture(autouse=True)
+def small_parts(monkeypatch):
+    """Split small test inputs in several parts"""
+    monkeypatch.setattr(parallel, "MIN_PART_SIZE", 64)
+
+
+class TestSplitRanges:
+    """Cut points of the input"""
+
+    def test_covers_input(self):
+        ranges = parallel.split_ranges(SAMPLE, 7, 3)
+        assert ranges[0][0] == 0
+        assert ranges[-1][1] == len(SAMPLE)
+        assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+        assert len(ranges) <= 7
+
+    def test_alignment(self):
+        for start, _ in parallel.split_ranges(SAMPLE, 7, 5):
+            assert start % 5 == 0
+
+    def test_utf8_boundaries(self):
+        for start, end in parallel.split_ranges(TEXT, 13, 1, utf8=True):
+            TEXT[start:end].decode("utf-8")
+
+    def test_small_input(self):
+        assert parallel.split_ranges(b"ab", 4, 3) == [(0, 2)]
+        assert parallel.split_ranges(b"", 4, 1) == [(0, 0)]
+
+
+class TestAlignedChunks:
+    """Re-cut streams of chunks"""
+
+    def test_alignment(self):
+        chunks = [SAMPLE[i : i + 7] for i in range(0, len(SAMPLE), 7)]
+        parts = list(parallel.aligned_chunks(chunks, 3))
+        assert b"".join(parts) == SAMPLE
+        assert all(len(part) % 3 == 0 for part in parts[:-1])
+
+    def test_utf8(self):
+        chunks = [TEXT[i : i + 5] for i in range(0, len(TEXT), 5)]
+        parts = list(parallel.aligned_chunks(chunks, 1, utf8=True))
+        assert b"".join(parts) == TEXT
+        for part in parts:
+            part.decode("utf-8")
+
+
+class TestSplitAlignment:
+    """Alignment reported by encoders"""
+
+    @pytest.mark.parametrize(
+        "encoder,is_decoding,params,expected",
+        [
+            ("base64", False, {}, 3),
+            ("base64", True, {}, 4),
+            ("base32", False, {}, 5),
+            ("base32", True, {}, 8),
+            ("base16", False, {}, 1),
+            ("base45", False, {}, 2),
+            ("base45", True, {}, 3),
+            ("base85", False, {}, 4),
+            ("base85", True, {}, 0),
+            ("base85", True, {"alphabet": "z85"}, 5),
+            ("url", False, {}, 1),
+            ("url", False, {"regex": "[a-z]+"}, 0),
+            ("url", False, {"input_charset": "utf-16"}, 0),
+            ("url", True, {}, 0),
+            ("base58", False, {}, 0),
+            ("sha256", False, {}, 0),
+        ],
+    )
+    def test_alignment(self, encoder, is_decoding, params, expected):
+        assert parallel.split_alignment(encoder, is_decoding, **params) == expected
+
+    def test_unknown_encoder(self):
+        with pytest.raises(EncoderNotFoundError):
+            parallel.split_alignment("nonexistent")
+
+
+class TestProcessParallel:
+    """Parallel outputs match serial outputs"""
+
+    @pytest.mark.parametrize(
+        "encoder,params",
+        [
+            ("base64", {}),
+            ("base32", {}),
+            ("base16", {}),
+            ("base45", {}),
+            ("base85", {"alphabet": "z85"}),
+        ],
+    )
+    def test_bytes_roundtrip(self, encoder, params):
+        encoded = b"".join(parallel.process_parallel(SAMPLE, encoder, False, 3, **params))
+        assert encoded == encode(SAMPLE, encoder, **params)
+        if parallel.split_alignment(encoder, True, **params):
+            decoded = b"".join(parallel.process_parallel(encoded, encoder, True, 3, **params))
+            assert decoded == SAMPLE
+
+    @pytest.mark.parametrize("encoder", ["url", "hex", "html", "unicode", "cstring"])
+    def test_text(self, encoder):
+        encoded = b"".join(parallel.process_parallel(TEXT, encoder, False, 3))
+        assert encoded == encode(TEXT, encoder)
+        assert decode(encoded, encoder) == TEXT
+
+    def test_file_source(self, tmp_path):
+        path = tmp_path / "input.bin"
+        path.write_bytes(SAMPLE)
+        encoded = b"".join(parallel.process_parallel(str(path), "base64", False, 2))
+        assert encoded == encode(SAMPLE, "base64")
+
+    def test_empty_file_source(self, tmp_path):
+        path = tmp_path / "input.bin"
+        path.write_bytes(b"")
+        assert b"".join(parallel.process_parallel(str(path), "base64", False, 2)) == b""
+
+    def test_serial(self):
+        encoded = b"".join(parallel.process_parallel(SAMPLE, "base64", False, 1))
+        assert encoded == encode(SAMPLE, "base64")
+
+    def test_unsplittable(self):
+        with pytest.raises(ValueError, match="can not be split"):
+            list(parallel.process_parallel(SAMPLE, "base58", False, 2))
@@ -0,0 +1,107 @@
+"""
+Check the execution strategies chosen from encoder capabilities
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from conftest import load_encoders_tests, load_samples_file, parse_encoder_params
+
+from usenc.cli import process_encoding
+from usenc.core import EncoderNotFoundError
+from usenc.encoders import ENCODERS
+from usenc.errors import CODEC_ERRORS, ErrorPolicy
+from usenc.planner import plan
+
+SAMPLES = load_samples_file(Path(__file__).parent / "snapshots" / "samples.txt")
+
+FAILED = b"<failed>"
+
+
+class TestPlan:
+    """Tests for the plan function"""
+
+    @pytest.mark.parametrize(
+        "encoder,is_decoding,is_bulk,options,strategy",
+        [
+            ("url", False, False, {}, "lines"),
+            ("fnv1a", False, False, {}, "batch"),
+            ("fnv1a", False, False, {"per_record": True}, "lines"),
+            ("url", False, False, {"remote": True}, "remote"),
+            ("base64", False, True, {"remote": True}, "remote"),
+            ("base64", False, True, {}, "split"),
+            ("base64", True, True, {}, "split"),
+            ("base64", False, True, {"jobs": 4}, "parallel"),
+            ("url", False, True, {"jobs": 4}, "parallel"),
+            ("url", True, True, {"jobs": 4}, "whole"),
+            ("base85", False, True, {}, "stream"),
+            ("sha256", False, True, {}, "stream"),
+            ("sha256", False, True, {"jobs": 4}, "stream"),
+            ("base58", False, True, {"jobs": 4}, "whole"),
+        ],
+    )
+    def test_strategy(self, encoder, is_decoding, is_bulk, options, strategy):
+        assert plan(encoder, is_decoding, is_bulk, **options).strategy == strategy
+
+    def test_encoder_params(self):
+        """Encoder parameters change the capabilities"""
+        assert plan("url", False, True, regex="[a-z]+").strategy == "whole"
+        assert plan("url", False, True, input_charset="utf-16").strategy == "whole"
+
+    def test_capabilities(self):
+        assert plan("base64", False, True).capabilities.split_alignment == 3
+
+    def test_unknown_encoder(self):
+        with pytest.raises(EncoderNotFoundError):
+            plan("nonexistent", False, True)
+
+
+def encode_lines(encoder_name: str, is_decoding: bool, params: dict, lines: list) -> bytes:
+    """Output of line mode, computed with one encode (or decode) call per line"""
+    encoder = ENCODERS[encoder_name]
+    method = encoder.decode if is_decoding else encoder.encode
+    outputs = []
+    for line in lines:
+        try:
+            outputs.append(method(line.rstrip(), **params))
+        except CODEC_ERRORS:
+            outputs.append(FAILED)
+    return b"".join(output + b"\n" for output in outputs)
+
+
+class TestLineModeStrategies:
+    """Line mode (batch or lines strategy) gives the same output as one call per line"""
+
+    @pytest.mark.parametrize(
+        "encoder_test",
+        sorted(load_encoders_tests(only_roundtrip=False)),
+        ids=lambda x: f"{x[0]}_{x[1]}",
+    )
+    @pytest.mark.parametrize("is_decoding", [False, True], ids=["encode", "decode"])
+    def test_matches_per_line(self, tmp_path, encoder_test, is_decoding):
+        encoder_name, _, params_str = encoder_test
+        params = parse_encoder_params(encoder_name, params_str)
+        lines = SAMPLES
+        if is_decoding:
+            # Decode what the encoder produced, failures included
+            lines = encode_lines(encoder_name, False, params, SAMPLES).splitlines()
+
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(b"".join(line + b"\n" for line in lines))
+
+        process_encoding(
+            input_file,
+            output_file,
+            is_decoding,
+            False,
+            {},
+            encoder_name,
+            params,
+            errors=ErrorPolicy("replace", FAILED),
+        )
+
+        assert output_file.read_bytes() == encode_lines(encoder_name, is_decoding, params, lines)
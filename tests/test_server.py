@@ -0,0 +1,299 @@
+"""
+Check the encoding server and its client
+"""
+
+import argparse
+import io
+import socket
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import DecodeError, EncoderNotFoundError
+from usenc import server as server_module
+from usenc.cli import add_default_params, parse_encoder_args
+from usenc.client import CLI_OPTIONS, CLIENT_OPTIONS, FORWARDED_OPTIONS, is_thin, main_connect
+from usenc.server import (
+    MAX_METADATA_SIZE,
+    REQUEST_HEADER,
+    RESPONSE_HEADER,
+    STATUS_ERROR,
+    Client,
+    ServerError,
+    make_server,
+    parse_address,
+)
+
+
+@pytest.fixture
+def server_address(tmp_path):
+    """Run a server on a Unix domain socket for the duration of a test"""
+    address = str(tmp_path / "usenc.sock")
+    server = make_server(address)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield address
+    server.shutdown()
+    server.server_close()
+
+
+class TestParseAddress:
+    """Tests for the parse_address function"""
+
+    def test_tcp_address(self):
+        assert parse_address("localhost:8765") == ("localhost", 8765)
+
+    def test_tcp_port_only(self):
+        assert parse_address(":8765") == ("127.0.0.1", 8765)
+
+    def test_unix_address(self):
+        assert parse_address("/tmp/usenc.sock") == "/tmp/usenc.sock"
+
+
+class TestClient:
+    """Tests for the Client class against a running server"""
+
+    def test_encode(self, server_address):
+        with Client(server_address) as client:
+            assert client.encode(b"hello world", "url") == b"hello%20world"
+
+    def test_decode(self, server_address):
+        with Client(server_address) as client:
+            assert client.decode(b"aGVsbG8=", "base64") == b"hello"
+
+    def test_params(self, server_address):
+        with Client(server_address) as client:
+            assert client.encode(b"hello", "hex", lowercase=True, prefix="0x") == (
+                b"0x680x650x6c0x6c0x6f"
+            )
+            assert client.encode(b"hello", "hex") == b"68656C6C6F"
+
+    def test_many_requests(self, server_address):
+        with Client(server_address) as client:
+            for i in range(100):
+                line = f"line {i}".encode()
+                assert client.encode(line, "url") == line.replace(b" ", b"%20")
+
+    def test_errors(self, server_address):
+        with Client(server_address) as client:
+            with pytest.raises(EncoderNotFoundError, match="Unknown encoder"):
+                client.encode(b"hello", "unknown")
+            with pytest.raises(DecodeError, match="Invalid character"):
+                client.decode(b"!!!!", "base64")
+            # The connection is still usable after an error
+            assert client.encode(b"hello world", "url") == b"hello%20world"
+
+    def test_concurrent_clients(self, server_address):
+        results = []
+
+        def run():
+            with Client(server_address) as client:
+                results.append(all(client.encode(b"a b", "url") == b"a%20b" for _ in range(50)))
+
+        threads = [threading.Thread(target=run) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [True] * 8
+
+    def test_codec_prepared_once(self, server_address):
+        server_module._parse_metadata.cache_clear()
+        server_module._prepared_codec.cache_clear()
+        with Client(server_address) as client, Client(server_address) as other:
+            client.encode(b"hello", "hex", lowercase=True, prefix="0x")
+            other.encode(b"world", "hex", prefix="0x", lowercase=True)
+            client.encode(b"again", "hex", lowercase=True, prefix="0x")
+
+        info = server_module._prepared_codec.cache_info()
+        # The same options in another order share the codec
+        assert (info.misses, info.hits) == (1, 1)
+
+    def test_invalid_metadata(self, server_address):
+        with Client(server_address) as client:
+            client._metadata = (("url", False, {}), b'{"encoder": "url", "params": []}')
+            with pytest.raises(RuntimeError, match="invalid request metadata"):
+                client.encode(b"hello", "url")
+
+    def test_bounded_workers(self, tmp_path):
+        address = str(tmp_path / "usenc.sock")
+        server = make_server(address, workers=1)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        try:
+            first = Client(address)
+            assert first.encode(b"a b", "url") == b"a%20b"
+
+            # The only worker serves the first connection, the second one waits for it
+            results = []
+            waiting = threading.Thread(
+                target=lambda: results.append(Client(address).encode(b"c d", "url"))
+            )
+            waiting.start()
+            waiting.join(0.3)
+            assert results == []
+
+            first.close()
+            waiting.join(5)
+            assert results == [b"c%20d"]
+            assert len(server.threads) == 1
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_connection_refused(self, tmp_path):
+        with pytest.raises(ServerError, match="can not connect"):
+            Client(str(tmp_path / "missing.sock"))
+
+    def test_encoder_args(self, server_address):
+        with Client(server_address) as client:
+            codec = client.prepare_args("hex", False, ["--prefix", "0x", "--lowercase"])
+            assert codec(b"hi") == b"0x680x69"
+            codec = client.prepare_args("url", False, ["--input-charset", "latin1"])
+            assert codec("é".encode("latin1")) == b"%C3%A9"
+            with pytest.raises(RuntimeError, match="unrecognized arguments: --bogus"):
+                client.prepare_args("hex", False, ["--bogus"])(b"hi")
+            with pytest.raises(EncoderNotFoundError, match="Unknown encoder"):
+                client.prepare_args("unknown", False, [])(b"hi")
+
+
+class TestRequestHandler:
+    """Tests for the frames accepted by the server"""
+
+    def connect(self, address: str) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address)
+        sock.settimeout(5)
+        return sock
+
+    def test_frame_too_large(self, server_address):
+        with self.connect(server_address) as sock:
+            sock.sendall(REQUEST_HEADER.pack(MAX_METADATA_SIZE + 1, 0))
+            response = sock.makefile("rb").read()
+        status, length = RESPONSE_HEADER.unpack(response[: RESPONSE_HEADER.size])
+        assert status == STATUS_ERROR
+        assert b"request too large" in response[RESPONSE_HEADER.size :]
+
+    def test_truncated_frame(self, server_address):
+        with self.connect(server_address) as sock:
+            sock.sendall(REQUEST_HEADER.pack(100, 0) + b'{"encoder": "url"')
+            sock.shutdown(socket.SHUT_WR)
+            # The connection is closed without a response
+            assert sock.makefile("rb").read() == b""
+
+
+class TestMakeServer:
+    """Tests for the socket path handling of make_server"""
+
+    def test_regular_file_kept(self, tmp_path):
+        path = tmp_path / "data.txt"
+        path.write_bytes(b"keep me")
+        with pytest.raises(ServerError, match="is not a socket"):
+            make_server(str(path))
+        assert path.read_bytes() == b"keep me"
+
+    def test_live_server_kept(self, server_address):
+        with pytest.raises(ServerError, match="already listening"):
+            make_server(server_address)
+        with Client(server_address) as client:
+            assert client.encode(b"a b", "url") == b"a%20b"
+
+    def test_stale_socket_removed(self, tmp_path):
+        path = str(tmp_path / "usenc.sock")
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stale.bind(path)
+        stale.close()
+
+        server = make_server(path)
+        server.server_close()
+
+
+class TestThinClient:
+    """Tests for the thin `--connect` client"""
+
+    @pytest.mark.parametrize(
+        "argv,thin",
+        [
+            (["url", "--connect", "/tmp/s"], True),
+            (["hex", "-d", "-i", "in", "--connect=/tmp/s", "--prefix", "0x"], True),
+            (["url", "--input-charset", "latin1", "--connect", "/tmp/s"], True),
+            (["url"], False),
+            (["url", "--connect", "/tmp/s", "--bulk"], False),
+            (["url", "--connect", "/tmp/s", "--format=jsonl"], False),
+            (["url", "--connect", "/tmp/s", "--stat"], False),
+            (["url", "--connect", "/tmp/s", "-dz"], False),
+            (["serve", "--connect", "/tmp/s"], False),
+            (["-h"], False),
+        ],
+    )
+    def test_is_thin(self, argv, thin):
+        assert is_thin(argv) == thin
+
+    def test_cli_options(self):
+        """Test that the thin client knows every option of the full command line"""
+        parser = argparse.ArgumentParser()
+        add_default_params(parser)
+        options = {option for action in parser._actions for option in action.option_strings}
+        assert options == CLI_OPTIONS | CLIENT_OPTIONS | FORWARDED_OPTIONS
+
+    def test_parse_encoder_args(self):
+        params = parse_encoder_args("hex", ["--prefix", "0x", "--output-charset", "latin1"])
+        assert params["prefix"] == "0x"
+        assert params["lowercase"] is False
+        assert (params["input_charset"], params["output_charset"]) == ("utf8", "latin1")
+        with pytest.raises(ValueError, match="usenc hex: unrecognized arguments: --bulk"):
+            parse_encoder_args("hex", ["--bulk"])
+
+    def test_main_connect(self, server_address, tmp_path):
+        input_file = tmp_path / "input.txt"
+        output_file = tmp_path / "output.txt"
+        input_file.write_bytes(b"hello world\ntest data  \n")
+
+        main_connect(
+            ["url", "-i", str(input_file), "-o", str(output_file), "--connect", server_address]
+        )
+        assert output_file.read_bytes() == b"hello%20world\ntest%20data\n"
+
+        main_connect(
+            [
+                "url",
+                "-d",
+                "-i",
+                str(output_file),
+                "-o",
+                str(input_file),
+                "--connect",
+                server_address,
+            ]
+        )
+        assert input_file.read_bytes() == b"hello world\ntest data\n"
+
+    def test_main_connect_error(self, server_address, capsys):
+        stdin = io.TextIOWrapper(io.BytesIO(b"!!!!\n"))
+        with patch("sys.stdin", stdin), pytest.raises(SystemExit) as exc_info:
+            main_connect(["base64", "-d", "--connect", server_address])
+        assert exc_info.value.code == 1
+        assert capsys.readouterr().err.startswith("Error: Invalid character")
+
+    def test_encoders_not_loaded(self, server_address, tmp_path):
+        input_file = tmp_path / "input.txt"
+        input_file.write_bytes(b"a b\n")
+        src = str(Path(__file__).parent.parent / "src")
+        code = (
+            f"import sys; sys.path.insert(0, {src!r}); "
+            "sys.argv = ['usenc', 'url', '-i', sys.argv[1], '--connect', sys.argv[2]]; "
+            "from usenc.client import main; main(); "
+            "assert 'usenc.encoders' not in sys.modules and 'usenc.cli' not in sys.modules"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code, str(input_file), server_address],
+            check=True,
+            capture_output=True,
+        )
+        assert result.stdout == b"a%20b\n"
@@ -52,7 +52,7 @@ class TestEncoderSnapshots:
             pytest.skip(f"Generated new snapshot for {encoder_name}")
 
         # Load expected snapshot
-        expected_samples = load_samples_file(snapshot_file)
+        expected_samples = load_samples_file(snapshot_file, comments=False)
 
         # Assert against snapshot
         assert encoded_samples == expected_samples
@@ -0,0 +1,108 @@
+"""
+Check the runtime statistics collector
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import encode
+from usenc.stats import Stats
+
+
+class TestStats:
+    """Tests for the Stats class"""
+
+    def test_reader_counts_bytes_and_lines(self):
+        stats = Stats()
+        reader = stats.reader(io.BytesIO(b"line 1\nline 2\n"))
+
+        assert list(reader) == [b"line 1\n", b"line 2\n"]
+        assert stats.bytes_in == 14
+
+    def test_writer_counts_bytes(self):
+        stats = Stats()
+        output = io.BytesIO()
+        writer = stats.writer(output)
+
+        writer.write(b"hello")
+        writer.write(b" world")
+
+        assert output.getvalue() == b"hello world"
+        assert stats.bytes_out == 11
+
+    def test_timed_records_calls(self):
+        stats = Stats()
+        method = stats.timed(encode)
+
+        assert method(b"hello world", "url") == b"hello%20world"
+        assert method(b"hello", "url") == b"hello"
+        assert stats.lines == 2
+        assert stats.calls == 2
+        assert stats.codec_time > 0
+
+    def test_percentiles(self):
+        stats = Stats()
+        for latency in [1e-6] * 90 + [1e-3] * 10:
+            stats.record(latency)
+
+        assert stats.percentile(50) <= 1e-6
+        assert 0.9e-3 <= stats.percentile(99) <= 1e-3
+        assert stats.percentile(100) == stats.percentile(99)
+
+    def test_merge(self):
+        stats, other = Stats(), Stats()
+        stats.record(1e-6)
+        other.record(1e-6)
+        other.record(1e-3)
+        other.bytes_in = 10
+        other.strategy = "lines"
+
+        stats.merge(other)
+        assert stats.lines == 3
+        assert stats.bytes_in == 10
+        assert stats.strategy == "lines"
+        assert 0.9e-3 <= stats.percentile(100) <= 1e-3
+
+    def test_merge_records(self):
+        """Records counted apart from the codec calls are merged as records"""
+        stats, other = Stats(), Stats()
+        stats.record(1e-6)
+        other.record(1e-6)
+        other.record(1e-6)
+        other.records = 1
+
+        stats.merge(other)
+        assert stats.lines == 2
+        assert stats.calls == 3
+
+    def test_percentile_empty(self):
+        assert Stats().percentile(50) == 0.0
+
+    def test_report_json(self):
+        stats = Stats("url", is_decoding=True)
+        stats.record(1e-5)
+        stats.stop()
+
+        output = io.StringIO()
+        stats.report(output, "json")
+        report = json.loads(output.getvalue())
+
+        assert report["encoder"] == "url"
+        assert report["mode"] == "decode"
+        assert report["strategy"] == ""
+        assert report["lines"] == 1
+        assert report["calls"] == 1
+        assert set(report["time"]) == {"read", "codec", "write", "total"}
+
+    def test_report_text(self):
+        stats = Stats("base64")
+        stats.stop()
+
+        output = io.StringIO()
+        stats.report(output)
+
+        assert "usenc stats (base64 encode)" in output.getvalue()
+        assert "latency:" in output.getvalue()
@@ -0,0 +1,92 @@
+"""
+Check thread-pool execution
+"""
+
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from usenc import prepare_batch
+from usenc.threads import OrderedPool, thread_count, threaded_batch
+
+
+def upper_batch(texts):
+    return [text.upper() for text in texts]
+
+
+class TestThreadedBatch:
+    """Tests for threaded_batch"""
+
+    def test_order(self):
+        texts = [b"record %d" % i * 100 for i in range(1000)]
+        assert threaded_batch(upper_batch, 4)(texts) == upper_batch(texts)
+
+    def test_threads(self):
+        """Test that large batches are split between the threads of the pool"""
+        names = set()
+
+        def batch_codec(texts):
+            names.add(threading.current_thread().name)
+            return texts
+
+        with patch("usenc.threads.MIN_THREAD_BATCH", 0):
+            threaded_batch(batch_codec, 3)([b"a"] * 300)
+
+        assert names and all(name.startswith("usenc") for name in names)
+
+    def test_small_batch(self):
+        """Test that small batches are processed by the calling thread"""
+        names = []
+
+        def batch_codec(texts):
+            names.append(threading.current_thread().name)
+            return texts
+
+        assert threaded_batch(batch_codec, 4)([b"a", b"b"]) == [b"a", b"b"]
+        assert names == [threading.current_thread().name]
+
+    def test_prepare_batch(self):
+        codec = prepare_batch("crc32", threads=2)
+        texts = [bytes(range(256)) * 64, b"", b"hello"] * 20
+        assert codec(texts) == prepare_batch("crc32")(texts)
+
+    def test_thread_count(self):
+        assert thread_count(3) == 3
+        assert thread_count(0) >= 1
+
+
+class TestOrderedPool:
+    """Tests for OrderedPool"""
+
+    def test_order(self):
+        batches = [[b"%d" % i] for i in range(50)]
+        results = []
+        with OrderedPool(upper_batch, 2) as pool:
+            for batch in batches:
+                ready = pool.submit(batch)
+                # Never more than 2 batches per thread are pending
+                assert len(pool.pending) <= 4
+                results.extend(ready)
+            results.extend(pool.drain())
+
+        assert results == batches
+        assert pool.executor._shutdown
+
+    def test_close_cancels(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def blocking(texts):
+            started.set()
+            release.wait(5)
+            return texts
+
+        pool = OrderedPool(blocking, 1)
+        pool.submit([b"a"])
+        pool.submit([b"b"])
+        started.wait(5)
+        release.set()
+        pool.close()
+        assert not pool.pending